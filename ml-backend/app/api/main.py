@@ -1,11 +1,37 @@
-from fastapi import FastAPI, HTTPException
+import json
+import uuid
+from typing import Optional
+
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, FileResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from app.core import config, metrics
+from app.core.coalescing import SingleFlight
+from app.core.serialization import FastJSONResponse
 from app.core.startup import load_models_on_startup
-from app.schemas.request import AnalyzeRequest
-from app.services.inference_service import run_analysis
+from app.schemas.request import AnalyzeRequest, CohortRequest, SkillDeltaRequest
+from app.services.profiling_service import (
+    PROFILE_MODES,
+    get_profile,
+    is_profiling_authorized,
+    profile_call,
+    requested_profile_mode,
+)
+
+# The analysis services (and numpy, joblib, the models) are imported inside
+# the endpoints that use them, so starting a worker and serving /health stays
+# cheap; see scripts/check_import_time.py. With PRELOAD_MODELS they are
+# imported at startup instead.
 
 app = FastAPI(title="Career Readiness ML Backend")
 
+# Identical concurrent /inference/analyze requests share one pipeline run
+_ANALYZE_FLIGHTS = SingleFlight()
+metrics.register_gauge(
+    "analyze_inflight", "Distinct analyze computations in progress", lambda: len(_ANALYZE_FLIGHTS)
+)
+
 # Configure CORS for Next.js frontend
 app.add_middleware(
     CORSMiddleware,
@@ -23,6 +49,21 @@ app.add_middleware(
 @app.on_event("startup")
 async def startup_event():
     load_models_on_startup()
+    if config.PRELOAD_MODELS:
+        from app.pipelines.pipeline import SkillAnalyzer
+        from app.services import cohort_service, inference_service  # noqa: F401
+
+        # Builds the skill neighbour graph and n-gram projection when
+        # embeddings are available
+        SkillAnalyzer()
+        if config.FUZZY_SKILL_MATCHING:
+            from data.skill_fuzzy import get_fuzzy_index
+
+            get_fuzzy_index()
+    if config.PRECOMPUTE_ANSWER_TABLE:
+        from app.services.answer_table import build_answer_table
+
+        build_answer_table()
 
 
 @app.get("/health")
@@ -31,10 +72,204 @@ async def health_check():
     return {"status": "healthy", "service": "Career Readiness ML Backend"}
 
 
+@app.get("/metrics")
+async def read_metrics():
+    """Request counters in the Prometheus text format."""
+    return PlainTextResponse(metrics.render_prometheus(), media_type="text/plain; version=0.0.4")
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match lists etag (or is "*")."""
+    if_none_match = request.headers.get("if-none-match", "")
+    return etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(",")) or \
+        if_none_match.strip() == "*"
+
+
+async def _analysis_result(key: str, payload: AnalyzeRequest):
+    """Run an analysis in the threadpool, joining an identical in-flight run."""
+    from app.services.inference_service import run_analysis
+
+    if not config.COALESCE_REQUESTS:
+        return await run_in_threadpool(run_analysis, payload)
+    result, shared = await _ANALYZE_FLIGHTS.run(key, run_analysis, payload)
+    if shared:
+        metrics.increment("analyze_coalesced_total")
+    return result
+
+
 @app.post("/inference/analyze")
-async def analyze(payload: AnalyzeRequest):
+async def analyze(payload: AnalyzeRequest, request: Request):
+    """Analyze a candidate against a role.
+
+    The response carries a strong ETag (the analysis key: canonical request
+    plus artifact version) and a Content-Location where the same result can
+    be fetched with GET. If-None-Match with that ETag returns 304 without
+    running the pipeline.
+    """
+    profile_mode = requested_profile_mode(request.headers)
+    if profile_mode:
+        if not is_profiling_authorized(request.headers):
+            raise HTTPException(status_code=403, detail="Profiling not authorized")
+        if profile_mode not in PROFILE_MODES:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown profile mode '{profile_mode}', expected one of {list(PROFILE_MODES)}",
+            )
+
+    from app.services.inference_service import analysis_key, remember_analysis, run_analysis
+
+    metrics.increment("analyze_requests_total")
+    try:
+        if profile_mode:
+            request_id = request.headers.get("x-request-id") or uuid.uuid4().hex
+            # Profiled in a worker thread like unprofiled requests, so the
+            # event loop keeps serving others
+            result = await run_in_threadpool(profile_call, profile_mode, request_id, run_analysis, payload)
+            return FastJSONResponse(result, headers={"X-Profile-ID": request_id})
+        key = analysis_key(payload)
+        remember_analysis(key, payload)
+        headers = {"ETag": f'"{key}"', "Content-Location": f"/inference/analysis/{key}"}
+        if _etag_matches(request, headers["ETag"]):
+            metrics.increment("analyze_not_modified_total")
+            return Response(status_code=304, headers=headers)
+        return FastJSONResponse(await _analysis_result(key, payload), headers=headers)
+    except Exception as e:
+        metrics.increment("analyze_errors_total")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/inference/analysis/{key}")
+async def read_analysis(key: str, request: Request):
+    """The result of an earlier /inference/analyze request, by its ETag.
+
+    A key names one input under one set of model artifacts, so responses are
+    immutable and cacheable by browsers and CDNs. Keys from before a model
+    or data update, or evicted from the process, return 404; POST again.
+    """
+    from app.services.inference_service import stored_analysis
+
+    metrics.increment("analyze_requests_total")
+    headers = {"ETag": f'"{key}"', "Cache-Control": "public, max-age=31536000, immutable"}
+    if _etag_matches(request, headers["ETag"]):
+        metrics.increment("analyze_not_modified_total")
+        return Response(status_code=304, headers=headers)
+    payload = stored_analysis(key)
+    if payload is None:
+        raise HTTPException(status_code=404, detail=f"Unknown or expired analysis '{key}'")
     try:
-        result = run_analysis(payload)
-        return result
+        return FastJSONResponse(await _analysis_result(key, payload), headers=headers)
     except Exception as e:
+        metrics.increment("analyze_errors_total")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/inference/sessions")
+async def create_analysis_session(payload: AnalyzeRequest):
+    """Analyze and return a session_id for incremental skill-delta updates."""
+    from app.services.inference_service import start_analysis_session
+
+    try:
+        return FastJSONResponse(start_analysis_session(payload))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/inference/sessions/{session_id}/delta")
+async def apply_skill_delta(session_id: str, delta: SkillDeltaRequest):
+    """Re-analyze a session after adding/removing skills, updating only what changed."""
+    from app.services.incremental_service import get_session
+
+    session = get_session(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail=f"Unknown or expired session '{session_id}'")
+    try:
+        return FastJSONResponse(session.apply_delta(delta.add, delta.remove))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/analytics/cohort")
+async def analyze_cohort(payload: CohortRequest):
+    """Aggregate skill gaps over many candidates for one role.
+
+    With stream=true the response is NDJSON: one aggregate line per processed
+    chunk ("done": false), then the final aggregate ("done": true).
+    """
+    from app.services.cohort_service import cohort_aggregator, iter_cohort_analysis
+
+    if isinstance(payload.experience_years, list) and len(payload.experience_years) != len(payload.candidates):
+        raise HTTPException(status_code=400, detail="experience_years must have one entry per candidate")
+    try:
+        # Validate the role before streaming starts
+        cohort_aggregator(payload.role_id, payload.level, payload.target_role_skills)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    summaries = iter_cohort_analysis(
+        payload.candidates,
+        experience_years=payload.experience_years,
+        role_id=payload.role_id,
+        level=payload.level,
+        role_skills=payload.target_role_skills,
+        chunk_size=max(1, payload.chunk_size),
+        top_k=payload.top_k,
+    )
+    if payload.stream:
+        return StreamingResponse(
+            (json.dumps(summary) + "\n" for summary in summaries),
+            media_type="application/x-ndjson",
+        )
+    try:
+        for summary in summaries:
+            pass
+        return summary
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/catalog/resources")
+async def read_resource_catalog(request: Request, version: Optional[str] = None):
+    """All recommendable resources by ID, for resolving compact responses.
+
+    The version identifies the contents and doubles as a strong ETag;
+    If-None-Match with the current version returns 304. Requesting the
+    current ?version=... makes the response cacheable indefinitely.
+    """
+    from app.services.catalog_service import catalog_body, get_catalog
+
+    catalog = get_catalog()
+    etag = f'"{catalog["version"]}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "public, max-age=31536000, immutable" if version == catalog["version"] else "no-cache",
+    }
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    # The first request per catalog version reads the whole store
+    body = await run_in_threadpool(catalog_body, catalog)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@app.get("/debug/profiles/{request_id}")
+async def read_profile(request_id: str, request: Request, format: str = "json"):
+    """Fetch a stored request profile.
+
+    format: "json" (summary), "pstats" (cprofile file) or "collapsed" (sample stacks)
+    """
+    if not is_profiling_authorized(request.headers):
+        raise HTTPException(status_code=403, detail="Profiling not authorized")
+
+    profile = get_profile(request_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail=f"No profile for request '{request_id}'")
+
+    if format == "pstats":
+        if "pstats_path" not in profile:
+            raise HTTPException(status_code=400, detail="Profile has no pstats data")
+        return FileResponse(profile["pstats_path"], media_type="application/octet-stream",
+                            filename=f"{request_id}.pstats")
+    if format == "collapsed":
+        if "collapsed" not in profile:
+            raise HTTPException(status_code=400, detail="Profile has no collapsed stacks")
+        return PlainTextResponse(profile["collapsed"])
+    return profile
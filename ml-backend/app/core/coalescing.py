@@ -0,0 +1,52 @@
+"""Single-flight coalescing of identical concurrent requests.
+
+The first request for a key runs the computation in the threadpool as a
+shared task; identical requests arriving while it runs await the same task
+instead of computing again. Every caller awaits the task through
+asyncio.shield, so a disconnecting caller (cancellation) doesn't cancel the
+work the others are waiting for, and an exception reaches every caller.
+"""
+
+import asyncio
+import hashlib
+import json
+from typing import Any, Callable, Dict, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+
+def request_key(*parts: Any) -> str:
+    """Canonical hash of JSON-serializable request parts (key order ignored)."""
+    encoded = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class SingleFlight:
+    """In-flight tasks by key; at most one computation per key at a time."""
+
+    def __init__(self):
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    async def run(self, key: str, fn: Callable[..., Any], *args) -> Tuple[Any, bool]:
+        """Run fn(*args) in the threadpool, or join the identical in-flight call.
+
+        Returns:
+            Tuple of (result, whether it was shared from another caller's run)
+        """
+        task = self._tasks.get(key)
+        shared = task is not None
+        if not shared:
+            task = asyncio.ensure_future(run_in_threadpool(fn, *args))
+            self._tasks[key] = task
+            task.add_done_callback(lambda t: self._finished(key, t))
+        return await asyncio.shield(task), shared
+
+    def _finished(self, key: str, task: asyncio.Task):
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        # Mark the exception retrieved even if every caller went away
+        if not task.cancelled():
+            task.exception()
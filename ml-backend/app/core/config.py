@@ -1,5 +1,64 @@
+import os
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parents[2]
 ARTIFACTS_DIR = ROOT / "ml" / "artifacts"
 ARTIFACTS_DIR.mkdir(parents=True, exist_ok=True)
+
+# Load every ML model at startup instead of on first use (see app/core/startup.py)
+PRELOAD_MODELS = os.getenv("PRELOAD_MODELS", "").lower() in ("1", "true", "yes")
+
+# Replace unrecognized candidate/role skills with typo-tolerant matches
+# ("pyhton" -> "python") resolved with at least this confidence (see
+# data/skill_fuzzy.py)
+FUZZY_SKILL_MATCHING = os.getenv("FUZZY_SKILL_MATCHING", "true").lower() in ("1", "true", "yes")
+FUZZY_SKILL_MIN_CONFIDENCE = float(os.getenv("FUZZY_SKILL_MIN_CONFIDENCE", "0.75"))
+
+# Embed skills missing from skill_embeddings.joblib with a character n-gram
+# projection into the embedding space, caching up to MAX_PROJECTED_SKILLS of
+# them (see app/models/skill_projection_model.py)
+OOV_SKILL_EMBEDDINGS = os.getenv("OOV_SKILL_EMBEDDINGS", "true").lower() in ("1", "true", "yes")
+MAX_PROJECTED_SKILLS = int(os.getenv("MAX_PROJECTED_SKILLS", "10000"))
+
+# Serving precision of skill embeddings and recommender matrices: "full" (as
+# trained), "float16", or "int8" (recommender matrices as int8 with per-row
+# scales, float16 embeddings); see app/core/quantization.py
+MODEL_PRECISION = os.getenv("MODEL_PRECISION", "full").lower()
+
+# Precompute answers for every role-based, skills-only request at startup
+# (see app/services/answer_table.py)
+PRECOMPUTE_ANSWER_TABLE = os.getenv("PRECOMPUTE_ANSWER_TABLE", "").lower() in ("1", "true", "yes")
+
+# Share one pipeline run between identical concurrent /inference/analyze
+# requests (see app/core/coalescing.py)
+COALESCE_REQUESTS = os.getenv("COALESCE_REQUESTS", "true").lower() in ("1", "true", "yes")
+
+# On-demand request profiling (see app/services/profiling_service.py).
+# Enabled for everyone when PROFILING_ENABLED is set (local/dev only), otherwise
+# only for requests carrying an X-Admin-Token header matching ADMIN_TOKEN.
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "").lower() in ("1", "true", "yes")
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN") or None
+PROFILES_DIR = ROOT / "profiles"
+MAX_STORED_PROFILES = int(os.getenv("MAX_STORED_PROFILES", "50"))
+
+# Incremental analysis sessions (see app/services/incremental_service.py)
+MAX_ANALYSIS_SESSIONS = int(os.getenv("MAX_ANALYSIS_SESSIONS", "10000"))
+ANALYSIS_SESSION_TTL_SECONDS = float(os.getenv("ANALYSIS_SESSION_TTL_SECONDS", "1800"))
+
+# Analysis inputs kept for GET /inference/analysis/{key} (see
+# inference_service.remember_analysis)
+MAX_STORED_ANALYSES = int(os.getenv("MAX_STORED_ANALYSES", "10000"))
+
+# Seconds between checks for a new recommender snapshot published by
+# ml/training/update_recommender.py (0 checks on every request)
+RECOMMENDER_RELOAD_INTERVAL_SECONDS = float(os.getenv("RECOMMENDER_RELOAD_INTERVAL_SECONDS", "30"))
+
+# Personalized recommendations (see recommendation_service.get_user_profile):
+# share of the ranking score taken from the candidate's folded-in profile, and
+# how many profiles to cache
+PERSONALIZATION_WEIGHT = float(os.getenv("PERSONALIZATION_WEIGHT", "0.3"))
+MAX_USER_PROFILES = int(os.getenv("MAX_USER_PROFILES", "10000"))
+
+# Curated recommendation blocks kept pre-serialized, one per skill (see
+# recommendation_service._static_block)
+MAX_CACHED_RECOMMENDATION_BLOCKS = int(os.getenv("MAX_CACHED_RECOMMENDATION_BLOCKS", "50000"))
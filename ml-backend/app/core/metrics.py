@@ -0,0 +1,52 @@
+"""In-process request counters, exposed at GET /metrics.
+
+Counters are process-local (one set per worker) and rendered in the
+Prometheus text exposition format.
+"""
+
+import threading
+from typing import Callable, Dict
+
+# Counter name -> help text
+COUNTERS = {
+    "analyze_requests_total": "Analyze requests received",
+    "analyze_coalesced_total": "Analyze requests answered by an identical in-flight request",
+    "analyze_not_modified_total": "Analyze requests answered 304 Not Modified from their ETag",
+    "analyze_errors_total": "Analyze requests that failed",
+    "answer_table_hits_total": "Analyses answered from the precomputed answer table",
+    "answer_table_misses_total": "Analyses the answer table (when built) could not answer",
+}
+
+_VALUES: Dict[str, float] = {name: 0 for name in COUNTERS}
+_GAUGES: Dict[str, tuple] = {}  # name -> (help text, callable returning the value)
+_LOCK = threading.Lock()
+
+
+def increment(name: str, value: float = 1):
+    """Add to a counter declared in COUNTERS."""
+    with _LOCK:
+        _VALUES[name] += value
+
+
+def register_gauge(name: str, help_text: str, read: Callable[[], float]):
+    """Expose a value read at scrape time."""
+    _GAUGES[name] = (help_text, read)
+
+
+def snapshot() -> Dict[str, float]:
+    """Current counter and gauge values."""
+    with _LOCK:
+        values = dict(_VALUES)
+    values.update({name: read() for name, (_, read) in _GAUGES.items()})
+    return values
+
+
+def render_prometheus() -> str:
+    """Counters and gauges in the Prometheus text format."""
+    values = snapshot()
+    lines = []
+    for name, help_text in COUNTERS.items():
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter", f"{name} {values[name]:g}"]
+    for name, (help_text, _) in _GAUGES.items():
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge", f"{name} {values[name]:g}"]
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,118 @@
+"""Reduced-precision serving formats for model matrices (MODEL_PRECISION).
+
+- "full" serves artifacts as trained: float32 skill embeddings and the
+  recommender's float64 predictions and SVD components.
+- "float16" stores all of them as float16.
+- "int8" stores the recommender matrices as int8 with one float32 scale per
+  row (the row's largest absolute value / 127), an eighth of float64; the
+  embeddings are float16.
+
+Embeddings are packed into one contiguous matrix, and the per-skill dict
+serves row views of it. Recommender matrices are wrapped in QuantizedMatrix,
+which dequantizes to float32 a row (or one product) at a time: numpy sorts
+and multiplies float16 far slower than float32, and callers keep indexing
+rows and multiplying as with an ndarray. scripts/bench_precision.py reports
+memory, latency and agreement with full precision for each mode.
+"""
+
+from typing import Dict, Union
+
+import numpy as np
+
+PRECISIONS = ("full", "float16", "int8")
+
+
+class QuantizedMatrix:
+    """Matrix stored as float16, or as int8 with a float32 scale per row.
+
+    Supports what the services do with their matrices: `.shape`, row
+    selection (`m[i]`, `m[[i, j]]`), `m @ x` and `v @ m`, all computed in
+    float32.
+
+    Args:
+        matrix: 2-D array to quantize
+        dtype: np.int8 or np.float16
+    """
+
+    # Makes numpy defer `array @ QuantizedMatrix` to __rmatmul__
+    __array_ufunc__ = None
+
+    def __init__(self, matrix: np.ndarray, dtype=np.int8):
+        matrix = np.asarray(matrix, dtype=np.float32)
+        if dtype == np.float16:
+            self.data = matrix.astype(np.float16)
+            self.scale = None
+            return
+        scale = np.abs(matrix).max(axis=1) / 127 if matrix.size else np.ones(len(matrix), dtype=np.float32)
+        scale[scale == 0] = 1.0
+        self.data = np.round(matrix / scale[:, None]).astype(np.int8)
+        self.scale = scale.astype(np.float32)
+
+    @property
+    def shape(self):
+        return self.data.shape
+
+    @property
+    def nbytes(self) -> int:
+        return self.data.nbytes + (self.scale.nbytes if self.scale is not None else 0)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __getitem__(self, rows) -> np.ndarray:
+        data = self.data[rows].astype(np.float32)
+        if self.scale is None:
+            return data
+        scale = self.scale[rows]
+        return data * (scale[..., None] if np.ndim(scale) else scale)
+
+    def __matmul__(self, x: np.ndarray) -> np.ndarray:
+        # Converted explicitly: mixed-type matmul doesn't use BLAS
+        product = self.data.astype(np.float32) @ np.asarray(x, dtype=np.float32)
+        if self.scale is None:
+            return product
+        return product * (self.scale[:, None] if product.ndim == 2 else self.scale)
+
+    def __rmatmul__(self, v: np.ndarray) -> np.ndarray:
+        v = np.asarray(v, dtype=np.float32)
+        return (v if self.scale is None else v * self.scale) @ self.data.astype(np.float32)
+
+    def dequantize(self) -> np.ndarray:
+        """The full float32 matrix."""
+        return self[:]
+
+
+Matrix = Union[np.ndarray, QuantizedMatrix]
+
+
+def _check(precision: str):
+    if precision not in PRECISIONS:
+        raise ValueError(f"Unknown MODEL_PRECISION {precision!r}, expected one of {PRECISIONS}")
+
+
+def quantize_matrix(matrix: np.ndarray, precision: str) -> Matrix:
+    """A recommender matrix in a serving precision."""
+    _check(precision)
+    if precision == "full":
+        return matrix
+    return QuantizedMatrix(matrix, np.float16 if precision == "float16" else np.int8)
+
+
+def quantize_embeddings(embeddings: Dict[str, np.ndarray], precision: str) -> Dict[str, np.ndarray]:
+    """Skill embeddings in a serving precision (float16 rows of one matrix unless "full")."""
+    _check(precision)
+    if precision == "full" or not embeddings:
+        return embeddings
+    matrix = np.array(list(embeddings.values()), dtype=np.float16)
+    return {skill: matrix[i] for i, skill in enumerate(embeddings)}
+
+
+def matrix_nbytes(matrix) -> int:
+    """Bytes held by a matrix or an embeddings dict (row views of one matrix counted once)."""
+    if isinstance(matrix, dict):
+        bases = {}
+        for vector in matrix.values():
+            base = vector.base if vector.base is not None else vector
+            bases[id(base)] = base.nbytes
+        return sum(bases.values())
+    return int(matrix.nbytes)
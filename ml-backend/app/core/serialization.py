@@ -0,0 +1,93 @@
+"""JSON encoding for API responses, with pre-serialized fragments.
+
+Responses are encoded with orjson when it is installed, else with the stdlib
+json module (compact, as FastAPI's JSONResponse does). Objects that are the
+same for every request, such as a skill's default recommendation block, are
+wrapped in PreSerialized: a dict that also holds its JSON bytes, encoded once.
+dumps() splices those bytes into the output instead of encoding the object
+again; in-process callers just see a dict.
+"""
+
+import json
+import re
+import secrets
+from typing import Any, List
+
+from starlette.responses import Response
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Stands in for a fragment while the rest of the response is encoded
+_PLACEHOLDER = f"__fragment_{secrets.token_hex(8)}_"
+_PLACEHOLDER_RE = re.compile(rb'"' + _PLACEHOLDER.encode() + rb'(\d+)"')
+
+
+def _default(obj: Any):
+    # numpy scalars and arrays (without importing numpy)
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _encode(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(
+        obj, default=_default, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class PreSerialized(dict):
+    """A JSON object encoded once at construction; treat it as read-only."""
+
+    __slots__ = ("json",)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.json = _encode(self)
+
+
+def _placeholder(obj: Any, fragments: List[bytes]) -> Any:
+    if isinstance(obj, PreSerialized):
+        fragments.append(obj.json)
+        return f"{_PLACEHOLDER}{len(fragments) - 1}"
+    return obj
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode obj as JSON bytes, splicing in pre-serialized fragments.
+
+    Fragments are spliced where responses hold them: as values of the
+    top-level object or items of its top-level lists (e.g. recommendation
+    blocks). Deeper ones are encoded like any dict, which keeps this from
+    walking the whole response in Python.
+    """
+    if isinstance(obj, PreSerialized):
+        return obj.json
+    if not isinstance(obj, dict):
+        return _encode(obj)
+    fragments: List[bytes] = []
+    shallow = {}
+    for key, value in obj.items():
+        if isinstance(value, list):
+            value = [_placeholder(item, fragments) for item in value]
+        shallow[key] = _placeholder(value, fragments)
+    body = _encode(shallow)
+    if not fragments:
+        return body
+    return _PLACEHOLDER_RE.sub(lambda m: fragments[int(m.group(1))], body)
+
+
+class FastJSONResponse(Response):
+    """JSON response encoded with dumps().
+
+    Return it from an endpoint to skip FastAPI's jsonable_encoder pass.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -1,71 +1,225 @@
 """Model loading at application startup.
 
-Loads all ML models into memory for fast inference.
+Finds the ML models in ml/artifacts at startup. Each model is unpickled (and
+its libraries, e.g. joblib, numpy, sklearn, xgboost, imported) the first time
+get_model() asks for it, so a worker that only serves /health never pays for
+them. Set PRELOAD_MODELS=true to load everything at startup instead.
 """
 
-from joblib import load
+import hashlib
+import json
+import threading
+import time
+from typing import Any, Callable, Dict
+from app.core import config
 from app.core.config import ARTIFACTS_DIR
 from pathlib import Path
 
 _MODELS = {}
 
+# Models found at startup but not loaded yet: name -> loader
+_PENDING: Dict[str, Callable[[], None]] = {}
+_LOAD_LOCK = threading.Lock()
 
-def load_models_on_startup():
-    """Load all ML models found in ml/artifacts into memory."""
-    print("Loading ML models...")
-    
-    # 1. Readiness Prediction Model
-    readiness_path = ARTIFACTS_DIR / "readiness_v1.joblib"
-    if readiness_path.exists():
-        _MODELS["readiness"] = load(readiness_path)
-        print(f"  [OK] Loaded readiness model")
-    
-    # 2. Skill Extractor Model
-    vectorizer_path = ARTIFACTS_DIR / "skill_extractor_vectorizer.joblib"
-    classifier_path = ARTIFACTS_DIR / "skill_extractor_classifier.joblib"
-    mlb_path = ARTIFACTS_DIR / "skill_extractor_mlb.joblib"
-    if all(p.exists() for p in [vectorizer_path, classifier_path, mlb_path]):
-        _MODELS["skill_extractor"] = {
-            "vectorizer": load(vectorizer_path),
-            "classifier": load(classifier_path),
-            "mlb": load(mlb_path),
-        }
-        print(f"  [OK] Loaded skill extractor")
+# Published recommender snapshot version and when it was last checked
+_RECOMMENDER_VERSION = {"version": None, "checked_at": 0.0}
+_RELOAD_LOCK = threading.Lock()
+
+# Recommender snapshot version published on disk, as artifact_version() last read it
+_PUBLISHED_VERSION = {"version": None, "checked_at": float("-inf")}
+
+# artifact_version() for the current registered models and published snapshot
+_ARTIFACT_VERSION: Dict[str, Any] = {}
+
+
+def _load(path: Path):
+    from joblib import load
+    return load(path)
+
+
+def _load_readiness():
+    _MODELS["readiness"] = _load(ARTIFACTS_DIR / "readiness_v1.joblib")
+
+
+def _load_skill_extractor():
+    _MODELS["skill_extractor"] = {
+        "vectorizer": _load(ARTIFACTS_DIR / "skill_extractor_vectorizer.joblib"),
+        "classifier": _load(ARTIFACTS_DIR / "skill_extractor_classifier.joblib"),
+        "mlb": _load(ARTIFACTS_DIR / "skill_extractor_mlb.joblib"),
+    }
+
+
+def _load_skill_embeddings():
+    from app.core.quantization import quantize_embeddings
+    embeddings = _load(ARTIFACTS_DIR / "skill_embeddings.joblib")
+    _MODELS["skill_embeddings"] = quantize_embeddings(embeddings, config.MODEL_PRECISION)
+
+
+def _load_gap_ranker():
+    _MODELS["gap_ranker"] = _load(ARTIFACTS_DIR / "gap_ranker_model.joblib")
+
+
+def _load_skill_metadata():
+    _MODELS["skill_metadata"] = _load(ARTIFACTS_DIR / "skill_metadata.joblib")
+
+
+# Model name -> (artifacts that must exist, loader)
+MODEL_LOADERS = {
+    "readiness": (("readiness_v1.joblib",), _load_readiness),
+    "skill_extractor": (
+        ("skill_extractor_vectorizer.joblib", "skill_extractor_classifier.joblib", "skill_extractor_mlb.joblib"),
+        _load_skill_extractor,
+    ),
+    "skill_embeddings": (("skill_embeddings.joblib",), _load_skill_embeddings),
+    "gap_ranker": (("gap_ranker_model.joblib",), _load_gap_ranker),
+    "skill_metadata": (("gap_ranker_model.joblib", "skill_metadata.joblib"), _load_skill_metadata),
+    "recommender": (("recommender_predictions.joblib",), lambda: _load_recommender()),
+}
+
+
+def load_models_on_startup(preload: bool = None):
+    """Register the ML models found in ml/artifacts.
     
-    # 3. Skill Embeddings
-    embeddings_path = ARTIFACTS_DIR / "skill_embeddings.joblib"
-    if embeddings_path.exists():
-        _MODELS["skill_embeddings"] = load(embeddings_path)
-        print(f"  [OK] Loaded skill embeddings")
+    Args:
+        preload: Load every model now instead of on first use (defaults to
+            the PRELOAD_MODELS setting)
+    """
+    if preload is None:
+        preload = config.PRELOAD_MODELS
+    print("Loading ML models..." if preload else "Registering ML models (loaded on first use)...")
     
-    # 4. Gap Ranker Model
-    gap_ranker_path = ARTIFACTS_DIR / "gap_ranker_model.joblib"
-    metadata_path = ARTIFACTS_DIR / "skill_metadata.joblib"
-    if gap_ranker_path.exists():
-        _MODELS["gap_ranker"] = load(gap_ranker_path)
-        if metadata_path.exists():
-            _MODELS["skill_metadata"] = load(metadata_path)
-        print(f"  [OK] Loaded gap ranker")
+    with _LOAD_LOCK:
+        for name, (artifacts, loader) in MODEL_LOADERS.items():
+            if name not in _MODELS and all((ARTIFACTS_DIR / a).exists() for a in artifacts):
+                _PENDING[name] = loader
     
-    # 5. Recommender Model
+    if preload:
+        for name in list(_PENDING):
+            get_model(name)
+        print(f"Loaded {len(_MODELS)} models")
+    else:
+        print(f"Found {len(_PENDING)} models")
+
+
+def _read_recommender_version():
+    version_path = ARTIFACTS_DIR / "recommender_version.json"
+    try:
+        return json.loads(version_path.read_text()).get("version")
+    except (OSError, ValueError):
+        return None
+
+
+def _load_recommender() -> bool:
+    """Load the current recommender snapshot, swapping it in atomically."""
     recommender_path = ARTIFACTS_DIR / "recommender_predictions.joblib"
-    if recommender_path.exists():
-        _MODELS["recommender"] = {
-            "predictions": load(recommender_path),
-            "skills": load(ARTIFACTS_DIR / "recommender_skills.joblib"),
-            "resources": load(ARTIFACTS_DIR / "recommender_resources.joblib"),
-            "skill_idx": load(ARTIFACTS_DIR / "recommender_skill_idx.joblib"),
-        }
-        print(f"  [OK] Loaded recommender")
+    if not recommender_path.exists():
+        return False
+    from app.core.quantization import quantize_matrix
+    from data.resource_catalog import ResourceCatalog
+
+    version = _read_recommender_version()
+    resources = _load(ARTIFACTS_DIR / "recommender_resources.joblib")
+    recommender = {
+        "predictions": quantize_matrix(_load(recommender_path), config.MODEL_PRECISION),
+        "skills": _load(ARTIFACTS_DIR / "recommender_skills.joblib"),
+        "resources": resources,
+        "catalog": ResourceCatalog(resources),
+        "skill_idx": _load(ARTIFACTS_DIR / "recommender_skill_idx.joblib"),
+        "version": version,
+    }
+    svd_path = ARTIFACTS_DIR / "recommender_svd.joblib"
+    if svd_path.exists():
+        # Resource factors (k x n_resources) for folding in user profiles
+        recommender["components"] = quantize_matrix(_load(svd_path).components_, config.MODEL_PRECISION)
+    _MODELS["recommender"] = recommender
+    _RECOMMENDER_VERSION["version"] = version
+    _RECOMMENDER_VERSION["checked_at"] = time.monotonic()
+    return True
+
+
+def refresh_recommender():
+    """Reload the recommender if update_recommender.py published a new snapshot.
     
-    print(f"Loaded {len(_MODELS)} models")
+    Checks recommender_version.json at most every
+    RECOMMENDER_RELOAD_INTERVAL_SECONDS; a no-op unless the model is loaded.
+    """
+    if "recommender" not in _MODELS:
+        return
+    now = time.monotonic()
+    if now - _RECOMMENDER_VERSION["checked_at"] < config.RECOMMENDER_RELOAD_INTERVAL_SECONDS:
+        return
+    # Only one request pays for the reload; others keep serving the old snapshot
+    if not _RELOAD_LOCK.acquire(blocking=False):
+        return
+    try:
+        _RECOMMENDER_VERSION["checked_at"] = now
+        version = _read_recommender_version()
+        if version is not None and version != _RECOMMENDER_VERSION["version"]:
+            _load_recommender()
+            print(f"Reloaded recommender (version {version})")
+    finally:
+        _RELOAD_LOCK.release()
 
 
 def get_model(name: str):
-    """Get a loaded model by name."""
-    return _MODELS.get(name)
+    """Get a model by name, loading it on first use."""
+    model = _MODELS.get(name)
+    if model is None and name in _PENDING:
+        with _LOAD_LOCK:
+            # Another thread may have loaded it while this one waited; the
+            # name stays pending until its loader succeeds, so concurrent
+            # callers wait here instead of seeing no model, and a loader
+            # that raises is retried by the next caller
+            loader = _PENDING.get(name) if name not in _MODELS else None
+            if loader is not None:
+                start = time.perf_counter()
+                loader()
+                _PENDING.pop(name, None)
+                print(f"  [OK] Loaded {name} ({(time.perf_counter() - start) * 1000:.0f} ms)")
+        model = _MODELS.get(name)
+    return model
 
 
 def is_model_loaded(name: str) -> bool:
-    """Check if a model is loaded."""
-    return name in _MODELS
+    """Check if a model is loaded or available to load on first use."""
+    return name in _MODELS or name in _PENDING
+
+
+def _published_recommender_version():
+    """Version in recommender_version.json (re-read every RECOMMENDER_RELOAD_INTERVAL_SECONDS)."""
+    now = time.monotonic()
+    if now - _PUBLISHED_VERSION["checked_at"] >= config.RECOMMENDER_RELOAD_INTERVAL_SECONDS:
+        _PUBLISHED_VERSION["version"] = _read_recommender_version()
+        _PUBLISHED_VERSION["checked_at"] = now
+    return _PUBLISHED_VERSION["version"]
+
+
+def artifact_version() -> str:
+    """Hash identifying the model artifacts that analyses are computed with.
+
+    Covers the registered models' artifact files (name, size, mtime), the
+    published recommender snapshot version and MODEL_PRECISION, so it changes
+    when a model is retrained or published. It depends only on what is on
+    disk, not on which models have been loaded yet, so keys issued before and
+    after a model's first use agree. Recomputed only when the registered
+    models or the published version change.
+    """
+    names = tuple(sorted(set(_MODELS) | set(_PENDING)))
+    published = _published_recommender_version() if "recommender" in names else None
+    state = (names, published, config.MODEL_PRECISION)
+    cached = _ARTIFACT_VERSION.get("current")
+    if cached is not None and cached[0] == state:
+        return cached[1]
+    files = []
+    for name in names:
+        artifacts = MODEL_LOADERS[name][0] if name in MODEL_LOADERS else ()
+        for artifact in artifacts:
+            try:
+                stat = (ARTIFACTS_DIR / artifact).stat()
+                files.append((artifact, stat.st_size, stat.st_mtime_ns))
+            except OSError:
+                files.append((artifact, None, None))
+    encoded = json.dumps([names, files, published, config.MODEL_PRECISION]).encode("utf-8")
+    version = hashlib.sha256(encoded).hexdigest()[:16]
+    _ARTIFACT_VERSION["current"] = (state, version)
+    return version
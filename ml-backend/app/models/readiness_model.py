@@ -1,4 +1,5 @@
 from typing import List
+import numpy as np
 from app.core.startup import get_model
 
 
@@ -14,6 +15,12 @@ class ReadinessModel:
             return [1 - score, score]
         return self._model.predict_proba([features])[0]
 
+    def predict_proba_batch(self, features: np.ndarray) -> np.ndarray:
+        """Readiness probability for each row of an (n, 2) feature matrix."""
+        if self._model is None:
+            return 0.5 * features[:, 0] + 0.05 * features[:, 1]
+        return self._model.predict_proba(features)[:, 1]
+
     def predict(self, features: List[float]):
         proba = self.predict_proba(features)
         return int(proba[1] >= 0.5)
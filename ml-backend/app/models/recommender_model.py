@@ -8,6 +8,8 @@ from pathlib import Path
 from joblib import load
 import numpy as np
 
+from data.resource_catalog import ResourceCatalog
+
 
 class RecommenderModel:
     """ML-based resource recommendation using matrix factorization."""
@@ -27,6 +29,7 @@ class RecommenderModel:
         self._resource_factors = None
         self._skills: List[str] = []
         self._resources: List[Dict] = []
+        self._catalog = ResourceCatalog([])
         self._skill_to_idx: Dict[str, int] = {}
         self._loaded = False
         
@@ -48,6 +51,7 @@ class RecommenderModel:
         
         if resources_path.exists():
             self._resources = load(resources_path)
+            self._catalog = ResourceCatalog(self._resources)
         
         if skill_idx_path.exists():
             self._skill_to_idx = load(skill_idx_path)
@@ -79,8 +83,7 @@ class RecommenderModel:
         
         if skill_idx is None:
             # Skill not found, return resources for the skill if available
-            matching = [r for r in self._resources if r["skill"].lower() == skill_lower]
-            return matching[:top_k]
+            return self._catalog.select(skill=skill_lower)[:top_k]
         
         # Get predicted scores for this skill
         scores = self._predictions[skill_idx]
@@ -136,10 +139,11 @@ class RecommenderModel:
     
     def get_resource_details(self, resource_id: int) -> Optional[Dict[str, Any]]:
         """Get details for a specific resource."""
-        for resource in self._resources:
-            if resource["id"] == resource_id:
-                return resource
-        return None
+        return self._catalog.get(resource_id)
+    
+    def find_resources(self, filters: Optional[Dict[str, Any]] = None, skill: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Resources matching a skill and/or filters (see data.resource_catalog)."""
+        return self._catalog.select(filters, skill.lower().strip() if skill else None)
 
 
 # Singleton instance
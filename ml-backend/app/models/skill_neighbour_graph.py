@@ -0,0 +1,133 @@
+"""Precomputed semantic neighbours of the embedded skills.
+
+Embedded skills are fixed per artifact version, so which of them are similar
+enough to match (cosine similarity above SkillAnalyzer's 0.85 threshold) can
+be computed once when the embeddings load instead of per request. The graph
+keeps each skill's neighbours above the threshold, most similar first and at
+most MAX_NEIGHBOURS of them, as CSR arrays; matching a skill against a
+candidate's skills then walks its neighbour list for the first one the
+candidate holds. Lists cut at MAX_NEIGHBOURS are flagged: when none of their
+neighbours is held, a less similar candidate may still be above the
+threshold, so callers fall back to computing similarities.
+
+Similarities are computed in blocks of rows (block x N) so memory stays
+bounded at 50k skills, where the dense N x N matrix would take 10 GB.
+"""
+
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+SIMILARITY_THRESHOLD = 0.85
+MAX_NEIGHBOURS = 32
+
+# Similarity block size in matrix elements (64 MB of float32)
+BLOCK_ELEMENTS = 1 << 24
+
+
+class SkillNeighbourGraph:
+    """Top-k neighbours above a similarity threshold for every embedded skill.
+
+    Args:
+        embeddings: Skill -> embedding (skill_embeddings.joblib)
+        threshold: Minimum cosine similarity (exclusive) for a neighbour
+        k: Maximum neighbours kept per skill
+        block_rows: Rows of the similarity matrix computed at a time
+            (default: BLOCK_ELEMENTS / number of skills)
+    """
+
+    def __init__(
+        self,
+        embeddings: Dict[str, np.ndarray],
+        threshold: float = SIMILARITY_THRESHOLD,
+        k: int = MAX_NEIGHBOURS,
+        block_rows: Optional[int] = None,
+    ):
+        self.threshold = threshold
+        self.k = k
+        self.names: List[str] = list(embeddings)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        n = len(self.names)
+
+        matrix = np.array([embeddings[name] for name in self.names], dtype=np.float32).reshape(n, -1)
+        matrix /= np.linalg.norm(matrix, axis=1, keepdims=True) + 1e-8
+        block_rows = block_rows or max(1, BLOCK_ELEMENTS // max(n, 1))
+
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        indices, scores = [], []
+        # Rows whose neighbour list was cut at k
+        self.truncated = np.zeros(n, dtype=bool)
+        for start in range(0, n, block_rows):
+            block = matrix[start:start + block_rows] @ matrix.T
+            rows = np.arange(len(block))
+            block[rows, start + rows] = -np.inf  # a skill isn't its own neighbour
+            for r, similarities in enumerate(block):
+                above = np.flatnonzero(similarities > threshold)
+                if len(above) > k:
+                    self.truncated[start + r] = True
+                    above = above[np.argpartition(-similarities[above], k - 1)[:k]]
+                above = above[np.argsort(-similarities[above], kind="stable")]
+                indices.append(above.astype(np.int32))
+                scores.append(similarities[above])
+                indptr[start + r + 1] = indptr[start + r] + len(above)
+        self.indptr = indptr
+        self.indices = np.concatenate(indices) if indices else np.zeros(0, dtype=np.int32)
+        self.scores = np.concatenate(scores).astype(np.float32) if scores else np.zeros(0, dtype=np.float32)
+
+    def __contains__(self, skill: str) -> bool:
+        return skill in self.index
+
+    def neighbours(self, skill: str) -> List[Tuple[str, float]]:
+        """(neighbour, similarity) pairs of an embedded skill, most similar first."""
+        i = self.index.get(skill)
+        if i is None:
+            return []
+        lo, hi = self.indptr[i], self.indptr[i + 1]
+        return [(self.names[j], float(s)) for j, s in zip(self.indices[lo:hi], self.scores[lo:hi])]
+
+    def is_truncated(self, skill: str) -> bool:
+        """Whether an embedded skill has more than k neighbours above the threshold."""
+        i = self.index.get(skill)
+        return i is not None and bool(self.truncated[i])
+
+    def best_match(self, skill: str, candidate_set: set, threshold: float) -> Tuple[Optional[str], float]:
+        """Most similar neighbour of a skill in candidate_set with similarity above threshold.
+
+        Returns:
+            Tuple of (candidate, similarity), or (None, threshold) if none
+        """
+        i = self.index.get(skill)
+        if i is not None:
+            lo, hi = self.indptr[i], self.indptr[i + 1]
+            for j, score in zip(self.indices[lo:hi].tolist(), self.scores[lo:hi].tolist()):
+                if score <= threshold:
+                    break
+                if self.names[j] in candidate_set:
+                    return self.names[j], score
+        return None, threshold
+
+    def stats(self) -> Dict[str, Any]:
+        """Graph size: skills, edges, lists cut at k neighbours, and array bytes."""
+        degrees = np.diff(self.indptr)
+        return {
+            "skills": len(self.names),
+            "edges": int(len(self.indices)),
+            "max_degree": int(degrees.max()) if len(degrees) else 0,
+            "truncated": int(self.truncated.sum()),
+            "bytes": int(self.indptr.nbytes + self.indices.nbytes + self.scores.nbytes + self.truncated.nbytes),
+        }
+
+
+_GRAPH: Dict[str, Any] = {"embeddings": None, "graph": None}
+_LOCK = threading.Lock()
+
+
+def get_neighbour_graph(embeddings: Dict[str, np.ndarray]) -> SkillNeighbourGraph:
+    """Graph for a loaded embeddings dict (built on first use)."""
+    if _GRAPH["embeddings"] is not embeddings:
+        with _LOCK:
+            if _GRAPH["embeddings"] is not embeddings:
+                _GRAPH["graph"] = SkillNeighbourGraph(embeddings)
+                _GRAPH["embeddings"] = embeddings
+    return _GRAPH["graph"]
@@ -0,0 +1,148 @@
+"""Embeddings for skills missing from skill_embeddings.joblib.
+
+The sentence-transformer embeddings cover a fixed skill list, and running the
+transformer per request is too slow, so any other skill could only match
+exactly. This model maps a skill's hashed character n-grams (2-4 chars of the
+lowercased name, with word boundaries) into the same embedding space with a
+ridge-regression linear map, fitted when the embeddings are loaded: every
+embedded skill and every alias of one is a training pair. Embedding an unseen
+skill is then a sum of a few dozen rows of the map.
+
+A skill whose 3- and 4-grams were mostly never seen in training ("figma")
+would be projected near the mean embedding, which is somewhat similar to every
+skill, so it gets no embedding unless at least MIN_NGRAM_COVERAGE of them
+were seen.
+"""
+
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.core import config
+from data.store import get_data_store
+
+# Hash buckets for character n-grams (rows of the linear map)
+N_FEATURES = 1 << 12
+NGRAM_SIZES = (2, 3, 4)
+RIDGE_ALPHA = 0.1
+MIN_NGRAM_COVERAGE = 0.5
+
+
+def char_ngrams(skill: str) -> List[str]:
+    """Character 2-4 grams of a lowercased skill, padded with word boundaries."""
+    padded = f" {skill.lower().strip()} "
+    return [padded[i:i + n] for n in NGRAM_SIZES for i in range(len(padded) - n + 1)]
+
+
+def hash_ngrams(ngrams: List[str]) -> np.ndarray:
+    """Hash bucket of each n-gram (crc32, stable across processes)."""
+    return np.array([zlib.crc32(g.encode("utf-8")) & (N_FEATURES - 1) for g in ngrams], dtype=np.int64)
+
+
+def _features(skill: str) -> np.ndarray:
+    """L2-normalized hashed n-gram counts of a skill."""
+    counts = np.bincount(hash_ngrams(char_ngrams(skill)), minlength=N_FEATURES).astype(np.float64)
+    return counts / (np.linalg.norm(counts) + 1e-8)
+
+
+class SkillProjectionModel:
+    """Ridge projection of hashed character n-grams into a skill embedding space.
+
+    Args:
+        embeddings: Skill -> embedding (skill_embeddings.joblib)
+        aliases: Alias -> canonical skill name; aliases of embedded skills
+            are fitted to their skill's embedding
+        alpha: Ridge regularization strength
+    """
+
+    def __init__(self, embeddings: Dict[str, np.ndarray], aliases: Dict[str, str], alpha: float = RIDGE_ALPHA):
+        texts = list(embeddings)
+        targets = [embeddings[s] for s in texts]
+        for alias, skill in aliases.items():
+            alias = alias.lower().strip()
+            if skill in embeddings and alias not in embeddings:
+                texts.append(alias)
+                targets.append(embeddings[skill])
+
+        X = np.array([_features(t) for t in texts])
+        Y = np.array(targets, dtype=np.float64)
+        # Fitted around the mean embedding, which is what a skill with no
+        # known n-grams projects to
+        self.mean = Y.mean(axis=0)
+        # Dual form: a few hundred training skills, thousands of features
+        dual = np.linalg.solve(X @ X.T + alpha * np.eye(len(X)), Y - self.mean)
+        self.weights = (X.T @ dual).astype(np.float32)
+        self.training_size = len(texts)
+
+        # Embedded skills as L2-normalized rows, for nearest()
+        self.names = list(embeddings)
+        matrix = np.array([embeddings[name] for name in self.names], dtype=np.float32)
+        self._matrix = matrix / (np.linalg.norm(matrix, axis=1, keepdims=True) + 1e-8)
+
+        self._seen = {g for t in texts for g in char_ngrams(t) if len(g) >= 3}
+        self._cache: "OrderedDict[str, Optional[np.ndarray]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def coverage(self, skill: str) -> float:
+        """Share of a skill's 3- and 4-grams that occur in the training skills."""
+        ngrams = [g for g in char_ngrams(skill) if len(g) >= 3]
+        if not ngrams:
+            return 0.0
+        return sum(g in self._seen for g in ngrams) / len(ngrams)
+
+    def _project(self, skill: str) -> Optional[np.ndarray]:
+        if self.coverage(skill) < MIN_NGRAM_COVERAGE:
+            return None
+        buckets = hash_ngrams(char_ngrams(skill))
+        norm = np.sqrt(np.square(np.bincount(buckets)).sum())
+        return (self.mean + self.weights[buckets].sum(axis=0) / norm).astype(np.float32)
+
+    def embed(self, skill: str) -> Optional[np.ndarray]:
+        """Projected embedding of a skill, or None if too few of its n-grams are known.
+
+        Results are cached per skill (least recently used evicted beyond
+        MAX_PROJECTED_SKILLS).
+        """
+        key = skill.lower().strip()
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+        vector = self._project(key)
+        with self._lock:
+            self._cache[key] = vector
+            while len(self._cache) > config.MAX_PROJECTED_SKILLS:
+                self._cache.popitem(last=False)
+        return vector
+
+    def nearest(self, skill: str) -> Tuple[Optional[str], float]:
+        """Embedded skill most similar to a skill's projection (cosine similarity).
+
+        Returns:
+            Tuple of (skill, similarity), or (None, 0.0) if the skill gets
+            no embedding
+        """
+        vector = self.embed(skill)
+        if vector is None:
+            return None, 0.0
+        scores = self._matrix @ (vector / (np.linalg.norm(vector) + 1e-8))
+        best = int(np.argmax(scores))
+        return self.names[best], float(scores[best])
+
+
+_PROJECTION: Dict[str, Any] = {"embeddings": None, "store": None, "model": None}
+_LOCK = threading.Lock()
+
+
+def get_skill_projection(embeddings: Dict[str, np.ndarray]) -> SkillProjectionModel:
+    """Projection for a loaded embeddings dict (fitted on first use, refitted with the data store)."""
+    store = get_data_store()
+    if _PROJECTION["embeddings"] is not embeddings or _PROJECTION["store"] is not store:
+        with _LOCK:
+            if _PROJECTION["embeddings"] is not embeddings or _PROJECTION["store"] is not store:
+                _PROJECTION["model"] = SkillProjectionModel(embeddings, store.aliases)
+                _PROJECTION["embeddings"], _PROJECTION["store"] = embeddings, store
+    return _PROJECTION["model"]
@@ -13,14 +13,38 @@ This pipeline:
 from typing import List, Dict, Any, Optional, Tuple
 import numpy as np
 from app.models.readiness_model import ReadinessModel
+from app.models.skill_neighbour_graph import get_neighbour_graph
+from app.models.skill_projection_model import get_skill_projection
 from app.services.resume_parser import extract_skills_from_text, merge_skills
+from app.services import answer_table
+from app.services.catalog_service import compact_recommendations
 from app.services.role_intelligence import RoleIntelligence, get_role_intelligence
-from app.services.recommendation_service import get_skill_recommendations, get_learning_roadmap
+from app.services.recommendation_service import (
+    get_learning_roadmap,
+    get_skill_recommendations,
+    get_user_profile,
+)
+from app.core import config
 from app.core.startup import get_model, is_model_loaded
-from data.skill_dependencies import topological_sort, SKILL_DEPENDENCIES
+from data.skill_dependencies import topological_sort
+from data.skill_bitset import SkillSet, role_masks
+from data.skill_vocab import get_skill_vocabulary
+from data.skill_taxonomy import correct_skills
 from data.role_definitions import SKILL_WEIGHTS
 
 
+# Optional pipeline stages run for each AnalyzeRequest.include profile (skill
+# matching and readiness scoring always run)
+INCLUDE_STAGES = {
+    "score": frozenset(),
+    "analysis": frozenset({"gap_ranking"}),
+    "full": frozenset({"gap_ranking", "recommendations", "roadmap"}),
+}
+
+# Readiness labels by minimum readiness score, highest first (below all: last label)
+READINESS_LABELS = (("Industry Ready", 0.80), ("Almost Ready", 0.60), ("Needs Upskilling", 0.0))
+
+
 class SkillAnalyzer:
     """Analyzes candidate skills against role requirements with ML-based matching."""
     
@@ -29,18 +53,28 @@ class SkillAnalyzer:
         self.user_experience = user_experience
         self.user_skill_count = user_skill_count
         self._embeddings = get_model("skill_embeddings") if is_model_loaded("skill_embeddings") else None
+        # Embeds skills the embeddings don't cover
+        self._projection = (
+            get_skill_projection(self._embeddings) if self._embeddings and config.OOV_SKILL_EMBEDDINGS else None
+        )
+        # Precomputed neighbours of embedded skills
+        self._neighbours = get_neighbour_graph(self._embeddings) if self._embeddings else None
+        self._candidates: Dict[bool, Tuple[frozenset, List[str], np.ndarray]] = {}
         self._metadata = get_model("skill_metadata") if is_model_loaded("skill_metadata") else {}
     
     def analyze(
         self,
         candidate_skills: List[str],
-        role_skills: Optional[List[str]] = None
+        role_skills: Optional[List[str]] = None,
+        rank_missing: bool = True,
     ) -> Dict[str, Any]:
         """Perform weighted skill analysis with optional embedding-based matching.
         
         Args:
             candidate_skills: Skills the candidate has
             role_skills: Target role skills (used if no role_intel)
+            rank_missing: Rank missing skills (gap ranker or dependency order);
+                if False they are left unranked in role order
             
         Returns:
             Detailed skill analysis with matches, gaps, and scores
@@ -48,9 +82,17 @@ class SkillAnalyzer:
         candidate_set = set(s.lower().strip() for s in candidate_skills)
         
         if self.role_intel:
-            return self._analyze_with_weights(candidate_set)
+            return self._analyze_with_weights(candidate_set, rank_missing)
         else:
-            return self._analyze_simple(candidate_set, role_skills or [])
+            return self._analyze_simple(candidate_set, role_skills or [], rank_missing)
+    
+    def _skill_vector(self, skill: str) -> Optional[np.ndarray]:
+        """Embedding of a lowercased skill (projected if not embedded) as float32, or None."""
+        vector = self._embeddings.get(skill)
+        if vector is None:
+            return self._projection.embed(skill) if self._projection is not None else None
+        # Embeddings may be served as float16 (MODEL_PRECISION)
+        return np.asarray(vector, dtype=np.float32)
     
     def _compute_semantic_similarity(self, skill1: str, skill2: str) -> float:
         """Compute semantic similarity between two skills using embeddings."""
@@ -60,16 +102,34 @@ class SkillAnalyzer:
         s1 = skill1.lower()
         s2 = skill2.lower()
         
-        if s1 not in self._embeddings or s2 not in self._embeddings:
+        e1 = self._skill_vector(s1)
+        e2 = self._skill_vector(s2)
+        if e1 is None or e2 is None:
             return 1.0 if s1 == s2 else 0.0
         
-        e1 = self._embeddings[s1]
-        e2 = self._embeddings[s2]
-        
         # Cosine similarity
         similarity = np.dot(e1, e2) / (np.linalg.norm(e1) * np.linalg.norm(e2) + 1e-8)
         return float(similarity)
     
+    def _candidate_matrix(self, candidate_set: set, projected_only: bool = False) -> Tuple[List[str], np.ndarray]:
+        """Candidate skills that have embeddings (or only projected ones), as L2-normalized rows."""
+        key = frozenset(candidate_set)
+        cached = self._candidates.get(projected_only)
+        if cached is None or cached[0] != key:
+            names, vectors = [], []
+            for candidate in candidate_set:
+                if projected_only and candidate in self._embeddings:
+                    continue
+                vector = self._skill_vector(candidate)
+                if vector is not None:
+                    names.append(candidate)
+                    vectors.append(vector)
+            matrix = np.array(vectors, dtype=np.float32)
+            if vectors:
+                matrix /= np.linalg.norm(matrix, axis=1, keepdims=True) + 1e-8
+            cached = self._candidates[projected_only] = (key, names, matrix)
+        return cached[1], cached[2]
+    
     def _find_best_match(self, skill: str, candidate_set: set, threshold: float = 0.85) -> Optional[str]:
         """Find best matching skill from candidate set using embeddings."""
         if skill.lower() in candidate_set:
@@ -77,31 +137,60 @@ class SkillAnalyzer:
         
         # Try semantic matching if embeddings available
         if self._embeddings:
-            best_match = None
-            best_score = threshold
-            for candidate in candidate_set:
-                score = self._compute_semantic_similarity(skill, candidate)
-                if score > best_score:
-                    best_score = score
-                    best_match = candidate
+            skill = skill.lower()
+            graph = self._neighbours
+            if skill in graph and threshold >= graph.threshold:
+                # Embedded candidates: first of the skill's precomputed
+                # neighbours that the candidate holds
+                best_match, best_score = graph.best_match(skill, candidate_set, threshold)
+                # A list cut at k neighbours can miss a less similar held
+                # skill; without a match from it, all candidates are scanned
+                projected_only = best_match is not None or not graph.is_truncated(skill)
+                names, matrix = self._candidate_matrix(candidate_set, projected_only=projected_only)
+            else:
+                best_match, best_score = None, threshold
+                names, matrix = self._candidate_matrix(candidate_set)
+            
+            # Remaining candidates: one matrix-vector product
+            vector = self._skill_vector(skill)
+            if vector is not None and names:
+                scores = matrix @ (vector / (np.linalg.norm(vector) + 1e-8))
+                best = int(np.argmax(scores))
+                if scores[best] > best_score:
+                    best_match = names[best]
             return best_match
         
         return None
     
-    def _analyze_with_weights(self, candidate_set: set) -> Dict[str, Any]:
+    def _analyze_with_weights(self, candidate_set: set, rank_missing: bool = True) -> Dict[str, Any]:
         """Weighted analysis using role intelligence and ML-based matching."""
-        core = [s.lower() for s in self.role_intel.core_skills]
-        secondary = [s.lower() for s in self.role_intel.secondary_skills]
-        bonus = [s.lower() for s in self.role_intel.bonus_skills]
+        vocab = get_skill_vocabulary()
+        role_ids = vocab.role_skill_ids(self.role_intel.role_id, self.role_intel.level)
+        core, secondary, bonus = ([vocab.names[i] for i in ids] for ids in role_ids)
+        
+        # Match skills (with semantic matching if available), once per role skill
+        if self._embeddings:
+            held = [
+                [self._find_best_match(s, candidate_set) is not None for s in skills]
+                for skills in (core, secondary, bonus)
+            ]
+        else:
+            candidates = SkillSet.from_skills(candidate_set, vocab)
+            matched = [
+                candidates & mask
+                for mask in role_masks(self.role_intel.role_id, self.role_intel.level, vocab)
+            ]
+            held = [[m.has_id(i) for i in ids] for m, ids in zip(matched, role_ids)]
         
-        # Match skills (with semantic matching if available)
-        matched_core = [s for s in core if self._find_best_match(s, candidate_set)]
-        matched_secondary = [s for s in secondary if self._find_best_match(s, candidate_set)]
-        matched_bonus = [s for s in bonus if self._find_best_match(s, candidate_set)]
+        def split(skills: List[str], mask: List[bool]) -> Tuple[List[str], List[str]]:
+            return (
+                [s for s, m in zip(skills, mask) if m],
+                [s for s, m in zip(skills, mask) if not m],
+            )
         
-        missing_core = [s for s in core if not self._find_best_match(s, candidate_set)]
-        missing_secondary = [s for s in secondary if not self._find_best_match(s, candidate_set)]
-        missing_bonus = [s for s in bonus if not self._find_best_match(s, candidate_set)]
+        matched_core, missing_core = split(core, held[0])
+        matched_secondary, missing_secondary = split(secondary, held[1])
+        matched_bonus, missing_bonus = split(bonus, held[2])
         
         # Calculate weighted score
         total_weight = (
@@ -123,18 +212,15 @@ class SkillAnalyzer:
         match_percentage = len(matched_core + matched_secondary + matched_bonus) / len(all_role_skills) if all_role_skills else 0
         
         # Rank missing skills using ML model or topological sort
-        all_missing = missing_core + missing_secondary + missing_bonus
-        missing_with_priority = []
-        for skill in all_missing:
-            if skill in missing_core:
-                priority, weight = "core", SKILL_WEIGHTS["core"]
-            elif skill in missing_secondary:
-                priority, weight = "secondary", SKILL_WEIGHTS["secondary"]
-            else:
-                priority, weight = "bonus", SKILL_WEIGHTS["bonus"]
-            missing_with_priority.append({"skill": skill, "priority": priority, "weight": weight})
+        missing_with_priority = [
+            {"skill": skill, "priority": priority, "weight": SKILL_WEIGHTS[priority]}
+            for priority, skills in (
+                ("core", missing_core), ("secondary", missing_secondary), ("bonus", missing_bonus)
+            )
+            for skill in skills
+        ]
         
-        missing_skills = self._rank_missing_skills(missing_with_priority)
+        missing_skills = self._rank_missing_skills(missing_with_priority) if rank_missing else missing_with_priority
         
         return {
             "matched_skills": matched_core + matched_secondary + matched_bonus,
@@ -176,42 +262,7 @@ class SkillAnalyzer:
     
     def _rank_with_model(self, missing_skills: List[Dict]) -> List[Dict]:
         """Rank skills using trained XGBoost model."""
-        model = get_model("gap_ranker")
-        
-        # Meta: (difficulty 1-5, market_demand 1-5, learning_hours)
-        # Default: (3, 3, 20)
-        
-        # Feature columns from training:
-        # ["difficulty", "market_demand", "learning_hours", "prereq_count",
-        #  "is_core", "is_secondary", "user_experience", "user_skill_count",
-        #  "has_prereqs"]
-        
-        features = []
-        for skill_info in missing_skills:
-            skill = skill_info["skill"].lower()
-            meta = self._metadata.get(skill, (3, 3, 20))
-            prereqs = SKILL_DEPENDENCIES.get(skill, [])
-            
-            # Check if user has prereqs (mocking for now, could be improved)
-            # In a real app, we'd check against candidate_skills
-            has_prereqs = 1 if len(prereqs) == 0 else 0 
-            
-            feat = [
-                meta[0], # difficulty
-                meta[1], # market_demand
-                meta[2], # learning_hours
-                len(prereqs), # prereq_count
-                1 if skill_info["priority"] == "core" else 0, # is_core
-                1 if skill_info["priority"] == "secondary" else 0, # is_secondary
-                self.user_experience,
-                self.user_skill_count,
-                has_prereqs
-            ]
-            features.append(feat)
-        
-        # Predict priority scores
-        X = np.array(features)
-        scores = model.predict(X)
+        scores = self._score_with_model(missing_skills)
         
         # Sort by score (higher = more important)
         indexed = list(enumerate(scores))
@@ -229,17 +280,55 @@ class SkillAnalyzer:
             })
         return ranked
     
-    def _analyze_simple(self, candidate_set: set, role_skills: List[str]) -> Dict[str, Any]:
+    def _score_with_model(self, missing_skills: List[Dict]) -> np.ndarray:
+        """Predict gap priority scores for missing skills with the XGBoost model."""
+        return get_model("gap_ranker").predict(self._gap_features(missing_skills))
+    
+    def _gap_features(self, missing_skills: List[Dict]) -> np.ndarray:
+        """Gap-ranker feature rows for missing skills."""
+        # Meta: (difficulty 1-5, market_demand 1-5, learning_hours)
+        # Default: (3, 3, 20)
+        
+        # Feature columns from training:
+        # ["difficulty", "market_demand", "learning_hours", "prereq_count",
+        #  "is_core", "is_secondary", "user_experience", "user_skill_count",
+        #  "has_prereqs"]
+        
+        vocab = get_skill_vocabulary()
+        ids = vocab.ids(s["skill"] for s in missing_skills)
+        meta = vocab.metadata_array(self._metadata)[ids]
+        prereq_count = vocab.prereq_count[ids]
+        priority = np.array([s["priority"] for s in missing_skills])
+        n = len(missing_skills)
+        
+        # has_prereqs: mocked as "has no prerequisites" for now (could check
+        # against candidate_skills)
+        return np.column_stack([
+            meta[:, 0],  # difficulty
+            meta[:, 1],  # market_demand
+            meta[:, 2],  # learning_hours
+            prereq_count,
+            priority == "core",
+            priority == "secondary",
+            np.full(n, self.user_experience),
+            np.full(n, self.user_skill_count),
+            prereq_count == 0,
+        ]).astype(np.float64)
+    
+    def _analyze_simple(self, candidate_set: set, role_skills: List[str], rank_missing: bool = True) -> Dict[str, Any]:
         """Simple analysis without role weights (backward compatible)."""
-        role_set = set(s.lower().strip() for s in role_skills)
-        matched = list(candidate_set.intersection(role_set))
-        missing = [s for s in role_skills if s.lower().strip() not in candidate_set]
+        vocab = get_skill_vocabulary()
+        candidates = SkillSet.from_skills(candidate_set, vocab)
+        role_set = SkillSet.from_skills(role_skills, vocab)
+        matched_set = candidates & role_set
+        matched = matched_set.names(vocab)
+        missing = [s for s in role_skills if not candidates.contains(s, vocab)]
         
-        match_percentage = len(matched) / len(role_set) if role_set else 0
+        match_percentage = len(matched_set) / len(role_set) if role_set else 0
         
         # Prepare missing with priority info for ranking
         missing_with_priority = [{"skill": s, "priority": "core", "weight": 1.0} for s in missing]
-        missing_skills = self._rank_missing_skills(missing_with_priority)
+        missing_skills = self._rank_missing_skills(missing_with_priority) if rank_missing else missing_with_priority
         
         return {
             "matched_skills": matched,
@@ -276,12 +365,10 @@ def compute_readiness(
     readiness_score = float(proba[1])
     
     # Determine label using doc-specified thresholds
-    if readiness_score >= 0.80:
-        label = "Industry Ready"
-    elif readiness_score >= 0.60:
-        label = "Almost Ready"
-    else:
-        label = "Needs Upskilling"
+    label = next(
+        (name for name, threshold in READINESS_LABELS if readiness_score >= threshold),
+        READINESS_LABELS[-1][0],
+    )
     
     # Generate explanation factors
     factors = []
@@ -317,6 +404,11 @@ def run_pipeline(
     role_id: Optional[str] = None,
     level: Optional[str] = None,
     resume_text: Optional[str] = None,
+    personalize: bool = False,
+    resource_ratings: Optional[Dict[int, float]] = None,
+    resource_filters: Optional[Dict[str, Any]] = None,
+    include: str = "full",
+    response_format: str = "full",
 ) -> Dict[str, Any]:
     """Run the complete career readiness analysis pipeline.
     
@@ -327,12 +419,29 @@ def run_pipeline(
         role_id: Optional role identifier for role-based analysis
         level: Optional experience level for role-based analysis
         resume_text: Optional resume text for skill extraction
+        personalize: Rank resources for this candidate's profile
+        resource_ratings: Optional past ratings (resource ID -> rating) for personalization
+        resource_filters: Optional constraints on recommended resources
+            (see data.resource_catalog)
+        include: Stage profile, a key of INCLUDE_STAGES; stages outside it
+            are not run and their keys are left out of the result
+        response_format: "full", or "compact" for recommended resources as
+            catalog IDs and scores (see app.services.catalog_service)
         
     Returns:
         Complete analysis result with all features
     """
+    stages = INCLUDE_STAGES[include]
     extracted_skills = None
     
+    # Step 0: Resolve misspelled skills ("pyhton" -> "python")
+    corrections = []
+    if config.FUZZY_SKILL_MATCHING:
+        candidate_skills, corrections = correct_skills(candidate_skills, config.FUZZY_SKILL_MIN_CONFIDENCE)
+        if role_skills:
+            role_skills, role_corrections = correct_skills(role_skills, config.FUZZY_SKILL_MIN_CONFIDENCE)
+            corrections += [c for c in role_corrections if c not in corrections]
+    
     # Step 1: Extract skills from resume if provided
     if resume_text:
         extracted_skills = extract_skills_from_text(resume_text)
@@ -349,13 +458,21 @@ def run_pipeline(
             role_title = role_intel.title
             role_level = level
     
-    # Step 3: Perform skill analysis
-    analyzer = SkillAnalyzer(
-        role_intel, 
-        user_experience=experience_years, 
-        user_skill_count=len(candidate_skills)
+    # Step 3: Perform skill analysis (looked up for role-based, skills-only
+    # requests when the answer table is built)
+    answer = answer_table.lookup(
+        role_intel, candidate_skills, experience_years, resume_text, rank_missing="gap_ranking" in stages
     )
-    skill_analysis = analyzer.analyze(candidate_skills, role_skills)
+    if answer is not None:
+        skill_analysis, table_roadmap = answer
+    else:
+        analyzer = SkillAnalyzer(
+            role_intel, 
+            user_experience=experience_years, 
+            user_skill_count=len(candidate_skills)
+        )
+        skill_analysis = analyzer.analyze(candidate_skills, role_skills, rank_missing="gap_ranking" in stages)
+        table_roadmap = None
     
     # Step 4: Compute readiness with explanation
     label, readiness_score, factors = compute_readiness(
@@ -366,13 +483,61 @@ def run_pipeline(
     
     # Step 5: Get recommendations for missing skills
     missing_skill_names = [s["skill"] for s in skill_analysis["missing_skills"]]
-    recommendations = get_skill_recommendations(missing_skill_names)
+    recommendations = None
+    if "recommendations" in stages:
+        profile = get_user_profile(candidate_skills, resource_ratings) if personalize else None
+        recommendations = get_skill_recommendations(
+            missing_skill_names, profile=profile, filters=resource_filters
+        )
+    
+    catalog_version = None
+    if recommendations is not None and response_format == "compact":
+        recommendations, catalog_version = compact_recommendations(recommendations)
     
     # Step 6: Generate 30-day roadmap
-    roadmap = get_learning_roadmap(missing_skill_names, weeks=4)
+    roadmap = None
+    if "roadmap" in stages:
+        roadmap = table_roadmap if table_roadmap is not None else get_learning_roadmap(missing_skill_names, weeks=4)
+    
+    result = build_analysis_result(
+        skill_analysis,
+        label,
+        readiness_score,
+        factors,
+        experience_years,
+        recommendations,
+        roadmap,
+        role_title=role_title,
+        role_level=role_level,
+        extracted_skills=extracted_skills,
+        include=include,
+    )
+    if catalog_version is not None:
+        result["catalog_version"] = catalog_version
+    if corrections:
+        result["skill_corrections"] = corrections
+    return result
+
+
+def build_analysis_result(
+    skill_analysis: Dict[str, Any],
+    label: str,
+    readiness_score: float,
+    factors: List[str],
+    experience_years: float,
+    recommendations: Optional[List[Dict[str, Any]]],
+    roadmap: Optional[List[Dict[str, Any]]],
+    role_title: Optional[str] = None,
+    role_level: Optional[str] = None,
+    extracted_skills: Optional[List[str]] = None,
+    include: str = "full",
+) -> Dict[str, Any]:
+    """Assemble the analyze response from the outputs of each pipeline stage.
     
-    # Build response
-    return {
+    Keys of stages outside the include profile are left out.
+    """
+    stages = INCLUDE_STAGES[include]
+    result = {
         "readiness_label": label,
         "readiness_score": readiness_score,
         "role_title": role_title,
@@ -398,6 +563,13 @@ def run_pipeline(
         "roadmap": roadmap,
         "extracted_skills": extracted_skills,
     }
+    if "gap_ranking" not in stages:
+        del result["skill_analysis"]["missing_skills"]
+        del result["missing_skills"]
+    for stage in ("recommendations", "roadmap"):
+        if stage not in stages:
+            del result[stage]
+    return result
 
 
 # Backward compatibility
@@ -405,14 +577,13 @@ def compute_skill_match(candidate_skills: List[str], role_skills: List[str]) ->
     """Simple skill match ratio (for backward compatibility)."""
     if not role_skills:
         return 0.0
-    candidate_set = set(s.lower().strip() for s in candidate_skills)
-    role_set = set(s.lower().strip() for s in role_skills)
-    matched = candidate_set.intersection(role_set)
-    return len(matched) / max(1, len(role_set))
+    candidate_set = SkillSet.from_skills(candidate_skills)
+    role_set = SkillSet.from_skills(role_skills)
+    return len(candidate_set & role_set) / max(1, len(role_set))
 
 
 def detect_missing_skills(candidate_skills: List[str], role_skills: List[str]) -> List[Dict]:
     """Detect missing skills (for backward compatibility)."""
-    candidate_set = set(s.lower().strip() for s in candidate_skills)
-    missing = [s for s in role_skills if s.lower().strip() not in candidate_set]
+    candidate_set = SkillSet.from_skills(candidate_skills)
+    missing = [s for s in role_skills if not candidate_set.contains(s)]
     return [{"skill": s, "priority": "core", "weight": 1.0, "rank": i + 1} for i, s in enumerate(missing)]
@@ -1,5 +1,15 @@
 from pydantic import BaseModel
-from typing import List, Optional, Literal
+from typing import Dict, List, Optional, Literal, Union
+
+
+class ResourceFilters(BaseModel):
+    """Constraints on recommended learning resources (all optional, combined with AND)."""
+    types: List[str] = []  # e.g. ["youtube", "course"]
+    difficulties: List[str] = []  # "beginner", "intermediate", "advanced"
+    providers: List[str] = []  # provider or YouTube channel, e.g. ["freeCodeCamp"]
+    min_duration_hours: Optional[float] = None
+    max_duration_hours: Optional[float] = None
+    free_only: bool = False
 
 
 class AnalyzeRequest(BaseModel):
@@ -23,3 +33,40 @@ class AnalyzeRequest(BaseModel):
     target_role_skills: List[str] = []
     
     experience_years: float = 0.0
+    
+    # Personalized recommendations: rank resources using the candidate's skills
+    # and past ratings (resource ID -> rating in [0, 1]; rated resources are skipped)
+    personalize: bool = False
+    resource_ratings: Dict[int, float] = {}
+    
+    # Only recommend resources matching these filters
+    resource_filters: Optional[ResourceFilters] = None
+    
+    # Pipeline stages to run: "score" (readiness and skill match only),
+    # "analysis" (plus ranked missing skills) or "full" (plus recommendations
+    # and roadmap). Sessions always run the full pipeline.
+    include: Literal["score", "analysis", "full"] = "full"
+    
+    # "compact" returns recommended resources as IDs (and scores) from
+    # GET /catalog/resources instead of full objects
+    response_format: Literal["full", "compact"] = "full"
+
+
+class SkillDeltaRequest(BaseModel):
+    """Skills added or removed since the previous analysis of a session."""
+    add: List[str] = []
+    remove: List[str] = []
+
+
+class CohortRequest(BaseModel):
+    """Many candidates analyzed against one role, returned as aggregates."""
+    role_id: Optional[str] = None
+    level: Optional[Literal["intern", "junior", "mid", "senior"]] = None
+    target_role_skills: List[str] = []  # Used when role_id/level are not given
+    
+    candidates: List[List[str]]  # Skill list per candidate
+    experience_years: Union[float, List[float]] = 0.0  # One value, or one per candidate
+    
+    top_k: int = 20  # Skill gaps and co-missing pairs to report
+    stream: bool = False  # NDJSON partial aggregates while processing
+    chunk_size: int = 10000
@@ -0,0 +1,257 @@
+"""Precomputed answers for role-based, skills-only analyses.
+
+For a role-based request without resume text (and without embedding-based
+matching), the skill analysis depends only on which of the role's skills the
+candidate holds; other skills only change user_skill_count, a gap-ranker
+feature. The table enumerates every held subset of every role level and
+stores its skill analysis and roadmap, indexed by a bitmask of the held role
+skills, so such a request becomes a bitmask lookup.
+
+Gap-ranker scores are stored apart from the subsets: a missing skill's score
+depends only on the skill, its priority, experience and user_skill_count,
+and the ranker (gradient-boosted trees) is constant in the last two between
+its split thresholds. Scores are stored once per (skill, priority,
+experience bucket, skill-count bucket), with buckets cut at those
+thresholds, so table answers equal the pipeline's for any experience and
+skill count; a subset's ranking sorts its missing skills' stored scores.
+
+Built at startup when PRECOMPUTE_ANSWER_TABLE is set. Hits and misses are
+counted in /metrics; see scripts/answer_table_report.py for size, build time
+and hit ratio.
+"""
+
+import json
+import time
+from bisect import bisect_right
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.core import metrics
+from app.core.startup import get_model, is_model_loaded
+from app.services.recommendation_service import get_learning_roadmap
+from app.services.role_intelligence import RoleIntelligence, get_role_intelligence
+from data.skill_vocab import UNKNOWN, get_skill_vocabulary
+from data.store import get_data_store
+
+# Role levels with more distinct skills are left to the pipeline (2^n subsets)
+MAX_ROLE_SKILLS = 16
+
+# Gap-ranker feature columns (see SkillAnalyzer._gap_features) that vary per request
+EXPERIENCE_COLUMN = 6
+SKILL_COUNT_COLUMN = 7
+
+_TABLE: Dict[str, Any] = {}
+
+
+def _split_thresholds(model, column: int) -> List[float]:
+    """Sorted split thresholds of a feature in an XGBoost model (float32 values)."""
+    booster = model.get_booster()
+    names = booster.feature_names or [f"f{i}" for i in range(booster.num_features())]
+    feature = names[column]
+    thresholds = set()
+
+    def walk(node):
+        if "split" in node:
+            if node["split"] == feature:
+                thresholds.add(float(np.float32(node["split_condition"])))
+            for child in node["children"]:
+                walk(child)
+
+    for tree in booster.get_dump(dump_format="json"):
+        walk(json.loads(tree))
+    return sorted(thresholds)
+
+
+def _bucket_values(thresholds: List[float]) -> np.ndarray:
+    """One feature value per bucket: just below the first threshold, then each threshold.
+
+    XGBoost sends x < threshold left (comparing float32 values), so every
+    value in [t[k-1], t[k]) takes the same path as t[k-1].
+    """
+    if not thresholds:
+        return np.zeros(1)
+    below = np.nextafter(np.float32(thresholds[0]), np.float32(-np.inf))
+    return np.array([below] + thresholds, dtype=np.float64)
+
+
+def _bucket(thresholds: List[float], value: float) -> int:
+    return bisect_right(thresholds, float(np.float32(value)))
+
+
+def _build_scores(analyzer, skills: List[Tuple[str, str]], model) -> Dict[str, Any]:
+    """Gap-ranker scores of (skill, priority) rows for every bucket pair."""
+    experience = _split_thresholds(model, EXPERIENCE_COLUMN)
+    skill_count = _split_thresholds(model, SKILL_COUNT_COLUMN)
+    experience_values, count_values = _bucket_values(experience), _bucket_values(skill_count)
+
+    base = analyzer._gap_features([{"skill": s, "priority": p} for s, p in skills])
+    scores = np.empty((len(skills), len(experience_values), len(count_values)), dtype=np.float32)
+    features = np.tile(base, (len(count_values), 1))
+    features[:, SKILL_COUNT_COLUMN] = np.repeat(count_values, len(skills))
+    for e, value in enumerate(experience_values):
+        features[:, EXPERIENCE_COLUMN] = value
+        scores[:, e, :] = model.predict(features).reshape(len(count_values), len(skills)).T
+    return {"scores": scores, "experience": experience, "skill_count": skill_count}
+
+
+def build_answer_table(role_levels: Optional[List[Tuple[str, str]]] = None) -> Optional[Dict[str, Any]]:
+    """Enumerate every role level's held subsets and install the table.
+
+    Args:
+        role_levels: (role_id, level) pairs to cover (default: all)
+
+    Returns:
+        The table, or None when requests can't be answered from one
+        (embedding-based matching is enabled)
+    """
+    # Imported here: the pipeline uses this table
+    from app.pipelines.pipeline import SkillAnalyzer
+
+    if is_model_loaded("skill_embeddings"):
+        print("Answer table disabled: skill embeddings enable semantic matching")
+        _TABLE.pop("current", None)
+        return None
+
+    start = time.perf_counter()
+    store = get_data_store()
+    vocab = get_skill_vocabulary()
+    ranker = get_model("gap_ranker") if is_model_loaded("gap_ranker") else None
+    analyzer = SkillAnalyzer()
+
+    roles: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    rows: Dict[Tuple[str, str], int] = {}  # (skill, priority) -> score row
+    roadmaps: Dict[frozenset, List[Dict[str, Any]]] = {}
+    if role_levels is None:
+        role_levels = [(role_id, level) for role_id, role in store.roles.items() for level in role["levels"]]
+    for role_id, level in role_levels:
+        if get_role_intelligence(role_id, level) is None:
+            continue
+        listing_ids = [i for ids in vocab.role_skill_ids(role_id, level) for i in ids]
+        distinct = list(dict.fromkeys(listing_ids))
+        if UNKNOWN in distinct or len(distinct) > MAX_ROLE_SKILLS:
+            continue
+
+        role_analyzer = SkillAnalyzer(get_role_intelligence(role_id, level))
+        entries = []
+        for mask in range(1 << len(distinct)):
+            held = {distinct[k] for k in range(len(distinct)) if mask >> k & 1}
+            analysis = role_analyzer._analyze_with_weights({vocab.names[i] for i in held}, rank_missing=False)
+            missing = analysis["missing_skills"]
+            names = frozenset(s["skill"] for s in missing)
+            if names not in roadmaps:
+                roadmaps[names] = get_learning_roadmap([s["skill"] for s in missing], weeks=4)
+            entries.append({
+                "analysis": analysis,
+                "rows": np.array(
+                    [rows.setdefault((s["skill"], s["priority"]), len(rows)) for s in missing],
+                    dtype=np.int64,
+                ),
+                # Dependency-order ranking, when there is no gap ranker
+                "ranked": role_analyzer._rank_missing_skills(missing) if ranker is None else None,
+                "roadmap": roadmaps[names],
+            })
+        roles[(role_id, level)] = {"distinct": distinct, "entries": entries}
+
+    table = {
+        "store": store,
+        "vocab": vocab,
+        "ranker": ranker,
+        "roles": roles,
+        "ranking": _build_scores(analyzer, list(rows), ranker) if ranker is not None and rows else None,
+        "build_seconds": 0.0,
+    }
+    table["build_seconds"] = time.perf_counter() - start
+    _TABLE["current"] = table
+    stats = table_stats(table)
+    print(f"Answer table: {stats['entries']} subsets of {stats['role_levels']} role levels, "
+          f"{stats['score_cells']} gap scores, built in {table['build_seconds']:.2f}s")
+    return table
+
+
+def table_stats(table: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Size of a table (the installed one by default)."""
+    table = table or _TABLE.get("current")
+    if table is None:
+        return {}
+    ranking = table["ranking"]
+    return {
+        "role_levels": len(table["roles"]),
+        "entries": sum(len(role["entries"]) for role in table["roles"].values()),
+        "roadmaps": len({id(e["roadmap"]) for role in table["roles"].values() for e in role["entries"]}),
+        "score_cells": int(ranking["scores"].size) if ranking else 0,
+        "score_bytes": int(ranking["scores"].nbytes) if ranking else 0,
+        "experience_buckets": len(ranking["experience"]) + 1 if ranking else 0,
+        "skill_count_buckets": len(ranking["skill_count"]) + 1 if ranking else 0,
+        "build_seconds": round(table["build_seconds"], 3),
+    }
+
+
+def _ranked(entry: Dict[str, Any], ranking: Dict[str, Any], experience_years: float, skill_count: int):
+    """Missing skills ranked by stored gap-ranker scores (as SkillAnalyzer._rank_with_model)."""
+    missing = entry["analysis"]["missing_skills"]
+    scores = ranking["scores"][
+        entry["rows"],
+        _bucket(ranking["experience"], experience_years),
+        _bucket(ranking["skill_count"], skill_count),
+    ]
+    indexed = list(enumerate(scores))
+    indexed.sort(key=lambda x: x[1], reverse=True)
+    return [
+        {
+            "skill": missing[idx]["skill"],
+            "priority": missing[idx]["priority"],
+            "weight": missing[idx]["weight"],
+            "rank": rank,
+            "ml_score": float(score),
+        }
+        for rank, (idx, score) in enumerate(indexed, 1)
+    ]
+
+
+def lookup(
+    role_intel: Optional[RoleIntelligence],
+    candidate_skills: List[str],
+    experience_years: float,
+    resume_text: Optional[str] = None,
+    rank_missing: bool = True,
+) -> Optional[Tuple[Dict[str, Any], List[Dict[str, Any]]]]:
+    """Skill analysis and roadmap of a request from the table.
+
+    Returns:
+        Tuple of (skill analysis as SkillAnalyzer.analyze returns it, roadmap),
+        or None when the table is not built, out of date or doesn't cover
+        the request (no role, resume text, unlisted role level)
+    """
+    table = _TABLE.get("current")
+    if table is None:
+        return None
+    role = table["roles"].get((role_intel.role_id, role_intel.level)) if role_intel else None
+    if (
+        role is None
+        or resume_text
+        or table["store"] is not get_data_store()
+        or table["vocab"] is not get_skill_vocabulary()
+        or (table["ranker"] is not None and table["ranker"] is not get_model("gap_ranker"))
+    ):
+        metrics.increment("answer_table_misses_total")
+        return None
+
+    bits, _ = table["vocab"].mask(set(s.lower().strip() for s in candidate_skills))
+    mask = 0
+    for k, i in enumerate(role["distinct"]):
+        if bits >> i & 1:
+            mask |= 1 << k
+    entry = role["entries"][mask]
+
+    analysis = {k: list(v) if isinstance(v, list) else v for k, v in entry["analysis"].items()}
+    if not rank_missing:
+        analysis["missing_skills"] = [dict(s) for s in analysis["missing_skills"]]
+    elif entry["ranked"] is not None:
+        analysis["missing_skills"] = [dict(s) for s in entry["ranked"]]
+    elif table["ranking"] is not None and len(entry["rows"]):
+        analysis["missing_skills"] = _ranked(entry, table["ranking"], experience_years, len(candidate_skills))
+    else:
+        analysis["missing_skills"] = []
+    metrics.increment("answer_table_hits_total")
+    return analysis, entry["roadmap"]
@@ -0,0 +1,169 @@
+"""Public learning-resource catalog and compact recommendation blocks.
+
+Every resource a response can recommend (the data store's resources, as
+served per skill, and the ML recommender's resources) gets a content-hash ID.
+The catalog maps IDs to resources and is served as one pre-encoded JSON
+document, so clients fetch it once and revalidate with an ETag. Compact
+analyze responses then carry only resource IDs, with scores as parallel
+arrays (ml_scores, personalized_scores).
+
+The catalog version is a hash of the data store's content version and the
+recommender artifacts, so compact responses don't read the whole store (the
+SQLite store pages resources in on demand): they only hash the resources of
+the skills they recommend for. The document is built on the first request
+for it. Both are redone when the data store or the recommender snapshot
+changes.
+"""
+
+import hashlib
+import json
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.serialization import PreSerialized, dumps
+from app.core.startup import artifact_version, get_model, refresh_recommender
+from app.services.recommendation_service import ml_resource_view
+from data.skill_vocab import get_skill_vocabulary
+from data.store import RESOURCE_PAGE_SIZE, get_data_store
+
+# Keys that vary per response; everything else identifies the resource
+SCORE_KEYS = ("ml_score", "personalized_score")
+
+# Compact responses round scores to this many decimals
+SCORE_DECIMALS = 4
+
+_CATALOG: Dict[str, Any] = {}
+_CATALOG_LOCK = threading.Lock()
+
+
+def resource_id(resource: Dict[str, Any]) -> str:
+    """Content-hash ID of a resource (score keys ignored)."""
+    content = {k: v for k, v in resource.items() if k not in SCORE_KEYS}
+    encoded = json.dumps(content, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha1(encoded.encode("utf-8")).hexdigest()[:16]
+
+
+def _skill_resources(resources, skill: str) -> List[Dict[str, Any]]:
+    # The first page is what get_resources_for_skill serves; paged stores
+    # are read without churning their cache
+    if hasattr(resources, "page"):
+        return resources.page(skill, 0, RESOURCE_PAGE_SIZE)
+    return resources[skill]
+
+
+def _catalog_version(store, recommender: Optional[Dict[str, Any]]) -> str:
+    # The store's content version and the recommender artifacts identify the
+    # contents without reading every resource; in-memory resources (which
+    # change with the code, not a file) are hashed as well
+    parts = [store.content_version(), artifact_version() if recommender is not None else None]
+    if not hasattr(store.resources, "page"):
+        parts.append(hashlib.sha256(dumps(dict(store.resources))).hexdigest())
+    return hashlib.sha256(json.dumps(parts).encode("utf-8")).hexdigest()[:16]
+
+
+def get_catalog() -> Dict[str, Any]:
+    """The current catalog's version, with ID sets filled in as responses need them.
+
+    The catalog document itself is built by catalog_body() when first requested.
+    """
+    refresh_recommender()
+    store = get_data_store()
+    recommender = get_model("recommender")
+    catalog = _CATALOG.get("current")
+    if catalog is not None and catalog["store"] is store and catalog["recommender"] is recommender:
+        return catalog
+    with _CATALOG_LOCK:
+        catalog = _CATALOG.get("current")
+        if catalog is None or catalog["store"] is not store or catalog["recommender"] is not recommender:
+            catalog = _CATALOG["current"] = {
+                "store": store,
+                "recommender": recommender,
+                "version": _catalog_version(store, recommender),
+                "skill_ids": {},
+                "recommender_ids": None,
+                "body": None,
+                "compact_blocks": {},
+            }
+    return catalog
+
+
+def catalog_body(catalog: Dict[str, Any]) -> bytes:
+    """The encoded catalog document: every store and recommender resource by ID.
+
+    Reads every skill's first page of resources, so it is built once per
+    catalog version, on the first request for it.
+    """
+    if catalog["body"] is None:
+        with _CATALOG_LOCK:
+            if catalog["body"] is None:
+                store, recommender = catalog["store"], catalog["recommender"]
+                resources: Dict[str, Dict[str, Any]] = {}
+                for skill in store.resources:
+                    for resource in _skill_resources(store.resources, skill):
+                        resources.setdefault(resource_id(resource), resource)
+                if recommender is not None:
+                    for resource in recommender["resources"]:
+                        view = ml_resource_view(resource)
+                        resources.setdefault(resource_id(view), view)
+                catalog["body"] = b'{"version":"%s","count":%d,"resources":%s}' % (
+                    catalog["version"].encode(), len(resources), dumps(resources)
+                )
+    return catalog["body"]
+
+
+def _in_catalog(catalog: Dict[str, Any], skill: str, rid: str) -> bool:
+    """Whether a resource recommended for a skill is in the catalog.
+
+    Curated resources come from the skill's own resources, ML ones from the
+    recommender's, so only those are hashed (once per catalog version).
+    """
+    recommender = catalog["recommender"]
+    if recommender is not None:
+        if catalog["recommender_ids"] is None:
+            catalog["recommender_ids"] = {
+                resource_id(ml_resource_view(resource)) for resource in recommender["resources"]
+            }
+        if rid in catalog["recommender_ids"]:
+            return True
+    ids = catalog["skill_ids"].get(skill)
+    if ids is None:
+        vocab = get_skill_vocabulary()
+        ids = catalog["skill_ids"][skill] = {resource_id(r) for r in vocab.resources_for_id(vocab.id(skill))}
+    return rid in ids
+
+
+def _compact_block(block: Dict[str, Any], catalog: Dict[str, Any]) -> Dict[str, Any]:
+    """Block with resources as catalog IDs and scores as parallel arrays."""
+    compact = {"skill": block["skill"], "resources": [], "source": block["source"]}
+    scores: Dict[str, List[float]] = {}
+    for resource in block["resources"]:
+        rid = resource_id(resource)
+        # Resources outside the catalog (e.g. generated search links) are sent in full
+        compact["resources"].append(rid if _in_catalog(catalog, block["skill"], rid) else resource)
+        for key in SCORE_KEYS:
+            if key in resource:
+                scores.setdefault(key + "s", []).append(round(resource[key], SCORE_DECIMALS))
+    compact.update(scores)
+    return compact
+
+
+def compact_recommendations(blocks: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], str]:
+    """Replace catalog resources in recommendation blocks with their IDs.
+
+    Shared (pre-serialized) blocks are compacted once per catalog version.
+
+    Returns:
+        Tuple of (compact blocks, catalog version)
+    """
+    catalog = get_catalog()
+    cache = catalog["compact_blocks"]
+    compact = []
+    for block in blocks:
+        shared = isinstance(block, PreSerialized)
+        result = cache.get(block.json) if shared else None
+        if result is None:
+            result = _compact_block(block, catalog)
+            if shared:
+                result = cache[block.json] = PreSerialized(result)
+        compact.append(result)
+    return compact, catalog["version"]
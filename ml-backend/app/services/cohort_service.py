@@ -0,0 +1,281 @@
+"""Cohort analytics: aggregate skill gaps over many candidates for one role.
+
+Candidates are processed in chunks. Each chunk becomes a boolean
+candidates x role-skills matrix (skills are matched through vocabulary IDs, as
+in the pipeline's exact-match path), from which weighted scores, readiness,
+per-skill gaps and co-missing pairs (missing.T @ missing) are computed with
+matrix operations. Only running totals are kept between chunks, so the
+aggregate after any chunk can be reported as a partial result.
+
+Misspelled skills are corrected as in the pipeline (FUZZY_SKILL_MATCHING), but
+semantic (embedding) matching is not applied; scores equal /inference/analyze
+results whenever skill embeddings are not loaded.
+"""
+
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+
+from app.core import config
+from app.models.readiness_model import ReadinessModel
+from app.pipelines.pipeline import READINESS_LABELS
+from app.services.role_intelligence import get_role_intelligence
+from data.role_definitions import SKILL_WEIGHTS
+from data.skill_taxonomy import correct_skills
+from data.skill_vocab import UNKNOWN, get_skill_vocabulary
+
+# Fine score histogram used for quantiles; reported with HISTOGRAM_BINS bins
+_QUANTILE_BINS = 1000
+HISTOGRAM_BINS = 10
+
+_END = object()
+
+
+class CohortAggregator:
+    """Running cohort aggregates for a fixed list of role skills.
+
+    Args:
+        skills: Role skill listings in role order (lowercased; may repeat)
+        priorities: Category of each listing ("core", "secondary", "bonus")
+        weighted: True for role-based scoring, False for a custom skill list
+            (set overlap, as in the pipeline's backward-compatible mode)
+        top_k: Number of skill gaps and co-missing pairs to report
+    """
+
+    def __init__(self, skills: Sequence[str], priorities: Sequence[str], weighted: bool, top_k: int = 20):
+        vocab = get_skill_vocabulary()
+        self._vocab = vocab
+        self._weighted = weighted
+        self._top_k = top_k
+
+        # Distinct skills are the matrix columns; listings map onto them
+        self.skills: List[str] = list(dict.fromkeys(skills))
+        column = {skill: j for j, skill in enumerate(self.skills)}
+        self._listing_columns = np.array([column[s] for s in skills], dtype=np.int64)
+        self._priority_of = {}
+        for skill, priority in zip(skills, priorities):
+            self._priority_of.setdefault(skill, priority)
+
+        # Vocabulary ID -> column (last entry for UNKNOWN); skills outside the
+        # vocabulary (custom role lists) are matched by name
+        self._column_of_id = np.full(len(vocab) + 1, -1, dtype=np.int64)
+        self._column_of_name: Dict[str, int] = {}
+        for skill, j in column.items():
+            i = vocab.id(skill)
+            if i == UNKNOWN:
+                self._column_of_name[skill] = j
+            else:
+                self._column_of_id[i] = j
+
+        weights = np.array([SKILL_WEIGHTS[p] if weighted else 1.0 for p in priorities])
+        self._listing_weights = weights
+        self._total_weight = weights.sum()
+
+        d = len(self.skills)
+        self.count = 0
+        self._score_sum = 0.0
+        self._score_hist = np.zeros(_QUANTILE_BINS, dtype=np.int64)
+        self._readiness = np.zeros(len(READINESS_LABELS), dtype=np.int64)
+        self._missing = np.zeros(d, dtype=np.int64)
+        self._co_missing = np.zeros((d, d), dtype=np.int64)
+
+    def _skill_matrix(self, skill_lists: Sequence[Sequence[str]]) -> np.ndarray:
+        """Boolean candidates x distinct role skills matrix."""
+        flat = [s for skills in skill_lists for s in skills]
+        rows = np.repeat(np.arange(len(skill_lists)), [len(skills) for skills in skill_lists])
+        ids = self._vocab.ids(flat)
+        if config.FUZZY_SKILL_MATCHING:
+            # Only skills outside the vocabulary can be corrected
+            unknown = np.flatnonzero(ids == UNKNOWN)
+            if len(unknown):
+                corrected, _ = correct_skills([flat[k] for k in unknown], config.FUZZY_SKILL_MIN_CONFIDENCE)
+                for k, skill in zip(unknown, corrected):
+                    flat[k] = skill
+                ids[unknown] = self._vocab.ids(corrected)
+        columns = self._column_of_id[ids]
+        if self._column_of_name:
+            for k in np.flatnonzero(columns < 0):
+                columns[k] = self._column_of_name.get(flat[k].lower().strip(), -1)
+        held = np.zeros((len(skill_lists), len(self.skills)), dtype=bool)
+        known = columns >= 0
+        held[rows[known], columns[known]] = True
+        return held
+
+    def add(self, skill_lists: Sequence[Sequence[str]], experience_years: np.ndarray):
+        """Fold a chunk of candidates into the aggregates."""
+        if not len(skill_lists):
+            return
+        held = self._skill_matrix(skill_lists)
+
+        if self._weighted:
+            listings = held[:, self._listing_columns]
+            scores = listings @ self._listing_weights / self._total_weight if self._total_weight else \
+                np.zeros(len(held))
+        else:
+            scores = held.mean(axis=1) if self.skills else np.zeros(len(held))
+
+        readiness = ReadinessModel().predict_proba_batch(np.column_stack([scores, experience_years]))
+        thresholds = np.array([threshold for _, threshold in READINESS_LABELS])
+        # Index of the first label whose threshold the score reaches
+        labels = np.minimum((readiness[:, None] < thresholds[None, :]).sum(axis=1), len(thresholds) - 1)
+
+        missing = (~held).astype(np.float32)
+        self.count += len(held)
+        self._score_sum += float(scores.sum())
+        self._score_hist += np.bincount(
+            np.minimum((scores * _QUANTILE_BINS).astype(np.int64), _QUANTILE_BINS - 1),
+            minlength=_QUANTILE_BINS,
+        )
+        self._readiness += np.bincount(labels, minlength=len(READINESS_LABELS))
+        self._missing += missing.sum(axis=0).astype(np.int64)
+        self._co_missing += np.rint(missing.T @ missing).astype(np.int64)
+
+    def _quantile(self, q: float) -> float:
+        cumulative = np.cumsum(self._score_hist)
+        b = int(np.searchsorted(cumulative, q * self.count, side="left"))
+        return round((min(b, _QUANTILE_BINS - 1) + 0.5) / _QUANTILE_BINS, 3)
+
+    def summary(self) -> Dict[str, Any]:
+        """Compact aggregates over the candidates added so far."""
+        n = max(self.count, 1)
+        coarse = self._score_hist.reshape(HISTOGRAM_BINS, -1).sum(axis=1)
+
+        gap_order = np.argsort(-self._missing, kind="stable")[:self._top_k]
+        skill_gaps = [
+            {
+                "skill": self.skills[j],
+                "priority": self._priority_of[self.skills[j]],
+                "missing_count": int(self._missing[j]),
+                "missing_rate": round(self._missing[j] / n, 4),
+            }
+            for j in gap_order
+        ]
+
+        # Top co-missing pairs from the upper triangle
+        d = len(self.skills)
+        a, b = np.triu_indices(d, k=1)
+        counts = self._co_missing[a, b]
+        pair_order = np.argsort(-counts, kind="stable")[:self._top_k]
+        rates = self._missing / n
+        pairs = []
+        for p in pair_order:
+            if counts[p] == 0:
+                break
+            expected = rates[a[p]] * rates[b[p]]
+            pairs.append({
+                "skills": [self.skills[a[p]], self.skills[b[p]]],
+                "count": int(counts[p]),
+                "rate": round(counts[p] / n, 4),
+                "lift": round(counts[p] / n / expected, 3) if expected > 0 else None,
+            })
+
+        return {
+            "candidates": self.count,
+            "weighted_score": {
+                "mean": round(self._score_sum / n, 4),
+                "p10": self._quantile(0.10),
+                "p25": self._quantile(0.25),
+                "median": self._quantile(0.50),
+                "p75": self._quantile(0.75),
+                "p90": self._quantile(0.90),
+                "histogram": {
+                    "bin_edges": [round(i / HISTOGRAM_BINS, 2) for i in range(HISTOGRAM_BINS + 1)],
+                    "counts": coarse.tolist(),
+                },
+            },
+            "readiness": {
+                label: int(count) for (label, _), count in zip(READINESS_LABELS, self._readiness)
+            },
+            "skill_gaps": skill_gaps,
+            "co_missing_pairs": pairs,
+        }
+
+
+def cohort_aggregator(
+    role_id: Optional[str] = None,
+    level: Optional[str] = None,
+    role_skills: Optional[List[str]] = None,
+    top_k: int = 20,
+) -> CohortAggregator:
+    """Aggregator for a predefined role level, or a custom skill list.
+
+    Raises:
+        ValueError: Unknown role/level, or neither a role nor skills given
+    """
+    if role_id or level:
+        role_intel = get_role_intelligence(role_id, level)
+        if role_intel is None:
+            raise ValueError(f"Unknown role '{role_id}' or level '{level}'")
+        skills, priorities = [], []
+        for priority, listed in (
+            ("core", role_intel.core_skills),
+            ("secondary", role_intel.secondary_skills),
+            ("bonus", role_intel.bonus_skills),
+        ):
+            skills += [s.lower().strip() for s in listed]
+            priorities += [priority] * len(listed)
+        return CohortAggregator(skills, priorities, weighted=True, top_k=top_k)
+    if not role_skills:
+        raise ValueError("Provide role_id and level, or target_role_skills")
+    if config.FUZZY_SKILL_MATCHING:
+        role_skills, _ = correct_skills(role_skills, config.FUZZY_SKILL_MIN_CONFIDENCE)
+    skills = list(dict.fromkeys(s.lower().strip() for s in role_skills))
+    return CohortAggregator(skills, ["core"] * len(skills), weighted=False, top_k=top_k)
+
+
+def iter_cohort_analysis(
+    candidates: Iterable[Sequence[str]],
+    experience_years: Union[float, Sequence[float]] = 0.0,
+    role_id: Optional[str] = None,
+    level: Optional[str] = None,
+    role_skills: Optional[List[str]] = None,
+    chunk_size: int = 10_000,
+    top_k: int = 20,
+) -> Iterator[Dict[str, Any]]:
+    """Analyze a cohort chunk by chunk, yielding the aggregate after each chunk.
+
+    Args:
+        candidates: Skill list per candidate (any iterable, consumed lazily)
+        experience_years: One value for everyone, or one per candidate
+        role_id: Role identifier (with level), or
+        role_skills: Custom required skills
+        chunk_size: Candidates per chunk
+        top_k: Skill gaps and co-missing pairs to report
+
+    Yields:
+        Summaries with "processed" and "done"; the last one has done=True
+    """
+    aggregator = cohort_aggregator(role_id, level, role_skills, top_k)
+    per_candidate = not isinstance(experience_years, (int, float))
+    experience = iter(experience_years) if per_candidate else None
+
+    chunk: List[Sequence[str]] = []
+    iterator = iter(candidates)
+    # One candidate is read ahead so the last chunk is reported only as final
+    ahead = next(iterator, _END)
+    while ahead is not _END:
+        chunk.clear()
+        while ahead is not _END and len(chunk) < chunk_size:
+            chunk.append(ahead)
+            ahead = next(iterator, _END)
+        if per_candidate:
+            years = [next(experience, None) for _ in chunk]
+            if years[-1] is None:
+                raise ValueError("experience_years has fewer entries than candidates")
+            years = np.array(years, dtype=np.float64)
+        else:
+            years = np.full(len(chunk), float(experience_years))
+        aggregator.add(chunk, years)
+        if ahead is _END:
+            break
+        yield {"processed": aggregator.count, "done": False, **aggregator.summary()}
+
+    yield {"processed": aggregator.count, "done": True, **aggregator.summary()}
+
+
+def analyze_cohort(candidates: Iterable[Sequence[str]], **kwargs) -> Dict[str, Any]:
+    """Final cohort aggregate (see iter_cohort_analysis for arguments)."""
+    summary = None
+    for summary in iter_cohort_analysis(candidates, **kwargs):
+        pass
+    return summary
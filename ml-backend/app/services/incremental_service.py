@@ -0,0 +1,446 @@
+"""Incremental re-analysis for skill toggles.
+
+A session holds the state of one analysis (role skills, candidate skill set and
+per-role-skill match support) so that adding or removing a few candidate skills
+only updates what changed instead of re-running the whole pipeline:
+
+- Match support counts are updated per toggled skill, so matched/missing sets,
+  weighted score and coverage are maintained without rescanning.
+- Gap-ranker scores are cached per skill and per range of candidate skill
+  counts the model can't tell apart (between consecutive user_skill_count
+  split thresholds of its trees). The first ranking scores every role skill
+  for every range in one model call, so toggles don't call the model.
+- Recommendation blocks are cached per (skill, user profile) and roadmaps per
+  missing set.
+"""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
+
+import numpy as np
+
+from app.core import config
+from app.core.startup import get_model, is_model_loaded
+from app.pipelines.pipeline import INCLUDE_STAGES, SkillAnalyzer, build_analysis_result, compute_readiness
+from app.services.answer_table import SKILL_COUNT_COLUMN, _bucket, _bucket_values, _split_thresholds
+from app.services.catalog_service import compact_recommendations
+from app.services.recommendation_service import (
+    get_learning_roadmap,
+    get_recommendation_for_skill,
+    get_user_profile,
+)
+from app.services.resume_parser import extract_skills_from_text, merge_skills
+from app.services.role_intelligence import get_role_intelligence
+from data.role_definitions import SKILL_WEIGHTS
+from data.skill_dependencies import topological_sort
+from data.skill_taxonomy import correct_skills, normalize_skill
+
+CATEGORIES = ("core", "secondary", "bonus")
+
+_SESSIONS: "OrderedDict[str, AnalysisSession]" = OrderedDict()
+_LOCK = threading.Lock()
+
+# user_skill_count split thresholds of the loaded gap ranker
+_COUNT_SPLITS: Dict[str, Any] = {"model": None, "splits": None}
+
+# Most feature rows scored up front for a session (role skills x count ranges)
+MAX_PREFETCHED_SCORES = 10_000
+
+
+def skill_count_splits(model) -> Optional[List[float]]:
+    """Sorted user_skill_count thresholds the gap ranker's trees split on.
+
+    Candidate skill counts between the same two thresholds follow the same
+    tree paths, so they get the same scores (see app/services/answer_table.py).
+    None if the model's trees can't be inspected (scores are then cached per
+    count).
+    """
+    if _COUNT_SPLITS["model"] is not model:
+        try:
+            splits = _split_thresholds(model, SKILL_COUNT_COLUMN)
+        except AttributeError:
+            splits = None
+        _COUNT_SPLITS["splits"] = splits
+        _COUNT_SPLITS["model"] = model
+    return _COUNT_SPLITS["splits"]
+
+
+class AnalysisSession:
+    """Incrementally maintained analysis for one candidate and target role.
+
+    Args:
+        analyzer: SkillAnalyzer configured for the role (provides matching and ranking)
+        role_skills: (category, skill) pairs in role order
+        candidate_skills: Initial candidate skills (already merged with resume skills)
+        experience_years: Years of experience
+        normalize: Function mapping a raw skill to its candidate-set key
+        weighted: True for role-based analysis, False for custom skill lists
+        personalize: Rank resources for the candidate's current profile
+        resource_ratings: Past ratings used for personalization
+        resource_filters: Constraints on recommended resources
+        include: Stage profile of results, a key of INCLUDE_STAGES
+        response_format: "full", or "compact" for recommended resources as
+            catalog IDs and scores
+        skill_corrections: Fuzzy corrections made to the initial skills,
+            reported in results as by run_pipeline
+    """
+
+    def __init__(
+        self,
+        analyzer: SkillAnalyzer,
+        role_skills: List[Tuple[str, str]],
+        candidate_skills: List[str],
+        experience_years: float,
+        normalize: Callable[[str], str],
+        weighted: bool,
+        role_title: Optional[str] = None,
+        role_level: Optional[str] = None,
+        extracted_skills: Optional[List[str]] = None,
+        personalize: bool = False,
+        resource_ratings: Optional[Dict[int, float]] = None,
+        resource_filters: Optional[Dict[str, Any]] = None,
+        include: str = "full",
+        response_format: str = "full",
+        skill_corrections: Optional[List[Dict[str, Any]]] = None,
+    ):
+        self.session_id = uuid.uuid4().hex
+        self.last_used = time.time()
+        self._analyzer = analyzer
+        self._role_skills = role_skills
+        self._experience_years = experience_years
+        self._normalize = normalize
+        self._weighted = weighted
+        self._role_title = role_title
+        self._role_level = role_level
+        self._extracted_skills = extracted_skills
+        self._personalize = personalize
+        self._resource_ratings = resource_ratings
+        self._resource_filters = resource_filters
+        self._stages = INCLUDE_STAGES[include]
+        self._include = include
+        self._response_format = response_format
+        self._skill_corrections = skill_corrections or []
+        # Deltas and results of one session may arrive concurrently
+        self._lock = threading.Lock()
+
+        self._keys = [skill.lower().strip() for _, skill in role_skills]
+        self._key_positions: Dict[str, List[int]] = {}
+        for i, key in enumerate(self._keys):
+            self._key_positions.setdefault(key, []).append(i)
+
+        self._support = [0] * len(role_skills)
+        self._candidates: set = set()
+
+        # Incrementally maintained totals
+        self._total = {c: 0 for c in CATEGORIES}
+        self._matched = {c: 0 for c in CATEGORIES}
+        for category, _ in role_skills:
+            self._total[category] += 1
+
+        # Caches reused across toggles (scores by skill count range, see _rank)
+        self._score_cache: Dict[int, Dict[str, float]] = {}
+        self._recommendation_cache: Dict[Tuple[Optional[str], str], Dict[str, Any]] = {}
+        self._roadmap_cache: Dict[FrozenSet[str], List[Dict[str, Any]]] = {}
+
+        for skill in candidate_skills:
+            self._add(self._normalize(skill))
+
+    def _matching_positions(self, candidate: str) -> List[int]:
+        """Role skill positions that a candidate skill satisfies."""
+        if not (self._weighted and self._analyzer._embeddings):
+            return self._key_positions.get(candidate, [])
+        return [
+            i for i, key in enumerate(self._keys)
+            if self._analyzer._find_best_match(key, {candidate}) is not None
+        ]
+
+    def _add(self, candidate: str):
+        if candidate in self._candidates:
+            return
+        self._candidates.add(candidate)
+        for i in self._matching_positions(candidate):
+            self._support[i] += 1
+            if self._support[i] == 1:
+                self._matched[self._role_skills[i][0]] += 1
+
+    def _remove(self, candidate: str):
+        if candidate not in self._candidates:
+            return
+        self._candidates.discard(candidate)
+        for i in self._matching_positions(candidate):
+            self._support[i] -= 1
+            if self._support[i] == 0:
+                self._matched[self._role_skills[i][0]] -= 1
+
+    def apply_delta(self, add: List[str], remove: List[str]) -> Dict[str, Any]:
+        """Apply a skill delta and return the updated analysis."""
+        with self._lock:
+            for skill in remove:
+                self._remove(self._normalize(skill))
+            for skill in add:
+                self._add(self._normalize(skill))
+            self.last_used = time.time()
+            return self._result()
+
+    def _skill_analysis(self) -> Dict[str, Any]:
+        """Matched/missing sets and scores from the maintained support counts."""
+        matched = {c: [] for c in CATEGORIES}
+        missing = {c: [] for c in CATEGORIES}
+        for i, (category, skill) in enumerate(self._role_skills):
+            if self._support[i] > 0:
+                matched[category].append(self._keys[i] if self._weighted else skill)
+            else:
+                missing[category].append(self._keys[i] if self._weighted else skill)
+
+        if not self._weighted:
+            role_set = set(self._keys)
+            held = role_set & self._candidates
+            match_percentage = len(held) / len(role_set) if role_set else 0
+            missing_with_priority = [
+                {"skill": s, "priority": "core", "weight": 1.0} for s in missing["core"]
+            ]
+            return {
+                "matched_skills": sorted(held),
+                "matched_core": sorted(held),
+                "matched_secondary": [],
+                "matched_bonus": [],
+                "missing_skills": self._rank(missing_with_priority),
+                "match_percentage": match_percentage,
+                "weighted_score": match_percentage,
+                "core_coverage": match_percentage,
+                "secondary_coverage": 1.0,
+                "bonus_coverage": 1.0,
+            }
+
+        total_weight = sum(self._total[c] * SKILL_WEIGHTS[c] for c in CATEGORIES)
+        matched_weight = sum(self._matched[c] * SKILL_WEIGHTS[c] for c in CATEGORIES)
+        n_role = sum(self._total.values())
+        n_matched = sum(self._matched.values())
+
+        missing_with_priority = [
+            {"skill": s, "priority": c, "weight": SKILL_WEIGHTS[c]}
+            for c in CATEGORIES for s in missing[c]
+        ]
+
+        def coverage(category: str) -> float:
+            total = self._total[category]
+            return self._matched[category] / total if total else 1.0
+
+        return {
+            "matched_skills": matched["core"] + matched["secondary"] + matched["bonus"],
+            "matched_core": matched["core"],
+            "matched_secondary": matched["secondary"],
+            "matched_bonus": matched["bonus"],
+            "missing_skills": self._rank(missing_with_priority),
+            "match_percentage": n_matched / n_role if n_role else 0,
+            "weighted_score": matched_weight / total_weight if total_weight > 0 else 0,
+            "core_coverage": coverage("core"),
+            "secondary_coverage": coverage("secondary"),
+            "bonus_coverage": coverage("bonus"),
+        }
+
+    def _rank(self, missing_skills: List[Dict]) -> List[Dict]:
+        """Rank missing skills, scoring only skills not cached for the current skill count range."""
+        if "gap_ranking" not in self._stages:
+            return missing_skills
+        if not missing_skills or not is_model_loaded("gap_ranker"):
+            self._analyzer.user_skill_count = len(self._candidates)
+            return self._analyzer._rank_missing_skills(missing_skills)
+
+        count = len(self._candidates)
+        splits = skill_count_splits(get_model("gap_ranker"))
+        bucket = count if splits is None else _bucket(splits, count)
+        if splits is not None and not self._score_cache:
+            self._score_all_ranges(splits)
+        cached = self._score_cache.setdefault(bucket, {})
+        uncached = [s for s in missing_skills if s["skill"] not in cached]
+        if uncached:
+            self._analyzer.user_skill_count = count
+            for info, score in zip(uncached, self._analyzer._score_with_model(uncached)):
+                cached[info["skill"]] = float(score)
+
+        # Stable sort matches the full pipeline's tie ordering
+        indexed = sorted(
+            enumerate(missing_skills), key=lambda x: cached[x[1]["skill"]], reverse=True
+        )
+        return [
+            {
+                "skill": info["skill"],
+                "priority": info["priority"],
+                "weight": info["weight"],
+                "rank": rank,
+                "ml_score": cached[info["skill"]],
+            }
+            for rank, (_, info) in enumerate(indexed, 1)
+        ]
+
+    def _score_all_ranges(self, splits: List[float]):
+        """Score every role skill for every skill count range in one model call."""
+        skills = {}
+        for key, (category, skill) in zip(self._keys, self._role_skills):
+            name = key if self._weighted else skill
+            skills.setdefault(name, {"skill": name, "priority": category})
+        counts = _bucket_values(splits)  # one skill count per range
+        if not skills or len(skills) * len(counts) > MAX_PREFETCHED_SCORES:
+            return
+        infos = list(skills.values())
+        features = np.tile(self._analyzer._gap_features(infos), (len(counts), 1))
+        features[:, SKILL_COUNT_COLUMN] = np.repeat(counts, len(infos))
+        scores = get_model("gap_ranker").predict(features).reshape(len(counts), len(infos))
+        for bucket, row in enumerate(scores):
+            self._score_cache[bucket] = {info["skill"]: float(score) for info, score in zip(infos, row)}
+
+    def _recommendations(self, missing_names: List[str]) -> List[Dict[str, Any]]:
+        profile = None
+        if self._personalize:
+            profile = get_user_profile(sorted(self._candidates), self._resource_ratings)
+        profile_key = profile["key"] if profile else None
+
+        blocks = []
+        for skill in topological_sort(missing_names):
+            block = self._recommendation_cache.get((profile_key, skill))
+            if block is None:
+                block = get_recommendation_for_skill(
+                    skill, profile=profile, filters=self._resource_filters
+                )
+                self._recommendation_cache[(profile_key, skill)] = block
+            blocks.append(block)
+        return blocks
+
+    def _roadmap(self, missing_names: List[str]) -> List[Dict[str, Any]]:
+        key = frozenset(missing_names)
+        roadmap = self._roadmap_cache.get(key)
+        if roadmap is None:
+            roadmap = get_learning_roadmap(missing_names, weeks=4)
+            self._roadmap_cache[key] = roadmap
+        return roadmap
+
+    def result(self) -> Dict[str, Any]:
+        """Build the analysis response for the current skill set."""
+        with self._lock:
+            return self._result()
+
+    def _result(self) -> Dict[str, Any]:
+        skill_analysis = self._skill_analysis()
+        label, readiness_score, factors = compute_readiness(
+            skill_analysis["weighted_score"],
+            self._experience_years,
+            skill_analysis["core_coverage"],
+        )
+        missing_names = [s["skill"] for s in skill_analysis["missing_skills"]]
+        recommendations = self._recommendations(missing_names) if "recommendations" in self._stages else None
+        catalog_version = None
+        if recommendations is not None and self._response_format == "compact":
+            recommendations, catalog_version = compact_recommendations(recommendations)
+
+        result = build_analysis_result(
+            skill_analysis,
+            label,
+            readiness_score,
+            factors,
+            self._experience_years,
+            recommendations,
+            self._roadmap(missing_names) if "roadmap" in self._stages else None,
+            role_title=self._role_title,
+            role_level=self._role_level,
+            extracted_skills=self._extracted_skills,
+            include=self._include,
+        )
+        if catalog_version is not None:
+            result["catalog_version"] = catalog_version
+        result["session_id"] = self.session_id
+        result["candidate_skills"] = sorted(self._candidates)
+        if self._skill_corrections:
+            result["skill_corrections"] = self._skill_corrections
+        return result
+
+
+def create_session(
+    candidate_skills: List[str],
+    role_skills: List[str],
+    experience_years: float,
+    role_id: Optional[str] = None,
+    level: Optional[str] = None,
+    resume_text: Optional[str] = None,
+    personalize: bool = False,
+    resource_ratings: Optional[Dict[int, float]] = None,
+    resource_filters: Optional[Dict[str, Any]] = None,
+    include: str = "full",
+    response_format: str = "full",
+) -> AnalysisSession:
+    """Create and register an incremental analysis session.
+
+    Takes the same inputs as run_pipeline.
+    """
+    extracted_skills = None
+    normalize = lambda s: s.lower().strip()
+    corrections = []
+    if config.FUZZY_SKILL_MATCHING:
+        candidate_skills, corrections = correct_skills(candidate_skills, config.FUZZY_SKILL_MIN_CONFIDENCE)
+        role_skills, role_corrections = correct_skills(role_skills, config.FUZZY_SKILL_MIN_CONFIDENCE)
+        corrections += [c for c in role_corrections if c not in corrections]
+    if resume_text:
+        extracted_skills = extract_skills_from_text(resume_text)
+        candidate_skills = merge_skills(candidate_skills, extracted_skills)
+        normalize = normalize_skill
+    if config.FUZZY_SKILL_MATCHING:
+        # Skills added by later deltas are resolved the same way
+        base_normalize = normalize
+        normalize = lambda s: base_normalize(
+            correct_skills([s], config.FUZZY_SKILL_MIN_CONFIDENCE)[0][0]
+        )
+
+    role_intel = get_role_intelligence(role_id, level) if role_id and level else None
+    analyzer = SkillAnalyzer(role_intel, user_experience=experience_years)
+
+    if role_intel:
+        pairs = (
+            [("core", s) for s in role_intel.core_skills]
+            + [("secondary", s) for s in role_intel.secondary_skills]
+            + [("bonus", s) for s in role_intel.bonus_skills]
+        )
+    else:
+        pairs = [("core", s) for s in role_skills]
+
+    session = AnalysisSession(
+        analyzer,
+        pairs,
+        candidate_skills,
+        experience_years,
+        normalize=normalize,
+        weighted=role_intel is not None,
+        role_title=role_intel.title if role_intel else None,
+        role_level=level if role_intel else None,
+        extracted_skills=extracted_skills,
+        personalize=personalize,
+        resource_ratings=resource_ratings,
+        resource_filters=resource_filters,
+        include=include,
+        response_format=response_format,
+        skill_corrections=corrections,
+    )
+    _register(session)
+    return session
+
+
+def get_session(session_id: str) -> Optional[AnalysisSession]:
+    """Get a live session by ID, or None if unknown or expired."""
+    with _LOCK:
+        session = _SESSIONS.get(session_id)
+        if session is None:
+            return None
+        if time.time() - session.last_used > config.ANALYSIS_SESSION_TTL_SECONDS:
+            del _SESSIONS[session_id]
+            return None
+        _SESSIONS.move_to_end(session_id)
+        return session
+
+
+def _register(session: AnalysisSession):
+    with _LOCK:
+        _SESSIONS[session.session_id] = session
+        while len(_SESSIONS) > config.MAX_ANALYSIS_SESSIONS:
+            _SESSIONS.popitem(last=False)
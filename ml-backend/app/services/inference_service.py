@@ -1,5 +1,31 @@
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from app.core import config
+from app.core.coalescing import request_key
+from app.core.startup import artifact_version
 from app.pipelines.pipeline import run_pipeline
 from app.schemas.request import AnalyzeRequest
+from app.services.incremental_service import create_session
+from data.store import get_data_store
+
+# Bump when a code change alters analysis results for the same input and
+# artifacts, so cached responses keyed by analysis_key() are not reused
+ANALYSIS_VERSION = 1
+
+# Settings that change analysis results (MODEL_PRECISION is part of
+# artifact_version)
+OUTPUT_SETTINGS = (
+    "FUZZY_SKILL_MATCHING",
+    "FUZZY_SKILL_MIN_CONFIDENCE",
+    "OOV_SKILL_EMBEDDINGS",
+    "PERSONALIZATION_WEIGHT",
+)
+
+# Inputs of recent analyses by key, for GET /inference/analysis/{key}
+_ANALYSES: "OrderedDict[str, AnalyzeRequest]" = OrderedDict()
+_LOCK = threading.Lock()
 
 
 def run_analysis(payload: AnalyzeRequest):
@@ -17,4 +43,81 @@ def run_analysis(payload: AnalyzeRequest):
         role_id=payload.role_id,
         level=payload.level,
         resume_text=payload.resume_text,
+        personalize=payload.personalize,
+        resource_ratings=payload.resource_ratings,
+        resource_filters=_filters(payload),
+        include=payload.include,
+        response_format=payload.response_format,
+    )
+
+
+def start_analysis_session(payload: AnalyzeRequest):
+    """Run an analysis and keep its state for incremental skill deltas.
+
+    Returns the same result as run_analysis plus a session_id handle.
+    """
+    session = create_session(
+        candidate_skills=payload.skills,
+        role_skills=payload.target_role_skills,
+        experience_years=payload.experience_years,
+        role_id=payload.role_id,
+        level=payload.level,
+        resume_text=payload.resume_text,
+        personalize=payload.personalize,
+        resource_ratings=payload.resource_ratings,
+        resource_filters=_filters(payload),
+        include=payload.include,
+        response_format=payload.response_format,
+    )
+    return session.result()
+
+
+def _filters(payload: AnalyzeRequest):
+    return payload.resource_filters.dict() if payload.resource_filters else None
+
+
+def analysis_key(payload: AnalyzeRequest) -> str:
+    """Strong validator of an analysis result (also its resource ID).
+
+    run_pipeline is deterministic for a given input, data store contents,
+    set of model artifacts and output settings, so the key hashes the
+    canonical request (candidate_id, which does not affect the result,
+    excluded) with the artifact version, the store's content version and
+    those settings.
+    """
+    return request_key(
+        ANALYSIS_VERSION,
+        artifact_version(),
+        get_data_store().content_version(),
+        {name: getattr(config, name) for name in OUTPUT_SETTINGS},
+        payload.dict(exclude={"candidate_id"}),
     )
+
+
+def remember_analysis(key: str, payload: AnalyzeRequest):
+    """Keep an analysis input so the result can be fetched again by key."""
+    with _LOCK:
+        _ANALYSES[key] = payload
+        _ANALYSES.move_to_end(key)
+        while len(_ANALYSES) > config.MAX_STORED_ANALYSES:
+            _ANALYSES.popitem(last=False)
+
+
+def stored_analysis(key: str) -> Optional[AnalyzeRequest]:
+    """Input of a remembered analysis whose key is still current, else None.
+
+    Keys from before a model or data change no longer match the recomputed
+    key; their results can't be reproduced and are dropped.
+    """
+    with _LOCK:
+        payload = _ANALYSES.get(key)
+    if payload is None:
+        return None
+    if analysis_key(payload) != key:
+        with _LOCK:
+            _ANALYSES.pop(key, None)
+        return None
+    with _LOCK:
+        if key in _ANALYSES:
+            _ANALYSES.move_to_end(key)
+    return payload
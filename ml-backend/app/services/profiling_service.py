@@ -0,0 +1,195 @@
+"""On-demand profiling of individual analyze requests.
+
+Supports three modes, selected per request with the X-Debug-Profile header:
+- cprofile: deterministic cProfile run, stored as a pstats file plus a text summary
+- sample: low-overhead stack sampler, stored in collapsed-stack (flamegraph) format
+- tracemalloc: allocation snapshot diff, reporting the top allocation sites
+
+Profiles are kept in a bounded in-memory store keyed by request ID; pstats
+files are also written to PROFILES_DIR so they can be opened with snakeviz etc.
+The files get server-generated names (the request ID comes from the client)
+and are deleted when their profile is evicted from the store.
+"""
+
+import cProfile
+import io
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+from collections import Counter, OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Mapping, Optional
+
+from app.core import config
+
+PROFILE_MODES = ("cprofile", "sample", "tracemalloc")
+
+PROFILE_HEADER = "x-debug-profile"
+ADMIN_TOKEN_HEADER = "x-admin-token"
+
+_PROFILES: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_LOCK = threading.Lock()
+
+# tracemalloc traces the whole process: one tracemalloc profile at a time
+_TRACEMALLOC_LOCK = threading.Lock()
+
+
+def is_profiling_authorized(headers: Mapping[str, str]) -> bool:
+    """Check whether the caller may request a profile."""
+    if config.PROFILING_ENABLED:
+        return True
+    token = headers.get(ADMIN_TOKEN_HEADER)
+    return config.ADMIN_TOKEN is not None and token == config.ADMIN_TOKEN
+
+
+def requested_profile_mode(headers: Mapping[str, str]) -> Optional[str]:
+    """Get the profile mode requested by the caller, if any."""
+    mode = headers.get(PROFILE_HEADER)
+    return mode.strip().lower() if mode else None
+
+
+def profile_call(mode: str, request_id: str, fn: Callable, *args, **kwargs) -> Any:
+    """Run fn(*args, **kwargs) under the given profiler and store the profile.
+
+    Args:
+        mode: One of PROFILE_MODES
+        request_id: Key to store the profile under
+        fn: Callable to profile
+
+    Returns:
+        Whatever fn returns
+    """
+    if mode not in PROFILE_MODES:
+        raise ValueError(f"Unknown profile mode: {mode}")
+
+    runner = {
+        "cprofile": _run_cprofile,
+        "sample": _run_sampled,
+        "tracemalloc": _run_tracemalloc,
+    }[mode]
+
+    start = time.perf_counter()
+    result, profile = runner(request_id, fn, args, kwargs)
+    profile.update({
+        "request_id": request_id,
+        "mode": mode,
+        "duration_ms": (time.perf_counter() - start) * 1000.0,
+        "created_at": time.time(),
+    })
+    _store(request_id, profile)
+    return result
+
+
+def get_profile(request_id: str) -> Optional[Dict[str, Any]]:
+    """Get a stored profile by request ID."""
+    with _LOCK:
+        return _PROFILES.get(request_id)
+
+
+def _store(request_id: str, profile: Dict[str, Any]):
+    with _LOCK:
+        evicted = [_PROFILES.pop(request_id)] if request_id in _PROFILES else []
+        _PROFILES[request_id] = profile
+        while len(_PROFILES) > config.MAX_STORED_PROFILES:
+            evicted.append(_PROFILES.popitem(last=False)[1])
+    for old in evicted:
+        if "pstats_path" in old:
+            Path(old["pstats_path"]).unlink(missing_ok=True)
+
+
+def _run_cprofile(request_id: str, fn: Callable, args, kwargs):
+    profiler = cProfile.Profile()
+    result = profiler.runcall(fn, *args, **kwargs)
+
+    config.PROFILES_DIR.mkdir(parents=True, exist_ok=True)
+    # Not named after request_id, which is client-supplied (X-Request-ID)
+    pstats_path = config.PROFILES_DIR / f"{uuid.uuid4().hex}.pstats"
+    profiler.dump_stats(str(pstats_path))
+
+    text = io.StringIO()
+    stats = pstats.Stats(profiler, stream=text)
+    stats.sort_stats("cumulative").print_stats(30)
+    return result, {"pstats_path": str(pstats_path), "text": text.getvalue()}
+
+
+class _StackSampler(threading.Thread):
+    """Samples the stack of one thread at a fixed interval."""
+
+    def __init__(self, thread_id: int, interval: float = 0.001):
+        super().__init__(daemon=True)
+        self._thread_id = thread_id
+        self._interval = interval
+        self._stop_event = threading.Event()
+        self.stacks: Counter = Counter()
+        self.samples = 0
+
+    def run(self):
+        while not self._stop_event.is_set():
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is not None:
+                self.stacks[_collapse(frame)] += 1
+                self.samples += 1
+            self._stop_event.wait(self._interval)
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+def _collapse(frame) -> str:
+    """Render a frame chain as 'root;...;leaf' for flamegraph tools."""
+    parts = []
+    while frame is not None:
+        code = frame.f_code
+        parts.append(f"{code.co_name} ({code.co_filename.rsplit('/', 1)[-1]}:{frame.f_lineno})")
+        frame = frame.f_back
+    return ";".join(reversed(parts))
+
+
+def _run_sampled(request_id: str, fn: Callable, args, kwargs):
+    sampler = _StackSampler(threading.get_ident())
+    sampler.start()
+    try:
+        result = fn(*args, **kwargs)
+    finally:
+        sampler.stop()
+
+    collapsed = "\n".join(
+        f"{stack} {count}" for stack, count in sampler.stacks.most_common()
+    )
+    return result, {"samples": sampler.samples, "collapsed": collapsed}
+
+
+def _run_tracemalloc(request_id: str, fn: Callable, args, kwargs, top_n: int = 25):
+    # Concurrent profiles would stop each other's tracing and count each
+    # other's allocations (unprofiled requests running meanwhile still are)
+    with _TRACEMALLOC_LOCK:
+        started_here = not tracemalloc.is_tracing()
+        if started_here:
+            tracemalloc.start(10)
+        tracemalloc.reset_peak()
+        try:
+            before = tracemalloc.take_snapshot()
+            result = fn(*args, **kwargs)
+            after = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            if started_here:
+                tracemalloc.stop()
+
+    project_filter = tracemalloc.Filter(True, str(config.ROOT) + "/*")
+    diff = after.filter_traces([project_filter]).compare_to(
+        before.filter_traces([project_filter]), "lineno"
+    )
+    top = [
+        {
+            "location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+            "size_diff_bytes": stat.size_diff,
+            "count_diff": stat.count_diff,
+        }
+        for stat in diff[:top_n]
+    ]
+    return result, {"peak_bytes": peak, "top_allocations": top}
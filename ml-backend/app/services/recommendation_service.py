@@ -2,18 +2,112 @@
 
 Uses trained SVD-based collaborative filtering model for personalized recommendations.
 Falls back to content-based filtering with curated datasets if model unavailable.
+
+Personalization folds a candidate's held skills and past resource ratings into
+the SVD latent space (no model fitting per request); the resulting profile is
+cached and blended into each skill's resource ranking.
+
+Blocks that don't depend on the candidate (no profile or filters) are built
+once per skill and kept pre-serialized (see app.core.serialization), cached
+with the recommender snapshot or the data store they came from.
 """
 
+import hashlib
+import json
+import threading
 import numpy as np
-from typing import List, Dict, Any
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional
 from data.learning_resources import get_resources_for_skill, get_resources_for_skills
+from data.resource_catalog import RESOURCE_DEFAULTS, ResourceCatalog, has_filters
 from data.skill_dependencies import topological_sort, generate_learning_roadmap
-from app.core.startup import get_model, is_model_loaded
+from data.skill_taxonomy import normalize_skill
+from data.store import get_data_store
+from app.core import config
+from app.core.serialization import PreSerialized
+from app.core.startup import get_model, is_model_loaded, refresh_recommender
+
+_PROFILES: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_PROFILES_LOCK = threading.Lock()
+
+# Curated static blocks, (skill, max_resources) -> PreSerialized, for _CURATED_STORE
+_CURATED_BLOCKS: "OrderedDict[tuple, PreSerialized]" = OrderedDict()
+_CURATED_STORE = {"store": None}
+_CURATED_LOCK = threading.Lock()
+
+
+def get_user_profile(
+    candidate_skills: List[str],
+    resource_ratings: Optional[Dict[int, float]] = None,
+) -> Optional[Dict[str, Any]]:
+    """Fold a candidate into the recommender's latent space.
+    
+    The candidate's pseudo-rating row is the mean predicted row of their held
+    skills, overridden by their own ratings; projecting it onto the SVD
+    components gives the latent user vector, and one matrix-vector product
+    with the components scores every resource for them.
+    
+    Profiles are cached by their inputs and the recommender snapshot version.
+    
+    Args:
+        candidate_skills: Skills the candidate holds
+        resource_ratings: Optional past ratings, resource ID -> rating in [0, 1]
+        
+    Returns:
+        Profile dict (key, vector, scores, rated) or None if the model is unavailable
+    """
+    refresh_recommender()
+    model_data = get_model("recommender")
+    if model_data is None or "components" not in model_data:
+        return None
+    
+    skill_idx = model_data["skill_idx"]
+    predictions = model_data["predictions"]
+    components = model_data["components"]
+    n_resources = predictions.shape[1]
+    
+    held = sorted({normalize_skill(s) for s in candidate_skills} & skill_idx.keys())
+    ratings = {
+        int(r): min(max(float(v), 0.0), 1.0)
+        for r, v in (resource_ratings or {}).items()
+        if 0 <= int(r) < n_resources
+    }
+    if not held and not ratings:
+        return None
+    
+    key = hashlib.sha1(json.dumps(
+        [model_data.get("version"), held, sorted(ratings.items())]
+    ).encode()).hexdigest()
+    with _PROFILES_LOCK:
+        profile = _PROFILES.get(key)
+        if profile is not None:
+            _PROFILES.move_to_end(key)
+            return profile
+    
+    row = predictions[[skill_idx[s] for s in held]].mean(axis=0) if held else np.zeros(n_resources)
+    if ratings:
+        row = row.copy()
+        row[list(ratings)] = list(ratings.values())
+    vector = components @ row
+    profile = {
+        "key": key,
+        "vector": vector,
+        "scores": vector @ components,
+        "rated": set(ratings),
+    }
+    
+    with _PROFILES_LOCK:
+        _PROFILES[key] = profile
+        while len(_PROFILES) > config.MAX_USER_PROFILES:
+            _PROFILES.popitem(last=False)
+    return profile
 
 
 def get_skill_recommendations(
     missing_skills: List[str],
-    max_resources_per_skill: int = 2
+    max_resources_per_skill: int = 2,
+    profile: Optional[Dict[str, Any]] = None,
+    filters: Optional[Dict[str, Any]] = None,
 ) -> List[Dict[str, Any]]:
     """Get learning resource recommendations for missing skills.
     
@@ -23,34 +117,96 @@ def get_skill_recommendations(
     Args:
         missing_skills: List of skills to get recommendations for
         max_resources_per_skill: Max number of resources per skill
+        profile: Optional user profile from get_user_profile to personalize ranking
+        filters: Optional resource filters (see data.resource_catalog)
         
     Returns:
         List of skill recommendations with resources
     """
-    recommendations = []
-    
     # Sort skills by learning dependency order
     sorted_skills = topological_sort(missing_skills)
     
-    # Use ML model if available
+    return [
+        get_recommendation_for_skill(skill, max_resources_per_skill, profile, filters)
+        for skill in sorted_skills
+    ]
+
+
+def get_recommendation_for_skill(
+    skill: str,
+    max_resources: int = 2,
+    profile: Optional[Dict[str, Any]] = None,
+    filters: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Get the recommendation block (skill, resources, source) for one skill.
+    
+    Without a profile or filters the block is shared between requests
+    (a read-only PreSerialized dict).
+    """
+    # Use ML model if available (picking up newly published snapshots)
+    refresh_recommender()
     use_ml = is_model_loaded("recommender")
     
-    for skill in sorted_skills:
-        if use_ml:
-            resources = _get_ml_recommendations(skill, max_resources_per_skill)
-        else:
-            resources = get_resources_for_skill(skill, max_resources_per_skill)
-        
-        recommendations.append({
-            "skill": skill,
-            "resources": resources,
-            "source": "ml_model" if use_ml else "curated",
-        })
+    if profile is None and not has_filters(filters):
+        return _static_block(skill, max_resources, use_ml)
+    return _build_block(skill, max_resources, use_ml, profile, filters)
+
+
+def _build_block(
+    skill: str,
+    max_resources: int,
+    use_ml: bool,
+    profile: Optional[Dict[str, Any]] = None,
+    filters: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    if use_ml:
+        resources = _get_ml_recommendations(skill, max_resources, profile, filters)
+    else:
+        resources = get_resources_for_skill(skill, max_resources, filters)
     
-    return recommendations
+    return {
+        "skill": skill,
+        "resources": resources,
+        "source": "ml_model" if use_ml else "curated",
+    }
+
+
+def _static_block(skill: str, max_resources: int, use_ml: bool) -> PreSerialized:
+    """Cached pre-serialized block for a skill without profile or filters."""
+    key = (skill, max_resources)
+    if use_ml:
+        # Kept with the snapshot, so a reloaded recommender starts afresh
+        blocks = get_model("recommender").setdefault("blocks", {})
+        block = blocks.get(key)
+        if block is None:
+            block = blocks[key] = PreSerialized(_build_block(skill, max_resources, True))
+        return block
+    
+    store = get_data_store()
+    with _CURATED_LOCK:
+        if _CURATED_STORE["store"] is not store:
+            _CURATED_BLOCKS.clear()
+            _CURATED_STORE["store"] = store
+        block = _CURATED_BLOCKS.get(key)
+        if block is not None:
+            _CURATED_BLOCKS.move_to_end(key)
+            return block
+    
+    block = PreSerialized(_build_block(skill, max_resources, False))
+    with _CURATED_LOCK:
+        if _CURATED_STORE["store"] is store:
+            _CURATED_BLOCKS[key] = block
+            while len(_CURATED_BLOCKS) > config.MAX_CACHED_RECOMMENDATION_BLOCKS:
+                _CURATED_BLOCKS.popitem(last=False)
+    return block
 
 
-def _get_ml_recommendations(skill: str, max_resources: int) -> List[Dict[str, Any]]:
+def _get_ml_recommendations(
+    skill: str,
+    max_resources: int,
+    profile: Optional[Dict[str, Any]] = None,
+    filters: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
     """Get recommendations using trained SVD model."""
     model_data = get_model("recommender")
     predictions = model_data["predictions"]
@@ -62,52 +218,81 @@ def _get_ml_recommendations(skill: str, max_resources: int) -> List[Dict[str, An
     
     # If skill not in model, fall back to curated
     if skill_lower not in skill_idx:
-        return get_resources_for_skill(skill, max_resources)
+        return get_resources_for_skill(skill, max_resources, filters)
     
     idx = skill_idx[skill_lower]
     scores = predictions[idx]
+    ranking = scores
+    if profile is not None:
+        # Blend in the candidate's affinity among this skill's resources,
+        # skipping resources they already rated
+        weight = config.PERSONALIZATION_WEIGHT
+        ranking = (1 - weight) * scores + weight * profile["scores"]
+        ranking[scores <= 0] = -np.inf
+        if profile["rated"]:
+            ranking[list(profile["rated"])] = -np.inf
     
-    # Get top resources by score
-    top_indices = np.argsort(scores)[::-1][:max_resources]
+    # Get top resources by score, among those passing the filters (looked up
+    # in the catalog's indexes)
+    if has_filters(filters):
+        rows = _resource_catalog(model_data).query(filters)
+        top_indices = rows[np.argsort(ranking[rows])[::-1][:max_resources]]
+    else:
+        top_indices = np.argsort(ranking)[::-1][:max_resources]
     
     result = []
     for i in top_indices:
-        if scores[i] > 0:  # Only include positive scores
-            resource = resources[i]
-            # Handle if resource is a dict (from training script) or string
-            if isinstance(resource, dict):
-                title = resource.get("title", "Unknown Resource")
-                r_type = resource.get("type", "course")
-            else:
-                title = resource
-                r_type = "course" if "course" in title.lower() else "video"
-                
-            result.append({
-                "title": title,
-                "type": r_type,
-                "url": resource.get("url", f"https://www.google.com/search?q={title.replace(' ', '+')}") if isinstance(resource, dict) else f"https://www.google.com/search?q={title.replace(' ', '+')}",
-                "difficulty": resource.get("difficulty", "intermediate") if isinstance(resource, dict) else "intermediate",
-                "duration_hours": float(resource.get("duration_hours", 10)) if isinstance(resource, dict) else 10.0,
-                "provider": resource.get("provider", "Online Platform") if isinstance(resource, dict) else "Online Platform",
-                "ml_score": float(scores[i]),
-            })
+        if scores[i] > 0 and ranking[i] > -np.inf:  # Only include positive scores
+            result.append({**ml_resource_view(resources[i]), "ml_score": float(scores[i])})
+            if profile is not None:
+                result[-1]["personalized_score"] = float(ranking[i])
     
     # If no ML results, fall back to curated
     if not result:
-        return get_resources_for_skill(skill, max_resources)
+        return get_resources_for_skill(skill, max_resources, filters)
     
     return result
 
 
+def ml_resource_view(resource) -> Dict[str, Any]:
+    """A recommender resource as shown in responses (without scores)."""
+    # Handle if resource is a dict (from training script) or string
+    if isinstance(resource, dict):
+        title = resource.get("title", "Unknown Resource")
+        r_type = resource.get("type", "course")
+    else:
+        title = resource
+        r_type = "course" if "course" in title.lower() else "video"
+    
+    return {
+        "title": title,
+        "type": r_type,
+        "url": resource.get("url", f"https://www.google.com/search?q={title.replace(' ', '+')}") if isinstance(resource, dict) else f"https://www.google.com/search?q={title.replace(' ', '+')}",
+        "difficulty": resource.get("difficulty", RESOURCE_DEFAULTS["difficulty"]) if isinstance(resource, dict) else RESOURCE_DEFAULTS["difficulty"],
+        "duration_hours": float(resource.get("duration_hours", RESOURCE_DEFAULTS["duration_hours"])) if isinstance(resource, dict) else RESOURCE_DEFAULTS["duration_hours"],
+        "provider": resource.get("provider", RESOURCE_DEFAULTS["provider"]) if isinstance(resource, dict) else RESOURCE_DEFAULTS["provider"],
+    }
+
+
+def _resource_catalog(model_data: Dict[str, Any]) -> ResourceCatalog:
+    """The recommender's resource catalog (built at load time; lazily for other snapshots)."""
+    catalog = model_data.get("catalog")
+    if catalog is None:
+        catalog = model_data.setdefault("catalog", ResourceCatalog(model_data["resources"]))
+    return catalog
+
+
 def get_learning_roadmap(
     missing_skills: List[str],
-    weeks: int = 4
+    weeks: int = 4,
+    max_hours_per_week: Optional[int] = None,
 ) -> List[Dict[str, Any]]:
     """Generate a week-wise learning roadmap.
     
     Args:
         missing_skills: List of skills to learn
         weeks: Number of weeks for the roadmap (default: 4 for 30-day sprint)
+        max_hours_per_week: Optional hard cap on weekly study hours
         
     Returns:
         Week-by-week learning plan
@@ -115,7 +300,7 @@ def get_learning_roadmap(
     if not missing_skills:
         return []
     
-    return generate_learning_roadmap(missing_skills, weeks)
+    return generate_learning_roadmap(missing_skills, weeks, max_hours_per_week)
 
 
 def get_priority_recommendations(
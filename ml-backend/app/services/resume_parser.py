@@ -6,7 +6,8 @@ Falls back to keyword-based extraction if model not available.
 
 import re
 from typing import List, Set
-from data.skill_taxonomy import SKILL_TAXONOMY, normalize_skill
+from data.skill_taxonomy import normalize_skill
+from data.store import get_data_store
 from app.core.startup import get_model, is_model_loaded
 
 
@@ -63,7 +64,7 @@ def _extract_with_keywords(text: str) -> List[str]:
     found_skills: Set[str] = set()
     
     # Check each skill in taxonomy
-    for skill in SKILL_TAXONOMY:
+    for skill in get_data_store().taxonomy:
         escaped_skill = re.escape(skill)
         pattern = r'(?:^|[\s,;.()])' + escaped_skill + r'(?:[\s,;.()]|$)'
         if re.search(pattern, text_normalized):
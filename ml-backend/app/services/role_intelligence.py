@@ -11,6 +11,7 @@ from data.role_definitions import (
     get_role_level,
     list_available_roles,
 )
+from data.skill_vocab import CATEGORIES, get_skill_vocabulary
 
 
 class RoleIntelligence:
@@ -80,16 +81,9 @@ class RoleIntelligence:
             Tuple of (priority, weight) where priority is "core"/"secondary"/"bonus"
             and weight is 1.0/0.6/0.3
         """
-        skill_lower = skill.lower().strip()
-        
-        if skill_lower in [s.lower() for s in self.core_skills]:
-            return ("core", SKILL_WEIGHTS["core"])
-        elif skill_lower in [s.lower() for s in self.secondary_skills]:
-            return ("secondary", SKILL_WEIGHTS["secondary"])
-        elif skill_lower in [s.lower() for s in self.bonus_skills]:
-            return ("bonus", SKILL_WEIGHTS["bonus"])
-        else:
-            return ("unknown", 0.0)
+        vocab = get_skill_vocabulary()
+        category = CATEGORIES[vocab.role_categories(self.role_id, self.level)[vocab.id(skill)]]
+        return (category, SKILL_WEIGHTS.get(category, 0.0))
     
     def get_weighted_skill_list(self) -> List[Dict[str, Any]]:
         """Get all skills with their priorities and weights."""
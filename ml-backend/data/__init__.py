@@ -1,6 +1,14 @@
 """Data layer with skill taxonomy, role definitions, resources, and dependencies."""
 
-from .skill_taxonomy import SKILL_TAXONOMY, SKILL_ALIASES, normalize_skill, is_valid_skill
+from .skill_taxonomy import (
+    SKILL_TAXONOMY,
+    SKILL_ALIASES,
+    normalize_skill,
+    is_valid_skill,
+    resolve_skill,
+    resolve_skills,
+    correct_skills,
+)
 from .role_definitions import (
     ROLE_DEFINITIONS,
     SKILL_WEIGHTS,
@@ -22,3 +30,7 @@ from .skill_dependencies import (
     topological_sort,
     generate_learning_roadmap,
 )
+from .skill_vocab import SkillVocabulary, get_skill_vocabulary
+from .skill_bitset import SkillSet, pack_skill_sets, batch_role_coverage
+from .skill_fuzzy import FuzzySkillIndex, get_fuzzy_index
+from .store import DataStore, get_data_store, open_data_store
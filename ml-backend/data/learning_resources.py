@@ -3,7 +3,10 @@
 Maps skills to curated courses and YouTube playlists.
 """
 
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
+
+from data.resource_catalog import has_filters, resource_matches
+from data.skill_vocab import get_skill_vocabulary
 
 # Resource database: skill -> list of resources
 LEARNING_RESOURCES: Dict[str, List[Dict[str, Any]]] = {
@@ -404,17 +407,32 @@ DEFAULT_RESOURCE = {
 }
 
 
-def get_resources_for_skill(skill: str, max_resources: int = 3) -> List[Dict[str, Any]]:
-    """Get learning resources for a skill."""
-    skill_lower = skill.lower().strip()
-    resources = LEARNING_RESOURCES.get(skill_lower, [])
+def get_resources_for_skill(
+    skill: str,
+    max_resources: int = 3,
+    filters: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
+    """Get learning resources for a skill.
+    
+    Args:
+        skill: Skill name
+        max_resources: Maximum number of resources
+        filters: Optional resource filters (see data.resource_catalog)
+    """
+    vocab = get_skill_vocabulary()
+    resources = vocab.resources_for_id(vocab.id(skill))
+    filtered = has_filters(filters)
+    if filtered:
+        # The store already indexes resources by skill; filter that short list
+        resources = [r for r in resources if resource_matches(r, filters)]
     
     if not resources:
         # Return default search resource
+        skill_lower = skill.lower().strip()
         default = DEFAULT_RESOURCE.copy()
         default["url"] = default["url"].format(skill=skill_lower.replace(" ", "+"))
         default["title"] = f"Learn {skill}"
-        return [default]
+        return [default] if not filtered or resource_matches(default, filters) else []
     
     return resources[:max_resources]
 
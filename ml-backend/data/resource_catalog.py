@@ -0,0 +1,211 @@
+"""Indexed learning resource catalog for multi-attribute filtering.
+
+Resources are stored column-wise (IDs, durations, free flags, attribute codes)
+next to the original dicts, with an ID -> row index, inverted indexes (value ->
+ascending row numbers) for skill, type, difficulty and provider, and the rows
+ordered by duration for range queries. A query such as "free beginner videos
+under 10 hours" starts from the most selective index and checks the remaining
+conditions on those rows' columns instead of scanning every resource.
+
+Filters are plain dicts (see RESOURCE_FILTER_FIELDS):
+
+    {"types": ["youtube"], "difficulties": ["beginner"], "providers": [],
+     "min_duration_hours": None, "max_duration_hours": 10, "free_only": True}
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+# Attribute values assumed for resources that lack them (the trained
+# recommender's resources only carry id, skill, title, type and quality)
+RESOURCE_DEFAULTS = {
+    "type": "course",
+    "difficulty": "intermediate",
+    "duration_hours": 10.0,
+    "provider": "Online Platform",
+}
+
+# Resource types that are free unless a resource says otherwise ("free": false)
+FREE_TYPES = ("youtube", "search")
+
+# Filter key -> indexed attribute, for the list-valued filters
+RESOURCE_FILTER_FIELDS = {
+    "types": "type",
+    "difficulties": "difficulty",
+    "providers": "provider",
+}
+
+
+def resource_attribute(resource: Dict[str, Any], field: str, defaults: Dict[str, Any] = RESOURCE_DEFAULTS):
+    """An indexed attribute of a resource (providers fall back to the YouTube channel)."""
+    if field == "provider":
+        value = resource.get("provider") or resource.get("channel")
+        return value if value is not None else defaults.get("provider")
+    if field == "free":
+        return bool(resource.get("free", resource_attribute(resource, "type", defaults) in FREE_TYPES))
+    value = resource.get(field)
+    return value if value is not None else defaults.get(field)
+
+
+def has_filters(filters: Optional[Dict[str, Any]]) -> bool:
+    """Whether a filter dict restricts anything."""
+    return bool(filters) and any(
+        value not in (None, False, [], ()) for value in filters.values()
+    )
+
+
+def resource_matches(resource: Dict[str, Any], filters: Optional[Dict[str, Any]],
+                     defaults: Dict[str, Any] = RESOURCE_DEFAULTS) -> bool:
+    """Check one resource against a filter dict (for short per-skill lists)."""
+    if not has_filters(filters):
+        return True
+    for key, field in RESOURCE_FILTER_FIELDS.items():
+        wanted = filters.get(key)
+        if wanted and str(resource_attribute(resource, field, defaults)).lower() not in {
+            str(v).lower() for v in wanted
+        }:
+            return False
+    duration = float(resource_attribute(resource, "duration_hours", defaults))
+    if filters.get("min_duration_hours") is not None and duration < filters["min_duration_hours"]:
+        return False
+    if filters.get("max_duration_hours") is not None and duration > filters["max_duration_hours"]:
+        return False
+    if filters.get("free_only") and not resource_attribute(resource, "free", defaults):
+        return False
+    return True
+
+
+class ResourceCatalog:
+    """Columnar, indexed view of a list of resources.
+
+    Each indexed field is stored as an integer code column plus, in CSR form,
+    the rows holding each code in ascending order (the inverted index).
+
+    Args:
+        resources: Resource dicts; row i is resources[i] (an "id" key is used
+            as the resource ID when present, else the row number). Bare title
+            strings from older recommender snapshots are indexed by defaults.
+        defaults: Attribute values for resources that lack them
+    """
+
+    def __init__(self, resources: Sequence[Dict[str, Any]], defaults: Dict[str, Any] = RESOURCE_DEFAULTS):
+        self._rows = list(resources)
+        n = len(self._rows)
+        dicts = [r if isinstance(r, dict) else {"title": str(r)} for r in self._rows]
+
+        self.ids = np.array([r.get("id", i) for i, r in enumerate(dicts)], dtype=np.int64)
+        self._row_of: Dict[int, int] = {int(resource_id): i for i, resource_id in enumerate(self.ids)}
+
+        self.duration = np.array(
+            [float(resource_attribute(r, "duration_hours", defaults)) for r in dicts], dtype=np.float64
+        )
+        self.free = np.array([resource_attribute(r, "free", defaults) for r in dicts], dtype=bool)
+        self._free_rows = np.flatnonzero(self.free)
+
+        # Inverted indexes: field -> lowercased value -> code, the code column,
+        # and rows grouped by code (rows of code c: order[ptr[c]:ptr[c + 1]])
+        self._code_of: Dict[str, Dict[str, int]] = {}
+        self.codes: Dict[str, np.ndarray] = {}
+        self._order: Dict[str, np.ndarray] = {}
+        self._ptr: Dict[str, np.ndarray] = {}
+        for field in ("skill",) + tuple(RESOURCE_FILTER_FIELDS.values()):
+            code_of: Dict[str, int] = {}
+            codes = np.fromiter(
+                (code_of.setdefault(str(resource_attribute(r, field, defaults)).lower(), len(code_of))
+                 for r in dicts),
+                dtype=np.int32, count=n,
+            )
+            self._code_of[field] = code_of
+            self.codes[field] = codes
+            self._order[field] = np.argsort(codes, kind="stable")
+            self._ptr[field] = np.concatenate(([0], np.cumsum(np.bincount(codes, minlength=len(code_of)))))
+
+        # Rows ordered by duration, for range lookups with searchsorted
+        self._by_duration = np.argsort(self.duration, kind="stable")
+        self._sorted_duration = self.duration[self._by_duration]
+        self._all_rows = np.arange(n, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def get(self, resource_id: int) -> Optional[Dict[str, Any]]:
+        """Resource by ID, or None."""
+        i = self._row_of.get(resource_id)
+        return self._rows[i] if i is not None else None
+
+    def row(self, i: int) -> Dict[str, Any]:
+        """Resource at a row number."""
+        return self._rows[i]
+
+    def values(self, field: str) -> List[str]:
+        """Distinct lowercased values of an indexed field."""
+        return sorted(self._code_of[field])
+
+    def _lookup_codes(self, field: str, values: Sequence[str]) -> List[int]:
+        code_of = self._code_of[field]
+        return sorted({code_of[v] for v in (str(v).lower() for v in values) if v in code_of})
+
+    def _posting(self, field: str, codes: List[int]) -> np.ndarray:
+        order, ptr = self._order[field], self._ptr[field]
+        if len(codes) == 1:
+            return order[ptr[codes[0]]:ptr[codes[0] + 1]]
+        return np.sort(np.concatenate([order[ptr[c]:ptr[c + 1]] for c in codes]))
+
+    def query(self, filters: Optional[Dict[str, Any]] = None, skill: Optional[str] = None) -> np.ndarray:
+        """Row numbers (ascending) of resources matching a skill and/or filter dict.
+
+        Rows come from the most selective index (a field's posting lists, the
+        free rows, or a duration range); the other constraints are checked on
+        those rows only, via the code and duration columns.
+        """
+        filters = filters or {}
+        constraints = []  # (field, codes)
+        if skill is not None:
+            constraints.append(("skill", self._lookup_codes("skill", [skill])))
+        for key, field in RESOURCE_FILTER_FIELDS.items():
+            if filters.get(key):
+                constraints.append((field, self._lookup_codes(field, filters[key])))
+        free_only = bool(filters.get("free_only"))
+        low, high = filters.get("min_duration_hours"), filters.get("max_duration_hours")
+
+        # Candidate sources and their sizes
+        sources = []
+        for field, codes in constraints:
+            ptr = self._ptr[field]
+            sources.append((sum(int(ptr[c + 1] - ptr[c]) for c in codes), "field", (field, codes)))
+        if free_only:
+            sources.append((len(self._free_rows), "free", None))
+        if low is not None or high is not None:
+            start = 0 if low is None else int(np.searchsorted(self._sorted_duration, low, side="left"))
+            stop = len(self) if high is None else int(np.searchsorted(self._sorted_duration, high, side="right"))
+            sources.append((max(stop - start, 0), "duration", (start, stop)))
+        if not sources:
+            return self._all_rows
+
+        size, kind, arg = min(sources, key=lambda source: source[0])
+        if size == 0:
+            return self._all_rows[:0]
+        if kind == "field":
+            rows = self._posting(*arg)
+        elif kind == "free":
+            rows = self._free_rows
+        else:
+            rows = np.sort(self._by_duration[arg[0]:arg[1]])
+
+        for field, codes in constraints:
+            if kind != "field" or field != arg[0]:
+                column = self.codes[field][rows]
+                rows = rows[column == codes[0] if len(codes) == 1 else np.isin(column, codes)]
+        if free_only and kind != "free":
+            rows = rows[self.free[rows]]
+        if kind != "duration":
+            if low is not None:
+                rows = rows[self.duration[rows] >= low]
+            if high is not None:
+                rows = rows[self.duration[rows] <= high]
+        return rows
+
+    def select(self, filters: Optional[Dict[str, Any]] = None, skill: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Resources matching a skill and/or filter dict, in catalog order."""
+        return [self._rows[i] for i in self.query(filters, skill)]
@@ -8,6 +8,8 @@ Each role has skills categorized as:
 
 from typing import Dict, List, Any
 
+from data.store import get_data_store
+
 # Skill weight multipliers
 SKILL_WEIGHTS = {
     "core": 1.0,
@@ -232,7 +234,7 @@ ROLE_DEFINITIONS: Dict[str, Dict[str, Any]] = {
 
 def get_role(role_id: str) -> Dict[str, Any] | None:
     """Get role definition by ID."""
-    return ROLE_DEFINITIONS.get(role_id)
+    return get_data_store().roles.get(role_id)
 
 
 def get_role_level(role_id: str, level: str) -> Dict[str, Any] | None:
@@ -256,5 +258,5 @@ def list_available_roles() -> List[Dict[str, str]]:
     """List all available roles with their IDs and titles."""
     return [
         {"role_id": rid, "title": rdef["title"], "domain": rdef["domain"]}
-        for rid, rdef in ROLE_DEFINITIONS.items()
+        for rid, rdef in get_data_store().roles.items()
     ]
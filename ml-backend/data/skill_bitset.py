@@ -0,0 +1,210 @@
+"""Bitset skill sets over vocabulary IDs.
+
+A SkillSet stores the vocabulary skills it contains as bits of a Python int
+(bit i set <=> skill ID i present), so intersection, difference and size are
+single integer operations plus a popcount. Skills outside the vocabulary
+(e.g. custom role skills) are kept in a small side set so nothing is lost.
+
+For cohort scoring, many skill sets are packed into an N x W matrix of uint64
+words and matched against R role masks at once.
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from data.role_definitions import SKILL_WEIGHTS
+from data.skill_vocab import CATEGORIES, UNKNOWN, SkillVocabulary, get_skill_vocabulary
+
+# SWAR popcount constants (numpy < 2.0 has no bitwise_count)
+_M1 = np.uint64(0x5555555555555555)
+_M2 = np.uint64(0x3333333333333333)
+_M4 = np.uint64(0x0F0F0F0F0F0F0F0F)
+_H01 = np.uint64(0x0101010101010101)
+
+
+class SkillSet:
+    """Immutable set of skills backed by a bitmask over vocabulary IDs.
+
+    Args:
+        bits: Bitmask of vocabulary skill IDs
+        extra: Lowercased names of skills not in the vocabulary
+    """
+
+    __slots__ = ("bits", "extra")
+
+    def __init__(self, bits: int = 0, extra: frozenset = frozenset()):
+        self.bits = bits
+        self.extra = extra
+
+    @classmethod
+    def from_ids(cls, ids: Iterable[int]) -> "SkillSet":
+        """Build from vocabulary IDs (UNKNOWN IDs are ignored)."""
+        bits = 0
+        for i in ids:
+            if i != UNKNOWN:
+                bits |= 1 << i
+        return cls(bits)
+
+    @classmethod
+    def from_skills(cls, skills: Iterable[str], vocab: Optional[SkillVocabulary] = None) -> "SkillSet":
+        """Build from skill names (matched like skill.lower().strip())."""
+        bits, unknown = (vocab or get_skill_vocabulary()).mask(skills)
+        return cls(bits, frozenset(unknown))
+
+    def __len__(self) -> int:
+        return self.bits.bit_count() + len(self.extra)
+
+    def __bool__(self) -> bool:
+        return bool(self.bits or self.extra)
+
+    def __and__(self, other: "SkillSet") -> "SkillSet":
+        return SkillSet(self.bits & other.bits, self.extra & other.extra)
+
+    def __or__(self, other: "SkillSet") -> "SkillSet":
+        return SkillSet(self.bits | other.bits, self.extra | other.extra)
+
+    def __sub__(self, other: "SkillSet") -> "SkillSet":
+        return SkillSet(self.bits & ~other.bits, self.extra - other.extra)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, SkillSet) and self.bits == other.bits and self.extra == other.extra
+
+    def __hash__(self) -> int:
+        return hash((self.bits, self.extra))
+
+    def has_id(self, skill_id: int) -> bool:
+        """Check membership of a vocabulary ID."""
+        return skill_id != UNKNOWN and (self.bits >> skill_id) & 1 == 1
+
+    def contains(self, skill: str, vocab: Optional[SkillVocabulary] = None) -> bool:
+        """Check membership of a skill name."""
+        vocab = vocab or get_skill_vocabulary()
+        i = vocab.id(skill)
+        if i == UNKNOWN:
+            return skill.lower().strip() in self.extra
+        return (self.bits >> i) & 1 == 1
+
+    def ids(self) -> List[int]:
+        """Vocabulary IDs in the set, ascending."""
+        ids = []
+        bits = self.bits
+        while bits:
+            low = bits & -bits
+            ids.append(low.bit_length() - 1)
+            bits ^= low
+        return ids
+
+    def names(self, vocab: Optional[SkillVocabulary] = None) -> List[str]:
+        """Skill names in the set, sorted."""
+        vocab = vocab or get_skill_vocabulary()
+        return sorted([vocab.names[i] for i in self.ids()] + list(self.extra))
+
+    def to_words(self, n_words: int) -> np.ndarray:
+        """The vocabulary bits as little-endian uint64 words."""
+        return np.frombuffer(self.bits.to_bytes(8 * n_words, "little"), dtype="<u8").astype(np.uint64)
+
+
+def n_words(vocab: Optional[SkillVocabulary] = None) -> int:
+    """Number of uint64 words needed for one vocabulary bitset."""
+    vocab = vocab or get_skill_vocabulary()
+    return (len(vocab) + 63) // 64
+
+
+def pack_skill_sets(skill_lists: Iterable[Sequence[str]], vocab: Optional[SkillVocabulary] = None) -> np.ndarray:
+    """Pack skill lists into an N x W uint64 bitset matrix (unknown skills are dropped)."""
+    vocab = vocab or get_skill_vocabulary()
+    W = n_words(vocab)
+    skill_lists = [list(skills) for skills in skill_lists]
+    ids = vocab.ids(s for skills in skill_lists for s in skills)
+    rows = np.repeat(np.arange(len(skill_lists)), [len(skills) for skills in skill_lists])
+    known = ids != UNKNOWN
+
+    # Set bits in a boolean N x 64W matrix, then pack each 64 bits into a word
+    bits = np.zeros((len(skill_lists), 64 * W), dtype=bool)
+    bits[rows[known], ids[known]] = True
+    return np.packbits(bits, axis=1, bitorder="little").view("<u8").astype(np.uint64)
+
+
+def popcount(words: np.ndarray) -> np.ndarray:
+    """Set bits per row of a (..., W) uint64 array."""
+    x = words - ((words >> np.uint64(1)) & _M1)
+    x = (x & _M2) + ((x >> np.uint64(2)) & _M2)
+    x = (x + (x >> np.uint64(4))) & _M4
+    return ((x * _H01) >> np.uint64(56)).sum(axis=-1, dtype=np.int64)
+
+
+def batch_match_counts(candidates: np.ndarray, masks: np.ndarray, chunk_size: int = 4096) -> np.ndarray:
+    """Count candidate skills inside each mask.
+
+    Args:
+        candidates: N x W uint64 candidate bitsets (see pack_skill_sets)
+        masks: R x W uint64 role/category masks
+        chunk_size: Candidates per chunk, bounding the N x R x W temporary
+
+    Returns:
+        N x R matrix of |candidate & mask|
+    """
+    counts = np.empty((len(candidates), len(masks)), dtype=np.int64)
+    for start in range(0, len(candidates), chunk_size):
+        block = candidates[start:start + chunk_size]
+        counts[start:start + len(block)] = popcount(block[:, None, :] & masks[None, :, :])
+    return counts
+
+
+_ROLE_MASKS = {}
+
+
+def role_masks(role_id: str, level: str, vocab: Optional[SkillVocabulary] = None):
+    """(core, secondary, bonus) SkillSets of a role level (cached)."""
+    vocab = vocab or get_skill_vocabulary()
+    key = (vocab, role_id, level)
+    masks = _ROLE_MASKS.get(key)
+    if masks is None:
+        masks = tuple(SkillSet.from_ids(ids) for ids in vocab.role_skill_ids(role_id, level))
+        _ROLE_MASKS[key] = masks
+    return masks
+
+
+def batch_role_coverage(
+    candidates: np.ndarray,
+    role_keys: Sequence[Tuple[str, str]],
+    vocab: Optional[SkillVocabulary] = None,
+) -> Dict[str, np.ndarray]:
+    """Score N packed candidates against R role levels at once.
+
+    Args:
+        candidates: N x W uint64 candidate bitsets (see pack_skill_sets)
+        role_keys: (role_id, level) pairs
+
+    Returns:
+        Dict of N x R arrays: weighted_score, match_percentage and
+        core/secondary/bonus coverage, plus N x R x 3 matched counts
+    """
+    vocab = vocab or get_skill_vocabulary()
+    W = n_words(vocab)
+    masks = np.stack([
+        np.stack([m.to_words(W) for m in role_masks(role_id, level, vocab)])
+        for role_id, level in role_keys
+    ])  # R x 3 x W
+    R = len(role_keys)
+
+    counts = batch_match_counts(candidates, masks.reshape(R * 3, W)).reshape(len(candidates), R, 3)
+    totals = popcount(masks)  # R x 3
+    weights = np.array([SKILL_WEIGHTS[c] for c in CATEGORIES[1:]])
+
+    total_weight = (totals * weights).sum(axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        weighted = np.where(total_weight > 0, (counts * weights).sum(axis=-1) / total_weight, 0.0)
+        n_role = totals.sum(axis=-1)
+        match_percentage = np.where(n_role > 0, counts.sum(axis=-1) / n_role, 0.0)
+        coverage = np.where(totals > 0, counts / totals, 1.0)
+
+    return {
+        "matched_counts": counts,
+        "weighted_score": weighted,
+        "match_percentage": match_percentage,
+        "core_coverage": coverage[..., 0],
+        "secondary_coverage": coverage[..., 1],
+        "bonus_coverage": coverage[..., 2],
+    }
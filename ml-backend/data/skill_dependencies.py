@@ -3,7 +3,12 @@
 Dependencies are modeled as: skill -> list of prerequisites
 """
 
-from typing import Dict, List, Set
+import bisect
+import heapq
+from typing import Dict, List, Optional, Set
+
+from data.skill_vocab import UNKNOWN, get_skill_vocabulary
+from data.store import get_data_store
 
 # Skill dependency graph: skill -> prerequisites (must learn first)
 SKILL_DEPENDENCIES: Dict[str, List[str]] = {
@@ -120,7 +125,9 @@ DEFAULT_LEARNING_HOURS = 20
 
 def get_prerequisites(skill: str) -> List[str]:
     """Get direct prerequisites for a skill."""
-    return SKILL_DEPENDENCIES.get(skill.lower().strip(), [])
+    vocab = get_skill_vocabulary()
+    i = vocab.id(skill)
+    return vocab.prerequisite_names[i] if i != UNKNOWN else []
 
 
 def get_all_prerequisites(skill: str, visited: Set[str] = None) -> List[str]:
@@ -145,7 +152,7 @@ def get_all_prerequisites(skill: str, visited: Set[str] = None) -> List[str]:
 
 def get_learning_hours(skill: str) -> int:
     """Get estimated learning hours for a skill."""
-    return SKILL_LEARNING_HOURS.get(skill.lower().strip(), DEFAULT_LEARNING_HOURS)
+    return get_skill_vocabulary().learning_hours(skill)
 
 
 def topological_sort(skills: List[str]) -> List[str]:
@@ -185,45 +192,217 @@ def topological_sort(skills: List[str]) -> List[str]:
     return sorted_skills
 
 
-def generate_learning_roadmap(skills: List[str], weeks: int = 4) -> List[Dict]:
-    """Generate a week-wise learning roadmap for given skills."""
-    sorted_skills = topological_sort(skills)
+def _prerequisite_closure(
+    skills: List[str],
+    dependencies: Dict[str, List[str]],
+) -> Dict[str, Set[str]]:
+    """Map each skill to its transitive prerequisites that are also in `skills`.
+
+    Walks through prerequisites outside the set, so e.g. tensorflow still comes
+    after machine learning when deep learning itself is not being learned.
+    """
+    skill_set = set(skills)
+    memo: Dict[str, Set[str]] = {}
+
+    def ancestors(skill: str, stack: Set[str]) -> Set[str]:
+        if skill in memo:
+            return memo[skill]
+        stack.add(skill)
+        result: Set[str] = set()
+        for prereq in dependencies.get(skill, []):
+            if prereq in stack:  # Ignore cycles
+                continue
+            result.add(prereq)
+            result |= ancestors(prereq, stack)
+        stack.discard(skill)
+        memo[skill] = result
+        return result
+
+    return {s: ancestors(s, set()) & skill_set for s in skills}
+
+
+def _consistent_order(order: List[str], prereqs: Dict[str, Set[str]]) -> List[str]:
+    """Reorder skills so every prerequisite in `prereqs` comes first.
+
+    Stays as close to the given order as possible (Kahn's algorithm with the
+    original position as tie-breaker).
+    """
+    position = {s: i for i, s in enumerate(order)}
+    remaining = {s: len(prereqs[s]) for s in order}
+    dependents: Dict[str, List[str]] = {s: [] for s in order}
+    for skill in order:
+        for prereq in prereqs[skill]:
+            dependents[prereq].append(skill)
+
+    heap = [position[s] for s in order if remaining[s] == 0]
+    heapq.heapify(heap)
+    result = []
+    while heap:
+        skill = order[heapq.heappop(heap)]
+        result.append(skill)
+        for dependent in dependents[skill]:
+            remaining[dependent] -= 1
+            if remaining[dependent] == 0:
+                heapq.heappush(heap, position[dependent])
+    # Skills on a cycle keep their original relative order at the end
+    result.extend(s for s in order if remaining[s] > 0)
+    return result
+
+
+def _pack_weeks(
+    order: List[str],
+    hours: Dict[str, int],
+    prereqs: Dict[str, Set[str]],
+    dependents: Dict[str, List[str]],
+    capacity: int,
+    max_weeks: int = None,
+) -> Optional[List[List[str]]]:
+    """Pack skills into weeks of at most `capacity` hours.
+
+    Each week is filled best-fit-decreasing from the skills whose prerequisites
+    are already scheduled (in an earlier week or earlier in the same week).
+    A skill larger than the capacity gets a week of its own.
+
+    Returns None as soon as the plan needs more than `max_weeks` weeks.
+    """
+    position = {s: i for i, s in enumerate(order)}
+    remaining = {s: len(prereqs[s]) for s in order}
+
+    # Ready skills sorted ascending by (hours, -position): the last entry with
+    # hours <= free capacity is the largest fitting skill, earliest on ties
+    ready = sorted((hours[s], -position[s], s) for s in order if remaining[s] == 0)
+    weeks: List[List[str]] = []
+
+    while ready:
+        if max_weeks is not None and len(weeks) == max_weeks:
+            return None
+        week: List[str] = []
+        load = 0
+        while ready:
+            if week:
+                idx = bisect.bisect_right(ready, (capacity - load, float("inf"))) - 1
+                if idx < 0:
+                    break
+            else:
+                idx = len(ready) - 1
+            _, _, skill = ready.pop(idx)
+            week.append(skill)
+            load += hours[skill]
+            for dependent in dependents[skill]:
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    bisect.insort(ready, (hours[dependent], -position[dependent], dependent))
+        # Present each week in dependency order
+        week.sort(key=position.__getitem__)
+        weeks.append(week)
+
+    return weeks
+
+
+def schedule_skills(
+    order: List[str],
+    hours: Dict[str, int],
+    prereqs: Dict[str, Set[str]],
+    weeks: int = 4,
+    max_hours_per_week: int = None,
+) -> List[List[str]]:
+    """Precedence-constrained week scheduling that minimizes the heaviest week.
+
+    Binary-searches the smallest weekly capacity for which the packing fits in
+    `weeks`. A `max_hours_per_week` cap is never exceeded (except by a single
+    skill that is larger than the cap); if the cap is tighter than what `weeks`
+    needs, the plan uses more weeks instead.
+
+    Args:
+        order: Skills in a valid dependency order
+        hours: Learning hours per skill
+        prereqs: Skill -> prerequisites within `order` (transitive)
+        weeks: Target number of weeks (>= 1)
+        max_hours_per_week: Optional hard weekly cap
+
+    Returns:
+        List of weeks, each a list of skills in dependency order
+    """
+    if not order:
+        return []
+    weeks = max(1, weeks)
+    order = _consistent_order(order, prereqs)
+    # Drop prerequisites that come later in the order (only on cycles), so
+    # every skill becomes ready and is scheduled
+    position = {s: i for i, s in enumerate(order)}
+    prereqs = {s: {p for p in prereqs[s] if position[p] < position[s]} for s in order}
+    dependents: Dict[str, List[str]] = {s: [] for s in order}
+    for skill in order:
+        for prereq in prereqs[skill]:
+            dependents[prereq].append(skill)
+
+    def pack(capacity: int, max_weeks: int = None):
+        return _pack_weeks(order, hours, prereqs, dependents, capacity, max_weeks)
+
+    total = sum(hours[s] for s in order)
+    low = max(max(hours[s] for s in order), -(-total // weeks))
+    high = total
+    if max_hours_per_week is not None:
+        high = max(min(high, max_hours_per_week), 1)
+        low = min(low, high)
+
+    # The lower bound is often achievable; try it before searching
+    best = pack(low, weeks)
+    if best is not None:
+        return best
+
+    # Galloping search for a feasible capacity, then bisect down to the smallest
+    step = max(1, low // 8)
+    best = None
+    while best is None:
+        probe = min(low + step, high)
+        best = pack(probe, weeks)
+        if best is None:
+            if probe == high:
+                # Even the loosest allowed capacity needs more weeks than requested
+                return pack(high)
+            low, step = probe, step * 2
+    high = probe
+
+    low += 1
+    while low < high:
+        mid = (low + high) // 2
+        packed = pack(mid, weeks)
+        if packed is not None:
+            best, high = packed, mid
+        else:
+            low = mid + 1
+    return best
+
+
+def generate_learning_roadmap(
+    skills: List[str],
+    weeks: int = 4,
+    max_hours_per_week: int = None,
+) -> List[Dict]:
+    """Generate a week-wise learning roadmap for given skills.
     
-    # Calculate total hours
-    total_hours = sum(get_learning_hours(s) for s in sorted_skills)
-    hours_per_week = total_hours / weeks if weeks > 0 else total_hours
+    Prerequisites are always scheduled in an earlier week or earlier in the
+    same week, and the heaviest week is kept as light as possible.
     
-    roadmap = []
-    current_week = 1
-    week_hours = 0
-    week_skills = []
+    Args:
+        skills: Skills to learn
+        weeks: Number of weeks to spread the plan over
+        max_hours_per_week: Optional hard cap on weekly hours; the plan grows
+            beyond `weeks` if the cap requires it
+    """
+    sorted_skills = topological_sort(skills)
+    hours = {s: get_learning_hours(s) for s in sorted_skills}
+    prereqs = _prerequisite_closure(sorted_skills, get_data_store().dependencies)
     
-    for skill in sorted_skills:
-        skill_hours = get_learning_hours(skill)
-        
-        # Check if adding this skill exceeds week capacity
-        if week_hours + skill_hours > hours_per_week * 1.3 and week_skills:
-            # Save current week
-            roadmap.append({
-                "week": current_week,
-                "skills": week_skills,
-                "estimated_hours": week_hours,
-                "focus": week_skills[0] if week_skills else "",
-            })
-            current_week += 1
-            week_hours = 0
-            week_skills = []
-        
-        week_skills.append(skill)
-        week_hours += skill_hours
+    plan = schedule_skills(sorted_skills, hours, prereqs, weeks, max_hours_per_week)
     
-    # Add remaining skills
-    if week_skills:
-        roadmap.append({
-            "week": current_week,
+    return [
+        {
+            "week": i,
             "skills": week_skills,
-            "estimated_hours": week_hours,
-            "focus": week_skills[0] if week_skills else "",
-        })
-    
-    return roadmap
+            "estimated_hours": sum(hours[s] for s in week_skills),
+            "focus": week_skills[0],
+        }
+        for i, week_skills in enumerate(plan, 1)
+    ]
@@ -0,0 +1,188 @@
+"""Typo-tolerant skill lookup with a SymSpell-style deletion index.
+
+Every vocabulary skill and alias is indexed under the strings obtained by
+deleting up to MAX_DISTANCE characters from its (prefix of PREFIX_LENGTH
+characters of its) squashed form, i.e. lowercased with spaces and . - _ /
+removed. A query generates its own deletes and looks them up, so candidates
+within the edit distance come from a few dict lookups instead of a scan of the
+taxonomy; each candidate is then verified with the optimal string alignment
+distance (adjacent transpositions count as one edit, so "pyhton" is one edit
+from "python").
+
+Short real skills often lie one substituted letter apart ("rest" / "rust",
+"mssql" / "mysql"), so queries shorter than MIN_SUBSTITUTION_LENGTH are not
+corrected by a substitution; a missing, extra or swapped character still
+resolves them ("dockr", "pyhton").
+
+Confidence is 1.0 for exact names and aliases, SQUASHED_CONFIDENCE when only
+spacing or punctuation differ ("Node JS"), and 1 - distance / length for edits.
+A query whose best candidates map to different skills with equal confidence
+is ambiguous and does not resolve.
+"""
+
+import re
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from data.skill_vocab import MAX_INTERNED_INPUTS, SkillVocabulary, get_skill_vocabulary
+from data.store import get_data_store
+
+MAX_DISTANCE = 2
+PREFIX_LENGTH = 7
+SQUASHED_CONFIDENCE = 0.95
+MIN_SUBSTITUTION_LENGTH = 7
+
+_SQUASH_RE = re.compile(r"[\s._/-]+")
+
+Match = Tuple[Optional[str], float]
+NO_MATCH: Match = (None, 0.0)
+
+
+def squash(skill: str) -> str:
+    """Lowercased skill without spaces and . - _ / separators."""
+    return _SQUASH_RE.sub("", skill.lower())
+
+
+def max_distance(length: int) -> int:
+    """Edits allowed for a squashed query of this length (none for 3 or fewer chars)."""
+    if length <= 3:
+        return 0
+    return 1 if length <= 8 else MAX_DISTANCE
+
+
+def _deletes(term: str, distance: int) -> Set[str]:
+    """term and every string obtained by deleting up to `distance` characters."""
+    found = {term}
+    frontier = {term}
+    for _ in range(distance):
+        frontier = {s[:i] + s[i + 1:] for s in frontier for i in range(len(s))} - found
+        found |= frontier
+    return found
+
+
+def _is_substitution(a: str, b: str) -> bool:
+    """Whether b is a with exactly one character replaced."""
+    return len(a) == len(b) and sum(x != y for x, y in zip(a, b)) == 1
+
+
+def osa_distance(a: str, b: str, limit: int) -> int:
+    """Optimal string alignment distance, or limit + 1 once it exceeds limit."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    # Typos leave most of both strings equal: only align what differs
+    start = 0
+    while start < len(a) and start < len(b) and a[start] == b[start]:
+        start += 1
+    end = 0
+    while end < len(a) - start and end < len(b) - start and a[-1 - end] == b[-1 - end]:
+        end += 1
+    a, b = a[start:len(a) - end], b[start:len(b) - end]
+    if not a or not b:
+        return min(len(a) + len(b), limit + 1)
+    previous2: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return min(previous[-1], limit + 1)
+
+
+class FuzzySkillIndex:
+    """Deletion index over a vocabulary's skill names and aliases.
+
+    Args:
+        vocab: Vocabulary whose names are the resolvable skills
+        aliases: Alias -> canonical skill name
+    """
+
+    def __init__(self, vocab: SkillVocabulary, aliases: Dict[str, str]):
+        self._vocab = vocab
+        # Exact lookups: lowercased name or alias -> skill, squashed form -> skills
+        self._exact: Dict[str, str] = {name: name for name in vocab.names}
+        self._exact.update({alias.lower().strip(): skill for alias, skill in aliases.items()})
+        self._squashed: Dict[str, Set[str]] = {}
+        for term, skill in self._exact.items():
+            self._squashed.setdefault(squash(term), set()).add(skill)
+
+        # Delete of a squashed term's prefix -> squashed terms
+        self._index: Dict[str, List[str]] = {}
+        for term in self._squashed:
+            for delete in _deletes(term[:PREFIX_LENGTH], max_distance(len(term))):
+                self._index.setdefault(delete, []).append(term)
+
+        self._cache: Dict[str, Match] = {}
+
+    def __len__(self) -> int:
+        return len(self._squashed)
+
+    def _lookup(self, skill: str) -> Match:
+        lowered = skill.lower().strip()
+        exact = self._exact.get(lowered)
+        if exact is not None:
+            return exact, 1.0
+        query = squash(lowered)
+        skills = self._squashed.get(query)
+        if skills:
+            return (min(skills), SQUASHED_CONFIDENCE) if len(skills) == 1 else NO_MATCH
+
+        limit = max_distance(len(query))
+        if not limit:
+            return NO_MATCH
+        best: Dict[str, float] = {}  # skill -> confidence
+        seen: Set[str] = set()
+        for delete in _deletes(query[:PREFIX_LENGTH], limit):
+            for term in self._index.get(delete, ()):
+                if term in seen:
+                    continue
+                seen.add(term)
+                bound = min(limit, max_distance(len(term)))
+                distance = osa_distance(query, term, bound)
+                if distance > bound:
+                    continue
+                if len(query) < MIN_SUBSTITUTION_LENGTH and _is_substitution(query, term):
+                    continue
+                confidence = 1.0 - distance / max(len(query), len(term))
+                for skill in self._squashed[term]:
+                    best[skill] = max(best.get(skill, 0.0), confidence)
+        if not best:
+            return NO_MATCH
+        top = max(best.values())
+        winners = [skill for skill, confidence in best.items() if confidence == top]
+        return (winners[0], round(top, 3)) if len(winners) == 1 else NO_MATCH
+
+    def resolve(self, skill: str) -> Match:
+        """(canonical skill, confidence) for a possibly misspelled name, or (None, 0.0)."""
+        match = self._cache.get(skill)
+        if match is None:
+            match = self._lookup(skill)
+            if len(self._cache) >= MAX_INTERNED_INPUTS:
+                self._cache.clear()
+            self._cache[skill] = match
+        return match
+
+    def resolve_many(self, skills: Iterable[str]) -> List[Match]:
+        """resolve() for a whole skill list (repeated inputs are looked up once)."""
+        cache = self._cache
+        return [cache.get(skill) or self.resolve(skill) for skill in skills]
+
+
+_INDEX: Dict[str, Any] = {"vocab": None, "index": None}
+_LOCK = threading.Lock()
+
+
+def get_fuzzy_index() -> FuzzySkillIndex:
+    """Index for the current vocabulary (built on first use, rebuilt with the vocabulary)."""
+    vocab = get_skill_vocabulary()
+    if _INDEX["vocab"] is not vocab:
+        with _LOCK:
+            if _INDEX["vocab"] is not vocab:
+                _INDEX["index"] = FuzzySkillIndex(vocab, get_data_store().aliases)
+                _INDEX["vocab"] = vocab
+    return _INDEX["index"]
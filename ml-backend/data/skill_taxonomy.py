@@ -1,5 +1,11 @@
 """Predefined skill taxonomy for standardization and extraction."""
 
+from typing import Any, Dict, List, Optional, Tuple
+
+from data.skill_fuzzy import get_fuzzy_index
+from data.skill_vocab import UNKNOWN, get_skill_vocabulary
+from data.store import get_data_store
+
 # All recognized skills in the system (lowercase for matching)
 SKILL_TAXONOMY = {
     # Programming Languages
@@ -52,10 +58,47 @@ SKILL_ALIASES = {
 
 def normalize_skill(skill: str) -> str:
     """Normalize a skill name to its canonical form."""
-    skill_lower = skill.lower().strip()
-    return SKILL_ALIASES.get(skill_lower, skill_lower)
+    return get_skill_vocabulary().canonical(skill)
 
 
 def is_valid_skill(skill: str) -> bool:
     """Check if a skill is in the taxonomy."""
-    return normalize_skill(skill) in SKILL_TAXONOMY
+    return normalize_skill(skill) in get_data_store().taxonomy
+
+
+def resolve_skill(skill: str) -> Tuple[Optional[str], float]:
+    """Canonical skill for a possibly misspelled name, with a confidence in [0, 1].
+
+    Returns (None, 0.0) when nothing is close enough (see data.skill_fuzzy).
+    """
+    return get_fuzzy_index().resolve(skill)
+
+
+def resolve_skills(skills: List[str]) -> List[Tuple[Optional[str], float]]:
+    """resolve_skill for each skill of a list."""
+    return get_fuzzy_index().resolve_many(skills)
+
+
+def correct_skills(skills: List[str], min_confidence: float) -> Tuple[List[str], List[Dict[str, Any]]]:
+    """Replace unrecognized skills with their fuzzy matches.
+
+    Skills in the vocabulary are kept as given; others are replaced when they
+    resolve with at least min_confidence.
+
+    Returns:
+        Tuple of (skills, corrections as {"input", "skill", "confidence"})
+    """
+    vocab = get_skill_vocabulary()
+    unknown = [s for s in skills if vocab.id(s) == UNKNOWN]
+    if not unknown:
+        return skills, []
+    matches = dict(zip(unknown, resolve_skills(unknown)))
+    corrected, corrections = [], {}
+    for skill in skills:
+        name, confidence = matches.get(skill, (None, 0.0))
+        if name is not None and confidence >= min_confidence:
+            corrected.append(name)
+            corrections.setdefault(skill, {"input": skill, "skill": name, "confidence": confidence})
+        else:
+            corrected.append(skill)
+    return corrected, list(corrections.values())
@@ -0,0 +1,246 @@
+"""Dense integer IDs for every skill known to the data layer.
+
+Each skill named in the taxonomy, aliases, dependency graph, learning hours,
+role definitions or learning resources is assigned one ID in [0, n). Per-skill
+data (learning hours, prerequisites, role categories, gap-ranker metadata) is
+stored in numpy arrays indexed by ID, and raw input strings are interned
+through a cache so `.lower().strip()` and alias resolution run once per
+distinct input rather than at every lookup.
+
+Per-skill arrays have one extra trailing entry holding the default value, so
+indexing with UNKNOWN (-1) needs no masking.
+"""
+
+import threading
+from typing import Any, Dict, Iterable, List, Mapping, Tuple
+
+import numpy as np
+
+UNKNOWN = -1
+
+# Role category codes used by SkillVocabulary.role_categories
+CATEGORIES = ("unknown", "core", "secondary", "bonus")
+CATEGORY_CODES = {name: code for code, name in enumerate(CATEGORIES)}
+
+DEFAULT_METADATA = (3, 3, 20)  # (difficulty, market_demand, learning_hours)
+
+# Bound on interned raw inputs (user-supplied strings are unbounded)
+MAX_INTERNED_INPUTS = 100_000
+
+
+class SkillVocabulary:
+    """Maps skills to dense IDs and holds per-skill data as arrays.
+
+    Args:
+        taxonomy: Recognized skill names
+        aliases: Alias -> canonical skill name
+        dependencies: Skill -> direct prerequisites
+        learning_hours: Skill -> estimated learning hours
+        default_hours: Hours for skills without an estimate
+        roles: Role definitions (role_id -> {"levels": {level: {"skills": ...}}})
+        category_weights: Category name -> match weight
+        resources: Skill -> curated learning resources (may be a lazy mapping)
+    """
+
+    def __init__(
+        self,
+        taxonomy: Iterable[str],
+        aliases: Dict[str, str],
+        dependencies: Dict[str, List[str]],
+        learning_hours: Dict[str, int],
+        default_hours: int,
+        roles: Dict[str, Dict[str, Any]],
+        category_weights: Dict[str, float],
+        resources: Mapping[str, List[Dict[str, Any]]],
+    ):
+        role_skills = {
+            (role_id, level): {
+                category: [s.lower().strip() for s in level_def["skills"][category]]
+                for category in CATEGORIES[1:]
+            }
+            for role_id, role in roles.items()
+            for level, level_def in role["levels"].items()
+        }
+
+        names = set(taxonomy) | set(aliases.values()) | set(learning_hours) | set(resources)
+        for skill, prereqs in dependencies.items():
+            names.add(skill)
+            names.update(prereqs)
+        for categories in role_skills.values():
+            for skills in categories.values():
+                names.update(skills)
+
+        self.names: List[str] = sorted(names)
+        self._index: Dict[str, int] = {name: i for i, name in enumerate(self.names)}
+        self._aliases = dict(aliases)
+
+        # Interned raw inputs: raw -> ID of its lowercased form / canonical name
+        self._interned: Dict[str, int] = {}
+        self._canonical: Dict[str, str] = {}
+        self._bits: Dict[str, int] = {}
+
+        self.hours = np.array(
+            [learning_hours.get(s, default_hours) for s in self.names] + [default_hours],
+            dtype=np.int32,
+        )
+        # Python list mirror for scalar lookups (numpy scalar indexing is slower)
+        self._hours_list: List[int] = self.hours.tolist()
+
+        # Prerequisites in CSR form: prerequisites of skill i are
+        # prereq_ids[prereq_ptr[i]:prereq_ptr[i + 1]]
+        self.prerequisite_names: List[List[str]] = [dependencies.get(s, []) for s in self.names]
+        ptr = [0]
+        ids: List[int] = []
+        for prereqs in self.prerequisite_names:
+            ids.extend(self._index[p] for p in prereqs)
+            ptr.append(len(ids))
+        self.prereq_ptr = np.array(ptr, dtype=np.int32)
+        self.prereq_ids = np.array(ids, dtype=np.int32)
+        self.prereq_count = np.append(np.diff(self.prereq_ptr), 0).astype(np.int32)
+
+        # Not copied per ID: a store's resource mapping may page from disk
+        self._resources = resources
+
+        # Per role level: skill IDs per category in role order, and (built on
+        # first use, as it has one entry per vocabulary skill) the category code
+        # of every skill
+        self._category_weights = np.array(
+            [category_weights.get(c, 0.0) for c in CATEGORIES], dtype=np.float64
+        )
+        self._role_categories: Dict[Tuple[str, str], np.ndarray] = {}
+        self._role_skill_ids: Dict[Tuple[str, str], Tuple[List[int], List[int], List[int]]] = {
+            key: tuple([self._index[s] for s in categories[c]] for c in CATEGORIES[1:])
+            for key, categories in role_skills.items()
+        }
+
+        self._metadata_source = None
+        self._metadata_array = None
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def id(self, skill: str) -> int:
+        """ID of skill.lower().strip(), or UNKNOWN (aliases are not resolved)."""
+        i = self._interned.get(skill)
+        if i is None:
+            i = self._index.get(skill.lower().strip(), UNKNOWN)
+            if len(self._interned) >= MAX_INTERNED_INPUTS:
+                self._interned.clear()
+            self._interned[skill] = i
+        return i
+
+    def ids(self, skills: Iterable[str]) -> np.ndarray:
+        """IDs for several skills (UNKNOWN for unrecognized ones)."""
+        return np.fromiter((self.id(s) for s in skills), dtype=np.int64)
+
+    def mask(self, skills: Iterable[str]) -> Tuple[int, List[str]]:
+        """Bitmask of the skills' IDs (bit i <=> ID i), plus lowercased unknown skills."""
+        bits = 0
+        unknown = []
+        cache = self._bits
+        for skill in skills:
+            bit = cache.get(skill)
+            if bit is None:
+                i = self.id(skill)
+                bit = 1 << i if i != UNKNOWN else 0
+                if len(cache) >= MAX_INTERNED_INPUTS:
+                    cache.clear()
+                cache[skill] = bit
+            if bit:
+                bits |= bit
+            else:
+                unknown.append(skill.lower().strip())
+        return bits, unknown
+
+    def resources_for_id(self, skill_id: int) -> List[Dict[str, Any]]:
+        """Curated resources of a skill ID (empty for UNKNOWN or none)."""
+        if skill_id == UNKNOWN:
+            return []
+        return self._resources.get(self.names[skill_id], [])
+
+    def learning_hours(self, skill: str) -> int:
+        """Estimated learning hours (the default for unknown skills)."""
+        return self._hours_list[self.id(skill)]
+
+    def canonical(self, skill: str) -> str:
+        """Lowercased skill name with aliases resolved (unknown skills pass through)."""
+        name = self._canonical.get(skill)
+        if name is None:
+            lowered = skill.lower().strip()
+            name = self._aliases.get(lowered, lowered)
+            if len(self._canonical) >= MAX_INTERNED_INPUTS:
+                self._canonical.clear()
+            self._canonical[skill] = name
+        return name
+
+    def canonical_id(self, skill: str) -> int:
+        """ID of the skill after alias resolution, or UNKNOWN."""
+        return self._index.get(self.canonical(skill), UNKNOWN)
+
+    def role_categories(self, role_id: str, level: str) -> np.ndarray:
+        """Category code (see CATEGORIES) of every skill for a role level."""
+        key = (role_id, level)
+        codes = self._role_categories.get(key)
+        if codes is None:
+            # Assign lowest priority first so a skill listed twice keeps its
+            # highest category
+            codes = np.zeros(len(self.names) + 1, dtype=np.int8)
+            for category, ids in reversed(list(zip(CATEGORIES[1:], self._role_skill_ids[key]))):
+                codes[ids] = CATEGORY_CODES[category]
+            self._role_categories[key] = codes
+        return codes
+
+    def role_weights(self, role_id: str, level: str) -> np.ndarray:
+        """Match weight of every skill for a role level (0 for skills not in the role)."""
+        return self._category_weights[self.role_categories(role_id, level)]
+
+    def role_skill_ids(self, role_id: str, level: str) -> Tuple[List[int], List[int], List[int]]:
+        """(core, secondary, bonus) skill IDs of a role level, in role order."""
+        return self._role_skill_ids[(role_id, level)]
+
+    def metadata_array(self, metadata: Dict[str, Tuple]) -> np.ndarray:
+        """Gap-ranker metadata as an (n + 1, 3) array; cached per metadata dict."""
+        if metadata is not self._metadata_source:
+            array = np.array([DEFAULT_METADATA] * (len(self.names) + 1), dtype=np.float64)
+            for skill, meta in metadata.items():
+                i = self._index.get(skill)
+                if i is not None:
+                    array[i] = meta[:3]
+            self._metadata_array = array
+            self._metadata_source = metadata
+        return self._metadata_array
+
+
+_VOCABULARY = None
+_LOCK = threading.Lock()
+
+
+def get_skill_vocabulary() -> SkillVocabulary:
+    """Get the vocabulary built from the configured data store."""
+    global _VOCABULARY
+    if _VOCABULARY is None:
+        with _LOCK:
+            if _VOCABULARY is None:
+                # Imported here: these modules use the vocabulary themselves
+                from data.role_definitions import SKILL_WEIGHTS
+                from data.store import get_data_store
+
+                store = get_data_store()
+                _VOCABULARY = SkillVocabulary(
+                    store.taxonomy,
+                    store.aliases,
+                    store.dependencies,
+                    store.learning_hours,
+                    store.default_learning_hours,
+                    store.roles,
+                    SKILL_WEIGHTS,
+                    store.resources,
+                )
+    return _VOCABULARY
+
+
+def reset_skill_vocabulary():
+    """Drop the vocabulary so it is rebuilt from the data store on next use."""
+    global _VOCABULARY
+    with _LOCK:
+        _VOCABULARY = None
@@ -0,0 +1,413 @@
+"""Pluggable source for the skill taxonomy, roles, dependencies and resources.
+
+The definitions in this package's modules are the built-in defaults. A
+deployment with a larger catalog that changes without code deploys points the
+DATA_STORE environment variable at an external file instead:
+
+    DATA_STORE=/srv/catalog.db          SQLite (see write_sqlite_store)
+    DATA_STORE=/srv/catalog.json[.gz]   JSON document (see write_json_store)
+
+Every store exposes the same in-memory indexes (taxonomy set, alias, dependency,
+learning-hour and role dicts). Learning resources are the bulk of a real
+catalog, so the SQLite store does not load them: `store.resources` is a
+read-only mapping that pages one skill's resources in from an indexed table on
+first access and keeps recently used skills in a bounded LRU cache.
+
+The store is chosen once per process; the vocabulary (data/skill_vocab.py) and
+everything derived from it are built from it.
+"""
+
+import gzip
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Set
+
+# Resources fetched per skill on first access (get_resources_for_skill asks for
+# at most a handful; use SqliteResourceMap.page for deeper paging)
+RESOURCE_PAGE_SIZE = 100
+
+# Skills whose resource pages are kept in memory by the SQLite store
+RESOURCE_CACHE_SIZE = int(os.getenv("DATA_STORE_CACHE_SIZE", "20000"))
+
+SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+JSON_SUFFIXES = (".json", ".json.gz")
+
+
+class DataStore:
+    """Skill, role, dependency and resource definitions as in-memory indexes.
+
+    Args:
+        taxonomy: Recognized skill names
+        aliases: Alias -> canonical skill name
+        dependencies: Skill -> direct prerequisites
+        learning_hours: Skill -> estimated learning hours
+        default_learning_hours: Hours for skills without an estimate
+        roles: Role definitions (role_id -> {"title", "domain", "levels"})
+        resources: Skill -> learning resources (may be a lazy mapping)
+        source: Where the definitions were loaded from (a file path for
+            external stores)
+    """
+
+    def __init__(
+        self,
+        taxonomy: Iterable[str],
+        aliases: Dict[str, str],
+        dependencies: Dict[str, List[str]],
+        learning_hours: Dict[str, int],
+        default_learning_hours: int,
+        roles: Dict[str, Dict[str, Any]],
+        resources: Mapping[str, List[Dict[str, Any]]],
+        source: str = "builtin",
+    ):
+        self.taxonomy: Set[str] = set(taxonomy)
+        self.aliases = aliases
+        self.dependencies = dependencies
+        self.learning_hours = learning_hours
+        self.default_learning_hours = default_learning_hours
+        self.roles = roles
+        self.resources = resources
+        self.source = source
+        self._loaded_version = _file_version(source) if source != "builtin" else None
+
+    def content_version(self) -> str:
+        """Identifies the definitions served: the source plus, for a file, its
+        size and mtime when loaded and now (the SQLite store reads resources
+        from the file on demand, so later edits change what it serves)."""
+        if self._loaded_version is None:
+            return self.source
+        return f"{self.source}:{self._loaded_version}:{_file_version(self.source)}"
+
+    def __repr__(self) -> str:
+        return (
+            f"<{type(self).__name__} {self.source}: {len(self.taxonomy)} skills, "
+            f"{len(self.roles)} roles, resources for {len(self.resources)} skills>"
+        )
+
+
+def _file_version(source: str) -> Optional[str]:
+    """Size and mtime of a store file, or None if source is not a file."""
+    try:
+        stat = os.stat(source)
+    except (OSError, ValueError):
+        return None
+    return f"{stat.st_size}-{stat.st_mtime_ns}"
+
+
+def builtin_store() -> DataStore:
+    """The definitions hard-coded in the data package."""
+    # Imported here: these modules use the store themselves
+    from data.learning_resources import LEARNING_RESOURCES
+    from data.role_definitions import ROLE_DEFINITIONS
+    from data.skill_dependencies import (
+        DEFAULT_LEARNING_HOURS,
+        SKILL_DEPENDENCIES,
+        SKILL_LEARNING_HOURS,
+    )
+    from data.skill_taxonomy import SKILL_ALIASES, SKILL_TAXONOMY
+
+    return DataStore(
+        SKILL_TAXONOMY,
+        SKILL_ALIASES,
+        SKILL_DEPENDENCIES,
+        SKILL_LEARNING_HOURS,
+        DEFAULT_LEARNING_HOURS,
+        ROLE_DEFINITIONS,
+        LEARNING_RESOURCES,
+    )
+
+
+def _all_resources(resources: Mapping[str, List[Dict[str, Any]]], skill: str) -> List[Dict[str, Any]]:
+    """Every resource of a skill, past the first page of a paged mapping."""
+    if isinstance(resources, SqliteResourceMap):
+        return resources.page(skill, 0, -1)
+    return resources[skill]
+
+
+def _decode_role(role: Dict[str, Any]) -> Dict[str, Any]:
+    """Restore tuple fields that JSON turns into lists."""
+    for level_def in role["levels"].values():
+        if "experience_range" in level_def:
+            level_def["experience_range"] = tuple(level_def["experience_range"])
+    return role
+
+
+# ---------------------------------------------------------------------------
+# JSON
+# ---------------------------------------------------------------------------
+
+def _open_text(path: Path, mode: str):
+    if path.name.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def write_json_store(store: DataStore, path: Path):
+    """Write a store as one JSON document (gzipped if the name ends in .gz).
+
+    Resources are streamed out skill by skill, so a lazy resource mapping is
+    never materialized.
+    """
+    header = json.dumps({
+        "taxonomy": sorted(store.taxonomy),
+        "aliases": store.aliases,
+        "dependencies": store.dependencies,
+        "learning_hours": store.learning_hours,
+        "default_learning_hours": store.default_learning_hours,
+        "roles": store.roles,
+    })
+    with _open_text(Path(path), "w") as f:
+        f.write(header[:-1] + ', "resources": {')
+        for i, skill in enumerate(store.resources):
+            f.write(f'{", " if i else ""}{json.dumps(skill)}: {json.dumps(_all_resources(store.resources, skill))}')
+        f.write("}}")
+
+
+def load_json_store(path: Path) -> DataStore:
+    """Load a JSON document written by write_json_store (fully into memory)."""
+    with _open_text(Path(path), "r") as f:
+        document = json.load(f)
+    return DataStore(
+        document["taxonomy"],
+        document.get("aliases", {}),
+        document.get("dependencies", {}),
+        document.get("learning_hours", {}),
+        document.get("default_learning_hours", 20),
+        {role_id: _decode_role(role) for role_id, role in document.get("roles", {}).items()},
+        document.get("resources", {}),
+        source=str(path),
+    )
+
+
+# ---------------------------------------------------------------------------
+# SQLite
+# ---------------------------------------------------------------------------
+
+_SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE skills (
+    name TEXT PRIMARY KEY,
+    in_taxonomy INTEGER NOT NULL,
+    learning_hours INTEGER,
+    resource_count INTEGER NOT NULL
+);
+CREATE TABLE aliases (alias TEXT PRIMARY KEY, skill TEXT NOT NULL);
+CREATE TABLE dependencies (
+    skill TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    prerequisite TEXT NOT NULL,
+    PRIMARY KEY (skill, position)
+);
+CREATE TABLE roles (role_id TEXT PRIMARY KEY, position INTEGER NOT NULL, definition TEXT NOT NULL);
+CREATE TABLE resources (
+    skill TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    resource TEXT NOT NULL,
+    PRIMARY KEY (skill, position)
+) WITHOUT ROWID;
+"""
+
+
+def write_sqlite_store(store: DataStore, path: Path, batch_size: int = 50_000):
+    """Write a store to a new SQLite database (an existing file is replaced)."""
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.unlink(missing_ok=True)
+    conn = sqlite3.connect(tmp)
+    try:
+        conn.executescript(_SCHEMA)
+        conn.execute(
+            "INSERT INTO meta VALUES ('default_learning_hours', ?)",
+            (str(store.default_learning_hours),),
+        )
+
+        resource_counts = {}
+
+        def resource_rows():
+            for skill in store.resources:
+                resources = _all_resources(store.resources, skill)
+                resource_counts[skill] = len(resources)
+                for position, resource in enumerate(resources):
+                    yield skill, position, json.dumps(resource)
+
+        rows = resource_rows()
+        while True:
+            batch = [row for _, row in zip(range(batch_size), rows)]
+            if not batch:
+                break
+            conn.executemany("INSERT INTO resources VALUES (?, ?, ?)", batch)
+
+        names = set(store.taxonomy) | set(store.learning_hours) | set(resource_counts)
+        conn.executemany(
+            "INSERT INTO skills VALUES (?, ?, ?, ?)",
+            (
+                (name, name in store.taxonomy, store.learning_hours.get(name), resource_counts.get(name, 0))
+                for name in sorted(names)
+            ),
+        )
+        conn.executemany("INSERT INTO aliases VALUES (?, ?)", store.aliases.items())
+        conn.executemany(
+            "INSERT INTO dependencies VALUES (?, ?, ?)",
+            (
+                (skill, position, prereq)
+                for skill, prereqs in store.dependencies.items()
+                for position, prereq in enumerate(prereqs)
+            ),
+        )
+        conn.executemany(
+            "INSERT INTO roles VALUES (?, ?, ?)",
+            ((role_id, i, json.dumps(role)) for i, (role_id, role) in enumerate(store.roles.items())),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(tmp, path)
+
+
+class SqliteResourceMap(Mapping):
+    """Read-only skill -> resources mapping paged in from SQLite.
+
+    Iteration and len() use the skill index loaded at open time; the resources
+    themselves are queried on first access per skill and cached (LRU).
+    """
+
+    def __init__(self, conn: sqlite3.Connection, lock: threading.Lock, skills: List[str], cache_size: int):
+        self._conn = conn
+        self._lock = lock
+        self._skills = skills
+        self._skill_set = set(skills)
+        self._cache: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+        self._cache_size = cache_size
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._skills)
+
+    def __len__(self) -> int:
+        return len(self._skills)
+
+    def __contains__(self, skill) -> bool:
+        return skill in self._skill_set
+
+    def __getitem__(self, skill: str) -> List[Dict[str, Any]]:
+        if skill not in self._skill_set:
+            raise KeyError(skill)
+        with self._lock:
+            resources = self._cache.get(skill)
+            if resources is not None:
+                self._cache.move_to_end(skill)
+                return resources
+            resources = self._page_locked(skill, 0, RESOURCE_PAGE_SIZE)
+            self._cache[skill] = resources
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+            return resources
+
+    def page(self, skill: str, offset: int = 0, limit: int = RESOURCE_PAGE_SIZE) -> List[Dict[str, Any]]:
+        """Resources of a skill by position, bypassing the cache (limit -1 for all)."""
+        with self._lock:
+            return self._page_locked(skill, offset, limit)
+
+    def _page_locked(self, skill: str, offset: int, limit: int) -> List[Dict[str, Any]]:
+        rows = self._conn.execute(
+            "SELECT resource FROM resources WHERE skill = ? AND position >= ? "
+            "ORDER BY position LIMIT ?",
+            (skill, offset, limit),
+        ).fetchall()
+        return [json.loads(resource) for (resource,) in rows]
+
+    def cache_info(self) -> Dict[str, int]:
+        return {"cached_skills": len(self._cache), "max_cached_skills": self._cache_size}
+
+
+def open_sqlite_store(path: Path, cache_size: int = RESOURCE_CACHE_SIZE) -> DataStore:
+    """Open a database written by write_sqlite_store.
+
+    Skills, aliases, dependencies and roles are loaded into memory; resources
+    are paged in on demand (see SqliteResourceMap).
+    """
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"Data store not found: {path}")
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+    lock = threading.Lock()
+
+    taxonomy, learning_hours, resource_skills = [], {}, []
+    for name, in_taxonomy, hours, resource_count in conn.execute(
+        "SELECT name, in_taxonomy, learning_hours, resource_count FROM skills ORDER BY name"
+    ):
+        if in_taxonomy:
+            taxonomy.append(name)
+        if hours is not None:
+            learning_hours[name] = hours
+        if resource_count:
+            resource_skills.append(name)
+
+    dependencies: Dict[str, List[str]] = {}
+    for skill, prereq in conn.execute(
+        "SELECT skill, prerequisite FROM dependencies ORDER BY skill, position"
+    ):
+        dependencies.setdefault(skill, []).append(prereq)
+
+    meta = dict(conn.execute("SELECT key, value FROM meta"))
+    return DataStore(
+        taxonomy,
+        dict(conn.execute("SELECT alias, skill FROM aliases")),
+        dependencies,
+        learning_hours,
+        int(meta.get("default_learning_hours", 20)),
+        {
+            role_id: _decode_role(json.loads(definition))
+            for role_id, definition in conn.execute("SELECT role_id, definition FROM roles ORDER BY position")
+        },
+        SqliteResourceMap(conn, lock, resource_skills, cache_size),
+        source=str(path),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Selection
+# ---------------------------------------------------------------------------
+
+def open_data_store(spec: Optional[str]) -> DataStore:
+    """Open a store from a DATA_STORE value (empty for the built-in definitions)."""
+    if not spec:
+        return builtin_store()
+    name = spec.lower()
+    if name.endswith(SQLITE_SUFFIXES):
+        return open_sqlite_store(Path(spec))
+    if name.endswith(JSON_SUFFIXES):
+        return load_json_store(Path(spec))
+    raise ValueError(
+        f"Unsupported DATA_STORE {spec!r}: expected a {', '.join(SQLITE_SUFFIXES + JSON_SUFFIXES)} file"
+    )
+
+
+_STORE: Optional[DataStore] = None
+_LOCK = threading.Lock()
+
+
+def get_data_store() -> DataStore:
+    """Get the process-wide store selected by the DATA_STORE environment variable."""
+    global _STORE
+    if _STORE is None:
+        with _LOCK:
+            if _STORE is None:
+                _STORE = open_data_store(os.getenv("DATA_STORE"))
+    return _STORE
+
+
+def set_data_store(store: Optional[DataStore]):
+    """Replace the process-wide store (None re-reads DATA_STORE on next use).
+
+    The skill vocabulary is rebuilt from the new store on next use; call this
+    before serving requests, as services cache results derived from it.
+    """
+    global _STORE
+    from data.skill_vocab import reset_skill_vocabulary
+
+    with _LOCK:
+        _STORE = store
+    reset_skill_vocabulary()
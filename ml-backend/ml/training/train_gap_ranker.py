@@ -7,7 +7,6 @@ This model ranks missing skills by learning priority based on:
 - Market demand (simulated)
 """
 
-import random
 import numpy as np
 import pandas as pd
 from pathlib import Path
@@ -68,56 +67,52 @@ SKILL_PREREQS = {
 }
 
 
-def generate_synthetic_ranking_data(n_samples=5000):
+def generate_synthetic_ranking_data(n_samples=5000, seed=42):
     """Generate synthetic data for learning skill priority ranking."""
-    data = []
+    rng = np.random.default_rng(seed)
     skills = list(SKILL_METADATA.keys())
+    metadata = np.array([SKILL_METADATA[s] for s in skills])
+    prereq_counts = np.array([SKILL_PREREQS.get(s, 0) for s in skills])
     
-    for _ in range(n_samples):
-        skill = random.choice(skills)
-        difficulty, market_demand, hours = SKILL_METADATA[skill]
-        prereqs = SKILL_PREREQS.get(skill, 0)
-        
-        # Simulate role context
-        is_core = random.random() > 0.6
-        is_secondary = not is_core and random.random() > 0.5
-        
-        # User context
-        user_experience = random.uniform(0, 10)
-        user_skill_count = random.randint(0, 15)
-        has_prereqs = random.random() > (prereqs * 0.15)  # More prereqs = less likely
-        
-        # Features
-        features = {
-            "difficulty": difficulty,
-            "market_demand": market_demand,
-            "learning_hours": hours,
-            "prereq_count": prereqs,
-            "is_core": int(is_core),
-            "is_secondary": int(is_secondary),
-            "user_experience": user_experience,
-            "user_skill_count": user_skill_count,
-            "has_prereqs": int(has_prereqs),
-        }
-        
-        # Target: priority score (higher = learn first)
-        # Logic: core skills, high demand, low difficulty, has prereqs = higher priority
-        priority = (
-            3.0 * is_core +
-            1.5 * is_secondary +
-            0.5 * market_demand +
-            -0.3 * difficulty +
-            -0.1 * prereqs +
-            0.5 * has_prereqs +
-            0.1 * user_experience +
-            random.gauss(0, 0.5)  # noise
-        )
-        priority = max(0, min(10, priority))  # Clamp to 0-10
-        
-        features["priority_score"] = priority
-        data.append(features)
+    skill_idx = rng.integers(0, len(skills), n_samples)
+    difficulty, market_demand, hours = metadata[skill_idx].T
+    prereqs = prereq_counts[skill_idx]
     
-    return pd.DataFrame(data)
+    # Simulate role context
+    is_core = rng.random(n_samples) > 0.6
+    is_secondary = ~is_core & (rng.random(n_samples) > 0.5)
+    
+    # User context
+    user_experience = rng.uniform(0, 10, n_samples)
+    user_skill_count = rng.integers(0, 16, n_samples)
+    has_prereqs = rng.random(n_samples) > (prereqs * 0.15)  # More prereqs = less likely
+    
+    # Target: priority score (higher = learn first)
+    # Logic: core skills, high demand, low difficulty, has prereqs = higher priority
+    priority = (
+        3.0 * is_core +
+        1.5 * is_secondary +
+        0.5 * market_demand +
+        -0.3 * difficulty +
+        -0.1 * prereqs +
+        0.5 * has_prereqs +
+        0.1 * user_experience +
+        rng.normal(0, 0.5, n_samples)  # noise
+    )
+    priority = np.clip(priority, 0, 10)  # Clamp to 0-10
+    
+    return pd.DataFrame({
+        "difficulty": difficulty,
+        "market_demand": market_demand,
+        "learning_hours": hours,
+        "prereq_count": prereqs,
+        "is_core": is_core.astype(int),
+        "is_secondary": is_secondary.astype(int),
+        "user_experience": user_experience,
+        "user_skill_count": user_skill_count,
+        "has_prereqs": has_prereqs.astype(int),
+        "priority_score": priority,
+    })
 
 
 def train_gap_ranker(output_dir: Path):
@@ -3,23 +3,32 @@ import pandas as pd
 from sklearn.linear_model import LogisticRegression
 from joblib import dump
 from pathlib import Path
-import random
 
 
-def create_synthetic_dataset(n=500):
-    rows = []
+def create_synthetic_dataset(n=500, seed=42):
     possible_skills = ["python", "sql", "pandas", "ml", "aws", "docker", "react", "node"]
-    for i in range(n):
-        role_skills = random.sample(possible_skills, k=random.randint(2, 5))
-        candidate_skills = random.sample(possible_skills, k=random.randint(0, 6))
-        match = len(set(s.lower() for s in candidate_skills).intersection(set(s.lower() for s in role_skills)))
-        match_ratio = match / max(1, len(role_skills))
-        experience = random.uniform(0, 10)
-        # label: higher match+experience -> industry ready
-        score = 0.6 * match_ratio + 0.05 * experience
-        label = 1 if score >= 0.5 else 0
-        rows.append({"match_ratio": match_ratio, "experience": experience, "label": label})
-    return pd.DataFrame(rows)
+    rng = np.random.default_rng(seed)
+    n_skills = len(possible_skills)
+
+    # Random role/candidate skill subsets as boolean masks: a row's subset of size k
+    # is every skill whose random key is <= the row's k-th smallest key
+    def random_subsets(k):
+        keys = rng.random((n, n_skills))
+        kth = np.sort(keys, axis=1)[np.arange(n), np.maximum(k - 1, 0)]
+        return (keys <= kth[:, None]) & (k[:, None] > 0)
+
+    role_k = rng.integers(2, 6, n)
+    candidate_k = rng.integers(0, 7, n)
+    role_mask = random_subsets(role_k)
+    candidate_mask = random_subsets(candidate_k)
+
+    match = (role_mask & candidate_mask).sum(axis=1)
+    match_ratio = match / np.maximum(1, role_k)
+    experience = rng.uniform(0, 10, n)
+    # label: higher match+experience -> industry ready
+    score = 0.6 * match_ratio + 0.05 * experience
+    label = (score >= 0.5).astype(int)
+    return pd.DataFrame({"match_ratio": match_ratio, "experience": experience, "label": label})
 
 
 def train_and_save(path: Path):
@@ -2,9 +2,15 @@
 
 This model recommends learning resources based on skill-resource interactions.
 Uses TruncatedSVD for collaborative filtering.
+
+Besides the serving artifacts, training saves the raw rating sums/counts and
+unnormalized skill factors (recommender_state.joblib) so that
+update_recommender.py can fold new interaction events in incrementally.
 """
 
-import random
+import json
+import os
+import time
 import numpy as np
 import pandas as pd
 from pathlib import Path
@@ -82,42 +88,121 @@ RESOURCES = [
 ]
 
 
-def generate_synthetic_interactions(n_users=500):
-    """Generate synthetic user-resource interaction data."""
-    interactions = []
+def generate_synthetic_interactions(n_users=500, seed=42, chunk_size=250_000):
+    """Generate synthetic user-resource interaction data.
+    
+    Fully vectorized: users are processed in chunks so memory stays bounded
+    for very large sample counts.
+    """
+    rng = np.random.default_rng(seed)
+    n_skills = len(SKILLS)
+    skill_to_idx = {s: i for i, s in enumerate(SKILLS)}
     
-    for user_id in range(n_users):
-        # Each user interacts with 3-15 resources
-        n_interactions = random.randint(3, 15)
+    resource_skill = np.array([skill_to_idx.get(r["skill"], -1) for r in RESOURCES])
+    resource_quality = np.array([r["quality"] for r in RESOURCES])
+    resource_ids = np.array([r["id"] for r in RESOURCES])
+    
+    # Resources grouped by skill: skill s owns by_skill[start[s]:start[s] + count[s]]
+    by_skill = np.argsort(resource_skill, kind="stable")
+    count = np.bincount(resource_skill[resource_skill >= 0], minlength=n_skills)
+    start = np.searchsorted(resource_skill[by_skill], np.arange(n_skills))
+    
+    chunks = []
+    for first_user in range(0, n_users, chunk_size):
+        users = np.arange(first_user, min(first_user + chunk_size, n_users))
+        
+        # Each user interacts with 3-15 resources and prefers 2-6 skills
+        n_interactions = rng.integers(3, 16, len(users))
+        n_preferred = rng.integers(2, 7, len(users))
+        preferred = np.argsort(rng.random((len(users), n_skills), dtype=np.float32), axis=1)[:, :6]
+        
+        row_user = np.repeat(np.arange(len(users)), n_interactions)
+        n_rows = len(row_user)
         
-        # User has skill preferences
-        preferred_skills = random.sample(SKILLS, random.randint(2, 6))
+        # Select resource (biased towards preferred skills)
+        pick = (rng.random(n_rows) * n_preferred[row_user]).astype(np.int64)
+        skill = preferred[row_user, pick]
+        offset = (rng.random(n_rows) * count[skill]).astype(np.int64)
+        resource = by_skill[np.minimum(start[skill] + offset, len(RESOURCES) - 1)]
         
-        for _ in range(n_interactions):
-            # Select resource (biased towards preferred skills)
-            if random.random() > 0.3:
-                # Select from preferred skills
-                skill = random.choice(preferred_skills)
-                matching_resources = [r for r in RESOURCES if r["skill"] == skill]
-                if matching_resources:
-                    resource = random.choice(matching_resources)
-                else:
-                    resource = random.choice(RESOURCES)
-            else:
-                resource = random.choice(RESOURCES)
-            
-            # Rating based on quality + noise
-            rating = resource["quality"] + random.gauss(0, 0.15)
-            rating = max(0.1, min(1.0, rating))  # Clamp
-            
-            interactions.append({
-                "user_id": user_id,
-                "resource_id": resource["id"],
-                "skill": resource["skill"],
-                "rating": rating
-            })
-    
-    return pd.DataFrame(interactions)
+        random_resource = rng.integers(0, len(RESOURCES), n_rows)
+        use_random = (rng.random(n_rows) <= 0.3) | (count[skill] == 0)
+        resource = np.where(use_random, random_resource, resource)
+        
+        # Rating based on quality + noise
+        rating = resource_quality[resource] + rng.normal(0, 0.15, n_rows)
+        rating = np.clip(rating, 0.1, 1.0)  # Clamp
+        
+        chunks.append(pd.DataFrame({
+            "user_id": users[row_user],
+            "resource_id": resource_ids[resource],
+            "skill": pd.Categorical.from_codes(resource_skill[resource], SKILLS),
+            "rating": rating,
+        }))
+    
+    return pd.concat(chunks, ignore_index=True)
+
+
+def build_rating_matrix(sums: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Average ratings per skill-resource pair, with base quality where unrated."""
+    matrix = np.zeros_like(sums)
+    mask = counts > 0
+    matrix[mask] = sums[mask] / counts[mask]
+    
+    # Add base quality scores where we don't have data
+    skill_to_idx = {s: i for i, s in enumerate(SKILLS)}
+    resource_rows = np.array([skill_to_idx.get(r["skill"], -1) for r in RESOURCES])
+    resource_cols = np.array([r["id"] for r in RESOURCES])
+    resource_quality = np.array([r["quality"] for r in RESOURCES])
+    has_skill = resource_rows >= 0
+    rows, cols = resource_rows[has_skill], resource_cols[has_skill]
+    empty = matrix[rows, cols] == 0
+    matrix[rows[empty], cols[empty]] = resource_quality[has_skill][empty]
+    return matrix
+
+
+def _atomic_dump(value, path: Path):
+    tmp = path.with_name(path.name + ".tmp")
+    dump(value, tmp)
+    os.replace(tmp, path)
+
+
+def publish_snapshot(
+    output_dir: Path,
+    svd: TruncatedSVD,
+    skill_factors: np.ndarray,
+    predictions: np.ndarray,
+    state: dict,
+    events_applied: int = 0,
+) -> int:
+    """Atomically write the serving artifacts and bump recommender_version.json.
+    
+    Each file is replaced atomically and the version file is written last,
+    so a server that reloads on a version change never sees a partial update.
+    
+    Returns:
+        The new snapshot version
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    version_path = output_dir / "recommender_version.json"
+    version = 1
+    if version_path.exists():
+        version = json.loads(version_path.read_text()).get("version", 0) + 1
+    
+    _atomic_dump(svd, output_dir / "recommender_svd.joblib")
+    _atomic_dump(normalize(skill_factors, axis=1), output_dir / "recommender_skill_factors.joblib")
+    _atomic_dump(normalize(svd.components_.T, axis=1), output_dir / "recommender_resource_factors.joblib")
+    _atomic_dump(predictions, output_dir / "recommender_predictions.joblib")
+    _atomic_dump(state, output_dir / "recommender_state.joblib")
+    
+    tmp = version_path.with_name(version_path.name + ".tmp")
+    tmp.write_text(json.dumps({
+        "version": version,
+        "published_at": time.time(),
+        "events_applied": events_applied,
+    }))
+    os.replace(tmp, version_path)
+    return version
 
 
 def train_recommender(output_dir: Path):
@@ -133,26 +218,17 @@ def train_recommender(output_dir: Path):
     
     # Build skill-resource rating matrix
     # Average ratings per skill-resource pair
-    skill_resource_matrix = np.zeros((n_skills, n_resources))
-    skill_resource_counts = np.zeros((n_skills, n_resources))
+    rating_sums = np.zeros((n_skills, n_resources))
+    rating_counts = np.zeros((n_skills, n_resources))
     
-    for _, row in df.iterrows():
-        skill_idx = skill_to_idx.get(row["skill"])
-        if skill_idx is not None:
-            resource_idx = row["resource_id"]
-            skill_resource_matrix[skill_idx, resource_idx] += row["rating"]
-            skill_resource_counts[skill_idx, resource_idx] += 1
+    row_skill = df["skill"].map(skill_to_idx).to_numpy(dtype=float)
+    known = ~np.isnan(row_skill)
+    rows = row_skill[known].astype(np.int64)
+    cols = df["resource_id"].to_numpy()[known]
+    np.add.at(rating_sums, (rows, cols), df["rating"].to_numpy()[known])
+    np.add.at(rating_counts, (rows, cols), 1)
     
-    # Average where we have data
-    mask = skill_resource_counts > 0
-    skill_resource_matrix[mask] /= skill_resource_counts[mask]
-    
-    # Add base quality scores where we don't have data
-    for resource in RESOURCES:
-        skill_idx = skill_to_idx.get(resource["skill"])
-        if skill_idx is not None:
-            if skill_resource_matrix[skill_idx, resource["id"]] == 0:
-                skill_resource_matrix[skill_idx, resource["id"]] = resource["quality"]
+    skill_resource_matrix = build_rating_matrix(rating_sums, rating_counts)
     
     print(f"Matrix shape: {skill_resource_matrix.shape}")
     print(f"Non-zero entries: {np.count_nonzero(skill_resource_matrix)}")
@@ -165,11 +241,6 @@ def train_recommender(output_dir: Path):
     
     print(f"Training SVD with {n_components} components...")
     skill_factors = svd.fit_transform(sparse_matrix)
-    resource_factors = svd.components_.T
-    
-    # Normalize factors for cosine similarity
-    skill_factors_normalized = normalize(skill_factors, axis=1)
-    resource_factors_normalized = normalize(resource_factors, axis=1)
     
     # Reconstruct matrix for predictions
     reconstructed = np.dot(skill_factors, svd.components_)
@@ -177,16 +248,19 @@ def train_recommender(output_dir: Path):
     print(f"Explained variance ratio: {svd.explained_variance_ratio_.sum():.3f}")
     
     # Save
-    output_dir.mkdir(parents=True, exist_ok=True)
-    dump(svd, output_dir / "recommender_svd.joblib")
-    dump(skill_factors_normalized, output_dir / "recommender_skill_factors.joblib")
-    dump(resource_factors_normalized, output_dir / "recommender_resource_factors.joblib")
-    dump(reconstructed, output_dir / "recommender_predictions.joblib")
+    state = {
+        "rating_sums": rating_sums,
+        "rating_counts": rating_counts,
+        "ratings": skill_resource_matrix,
+        "skill_factors": skill_factors,
+        "event_offset": 0,  # A full retrain replays the whole event log
+    }
+    version = publish_snapshot(output_dir, svd, skill_factors, reconstructed, state)
     dump(SKILLS, output_dir / "recommender_skills.joblib")
     dump(RESOURCES, output_dir / "recommender_resources.joblib")
     dump(skill_to_idx, output_dir / "recommender_skill_idx.joblib")
     
-    print(f"\nSaved recommender to {output_dir}")
+    print(f"\nSaved recommender to {output_dir} (version {version})")
     
     # Test
     print("\nTesting recommendations for 'python':")
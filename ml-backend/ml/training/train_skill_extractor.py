@@ -2,16 +2,29 @@
 
 This model extracts skills from resume/profile text.
 Uses synthetic data for training.
+
+A streaming mode trains out-of-core from JSONL shards with a stateless
+HashingVectorizer and per-skill SGD logistic models updated via partial_fit,
+so memory stays bounded by the batch size rather than the corpus size:
+
+    python ml/training/train_skill_extractor.py --write-shards data/shards --shards 20
+    python ml/training/train_skill_extractor.py --stream data/shards
 """
 
-import random
+import argparse
+import gzip
+import json
+import sys
+import time
 import numpy as np
 import pandas as pd
 from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
 from joblib import dump
-from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer
 from sklearn.multiclass import OneVsRestClassifier
-from sklearn.linear_model import LogisticRegression
+from sklearn.multioutput import MultiOutputClassifier
+from sklearn.linear_model import LogisticRegression, SGDClassifier
 from sklearn.preprocessing import MultiLabelBinarizer
 
 
@@ -45,38 +58,48 @@ ROLES = [
 ]
 
 
-def generate_synthetic_dataset(n_samples=2000):
-    """Generate synthetic resume snippets with skill labels."""
-    data = []
-    
-    for _ in range(n_samples):
-        # Randomly select skills (1-8 skills per sample)
-        n_skills = random.randint(1, 8)
-        sample_skills = random.sample(SKILLS, n_skills)
-        
-        # Create text
-        template = random.choice(TEMPLATES)
-        role = random.choice(ROLES)
-        years = random.randint(1, 10)
-        skills_text = ", ".join(sample_skills)
-        
-        text = template.format(role=role, years=years, skills=skills_text)
-        
-        # Add some noise/variation
-        if random.random() > 0.5:
+EXTRAS = ["Excellent communication skills.", "Team player.",
+          "Problem solver.", "Self-motivated."]
+
+
+def generate_synthetic_dataset(n_samples=2000, seed=42):
+    """Generate synthetic resume snippets with skill labels.
+    
+    All random choices are drawn as vectorized numpy arrays; only the final
+    string formatting is done per row.
+    """
+    rng = np.random.default_rng(seed)
+    skills = np.array(SKILLS, dtype=object)
+    
+    # Randomly select skills (1-8 skills per sample) in random order:
+    # the first k columns of a per-row random permutation
+    n_skills = rng.integers(1, 9, n_samples)
+    permutations = np.argsort(rng.random((n_samples, len(SKILLS))), axis=1)[:, :8]
+    
+    template_idx = rng.integers(0, len(TEMPLATES), n_samples)
+    role_idx = rng.integers(0, len(ROLES), n_samples)
+    years = rng.integers(1, 11, n_samples)
+    
+    # Add some noise/variation
+    lowercase = rng.random(n_samples) > 0.5
+    extra_idx = np.where(rng.random(n_samples) > 0.7, rng.integers(0, len(EXTRAS), n_samples), -1)
+    
+    texts = []
+    labels = []
+    for i in range(n_samples):
+        sample_skills = list(skills[permutations[i, :n_skills[i]]])
+        text = TEMPLATES[template_idx[i]].format(
+            role=ROLES[role_idx[i]], years=years[i], skills=", ".join(sample_skills)
+        )
+        if lowercase[i]:
             text = text.lower()
-        if random.random() > 0.7:
+        if extra_idx[i] >= 0:
             # Add some extra words
-            extras = ["Excellent communication skills.", "Team player.", 
-                     "Problem solver.", "Self-motivated."]
-            text += " " + random.choice(extras)
-        
-        data.append({
-            "text": text,
-            "skills": sample_skills
-        })
+            text += " " + EXTRAS[extra_idx[i]]
+        texts.append(text)
+        labels.append(sample_skills)
     
-    return pd.DataFrame(data)
+    return pd.DataFrame({"text": texts, "skills": labels})
 
 
 def train_skill_extractor(output_dir: Path):
@@ -126,6 +149,146 @@ def train_skill_extractor(output_dir: Path):
     return vectorizer, classifier, mlb
 
 
+def write_synthetic_shards(
+    shard_dir: Path,
+    n_shards: int = 10,
+    samples_per_shard: int = 100_000,
+    seed: int = 42,
+) -> List[Path]:
+    """Write synthetic labeled resumes as JSONL shards ({"text", "skills"} per line)."""
+    shard_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for i in range(n_shards):
+        df = generate_synthetic_dataset(samples_per_shard, seed=seed + i)
+        path = shard_dir / f"shard-{i:05d}.jsonl"
+        with open(path, "w", encoding="utf-8") as f:
+            for text, skills in zip(df["text"], df["skills"]):
+                f.write(json.dumps({"text": text, "skills": skills}) + "\n")
+        paths.append(path)
+    return paths
+
+
+def iter_shard_batches(
+    shard_dir: Path,
+    batch_size: int = 10_000,
+) -> Iterator[Tuple[List[str], List[List[str]]]]:
+    """Stream (texts, skill labels) batches from *.jsonl / *.jsonl.gz shards."""
+    known = set(SKILLS)
+    texts: List[str] = []
+    labels: List[List[str]] = []
+    shards = sorted(shard_dir.glob("*.jsonl")) + sorted(shard_dir.glob("*.jsonl.gz"))
+    for shard in shards:
+        opener = gzip.open if shard.suffix == ".gz" else open
+        with opener(shard, "rt", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                texts.append(record["text"])
+                labels.append([s for s in record["skills"] if s in known])
+                if len(texts) == batch_size:
+                    yield texts, labels
+                    texts, labels = [], []
+    if texts:
+        yield texts, labels
+
+
+def _peak_rss_mb() -> Optional[float]:
+    """Process memory high-water mark in MB (None where unsupported)."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KB on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def train_skill_extractor_streaming(
+    shard_dir: Path,
+    output_dir: Path,
+    batch_size: int = 10_000,
+    n_features: int = 2 ** 18,
+    epochs: int = 1,
+):
+    """Train the skill extractor out-of-core from JSONL shards.
+    
+    Exports the same three artifacts as train_skill_extractor, so the serving
+    path (vectorizer.transform -> classifier.predict -> mlb.inverse_transform)
+    loads it unchanged.
+    """
+    vectorizer = HashingVectorizer(
+        n_features=n_features,
+        ngram_range=(1, 2),
+        lowercase=True,
+        stop_words='english',
+        alternate_sign=False,
+    )
+    mlb = MultiLabelBinarizer(classes=SKILLS)
+    mlb.fit([SKILLS])
+    
+    # One online logistic model per skill
+    classifier = MultiOutputClassifier(
+        SGDClassifier(loss="log_loss", alpha=1e-6, random_state=42)
+    )
+    classes = [np.array([0, 1])] * len(SKILLS)
+    
+    n_docs = 0
+    start = time.perf_counter()
+    for epoch in range(epochs):
+        for texts, labels in iter_shard_batches(shard_dir, batch_size):
+            X = vectorizer.transform(texts)
+            y = mlb.transform(labels)
+            classifier.partial_fit(X, y, classes=classes)
+            n_docs += len(texts)
+        print(f"Epoch {epoch + 1}/{epochs}: {n_docs} docs")
+    elapsed = time.perf_counter() - start
+    
+    if n_docs == 0:
+        raise ValueError(f"No training data found in {shard_dir}")
+    
+    # Hashed features never seen in training keep zero weight; store sparse
+    for estimator in classifier.estimators_:
+        estimator.sparsify()
+    
+    output_dir.mkdir(parents=True, exist_ok=True)
+    dump(vectorizer, output_dir / "skill_extractor_vectorizer.joblib")
+    dump(classifier, output_dir / "skill_extractor_classifier.joblib")
+    dump(mlb, output_dir / "skill_extractor_mlb.joblib")
+    
+    peak = _peak_rss_mb()
+    print(f"Trained on {n_docs} docs in {elapsed:.1f}s ({n_docs / elapsed:,.0f} docs/sec)")
+    print(f"Peak memory: {peak:.0f} MB" if peak is not None else "Peak memory: n/a")
+    print(f"Saved skill extractor to {output_dir}")
+    
+    # Test
+    test_text = "Python developer with experience in machine learning and docker"
+    y_pred = classifier.predict(vectorizer.transform([test_text]))
+    print(f"Test: '{test_text}'")
+    print(f"Predicted skills: {mlb.inverse_transform(y_pred)[0]}")
+    
+    return vectorizer, classifier, mlb
+
+
 if __name__ == "__main__":
     output_dir = Path(__file__).resolve().parents[1] / "artifacts"
-    train_skill_extractor(output_dir)
+    
+    parser = argparse.ArgumentParser(description="Train the skill extraction model")
+    parser.add_argument("--stream", type=Path, help="Train out-of-core from JSONL shards in this directory")
+    parser.add_argument("--write-shards", type=Path, help="Write synthetic JSONL shards and exit")
+    parser.add_argument("--shards", type=int, default=10)
+    parser.add_argument("--samples-per-shard", type=int, default=100_000)
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--n-features", type=int, default=2 ** 18)
+    parser.add_argument("--epochs", type=int, default=1)
+    args = parser.parse_args()
+    
+    if args.write_shards:
+        paths = write_synthetic_shards(args.write_shards, args.shards, args.samples_per_shard)
+        print(f"Wrote {len(paths)} shards to {args.write_shards}")
+    elif args.stream:
+        train_skill_extractor_streaming(
+            args.stream, output_dir, args.batch_size, args.n_features, args.epochs
+        )
+    else:
+        train_skill_extractor(output_dir)
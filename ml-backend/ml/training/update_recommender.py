@@ -0,0 +1,235 @@
+"""Incrementally update the resource recommender from streamed interaction events.
+
+Consumes new lines of an append-only JSONL event log, one rating per line:
+
+    {"skill": "python", "resource_id": 2, "rating": 0.9, "ts": 1718000000.0}
+
+and folds them into the saved factorization without recomputing the SVD:
+
+1. Touched rating cells are re-averaged from the saved sums/counts.
+2. Resource factors for touched resources get a ridge least-squares (ALS)
+   update against the fixed skill factors.
+3. Skill factors for touched skills are folded in against the updated
+   resource factors.
+4. Only the touched rows and columns of the prediction matrix are recomputed.
+
+The log offset is stored in recommender_state.joblib, which is published
+together with the serving artifacts, so a crashed update is simply re-applied.
+Run periodically (or with --follow) and the API picks up each new snapshot
+via recommender_version.json. A nightly full retrain (train_recommender.py)
+resets the offset and replays the log from the start.
+
+Usage:
+    python ml/training/update_recommender.py [--log events/recommender_interactions.jsonl]
+    python ml/training/update_recommender.py --follow --interval 60
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from joblib import load
+from scipy.sparse import csr_matrix
+from sklearn.decomposition import TruncatedSVD
+
+# Add project root to path
+project_root = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(project_root))
+
+from ml.training.train_recommender import publish_snapshot
+
+DEFAULT_EVENT_LOG = project_root / "events" / "recommender_interactions.jsonl"
+
+
+def append_event(log_path: Path, skill: str, resource_id: int, rating: float):
+    """Append one rating event to the log (for producers and testing)."""
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    line = json.dumps({
+        "skill": skill,
+        "resource_id": resource_id,
+        "rating": rating,
+        "ts": time.time(),
+    })
+    with open(log_path, "a", encoding="utf-8") as f:
+        f.write(line + "\n")
+
+
+def read_new_events(log_path: Path, offset: int) -> Tuple[List[Dict], int, int]:
+    """Read complete event lines written after a byte offset.
+
+    A trailing line without a newline is still being written and is left for
+    the next run. If the log is shorter than the offset it was rotated, and is
+    read from the start.
+
+    Returns:
+        (events, new_offset, malformed_line_count)
+    """
+    if not log_path.exists():
+        return [], offset, 0
+    if log_path.stat().st_size < offset:
+        print(f"Event log shrank below offset {offset}; assuming rotation, reading from start")
+        offset = 0
+
+    with open(log_path, "rb") as f:
+        f.seek(offset)
+        data = f.read()
+    end = data.rfind(b"\n") + 1
+
+    events, malformed = [], 0
+    for line in data[:end].splitlines():
+        if not line.strip():
+            continue
+        try:
+            events.append(json.loads(line))
+        except json.JSONDecodeError:
+            malformed += 1
+    return events, offset + end, malformed
+
+
+def _ridge_solve(factors: np.ndarray, targets: np.ndarray, reg: float) -> np.ndarray:
+    """Solve min ||targets - factors @ x||^2 + reg*||x||^2 for each target column."""
+    gram = factors.T @ factors
+    gram += reg * np.trace(gram) / len(gram) * np.eye(len(gram))
+    return np.linalg.solve(gram, factors.T @ targets).T
+
+
+def apply_events(
+    svd: TruncatedSVD,
+    state: Dict,
+    predictions: np.ndarray,
+    events: List[Dict],
+    skill_idx: Dict[str, int],
+    reg: float = 1e-6,
+) -> Dict[str, int]:
+    """Fold rating events into the factorization in place.
+
+    Args:
+        svd: Trained TruncatedSVD (components_ holds the resource factors)
+        state: Training state from recommender_state.joblib
+        predictions: Serving prediction matrix (skills x resources)
+        events: Parsed events with skill, resource_id and rating
+        skill_idx: Skill name -> row index
+        reg: Ridge regularization, relative to the mean Gram diagonal
+
+    Returns:
+        Counts of applied/skipped events and touched skills/resources
+    """
+    n_resources = predictions.shape[1]
+    rows, cols, ratings = [], [], []
+    skipped = 0
+    for event in events:
+        row = skill_idx.get(str(event.get("skill", "")).lower().strip())
+        col = event.get("resource_id")
+        rating = event.get("rating")
+        if row is None or not isinstance(col, int) or not 0 <= col < n_resources \
+                or not isinstance(rating, (int, float)):
+            skipped += 1
+            continue
+        rows.append(row)
+        cols.append(col)
+        ratings.append(min(max(float(rating), 0.0), 1.0))
+
+    if not rows:
+        return {"applied": 0, "skipped": skipped, "skills": 0, "resources": 0}
+
+    rows, cols = np.array(rows), np.array(cols)
+    sums, counts, ratings_matrix = state["rating_sums"], state["rating_counts"], state["ratings"]
+    np.add.at(sums, (rows, cols), ratings)
+    np.add.at(counts, (rows, cols), 1)
+    ratings_matrix[rows, cols] = sums[rows, cols] / counts[rows, cols]
+
+    touched_skills = np.unique(rows)
+    touched_resources = np.unique(cols)
+    skill_factors = state["skill_factors"]
+    resource_factors = svd.components_.T.copy()
+
+    # ALS half-step for touched resources, then fold-in for touched skills
+    resource_factors[touched_resources] = _ridge_solve(
+        skill_factors, ratings_matrix[:, touched_resources], reg
+    )
+    skill_factors[touched_skills] = _ridge_solve(
+        resource_factors, ratings_matrix[touched_skills].T, reg
+    )
+    svd.components_ = np.ascontiguousarray(resource_factors.T)
+
+    # Only touched rows/columns of the reconstruction change
+    predictions[touched_skills] = skill_factors[touched_skills] @ svd.components_
+    predictions[:, touched_resources] = skill_factors @ svd.components_[:, touched_resources]
+
+    return {
+        "applied": len(rows),
+        "skipped": skipped,
+        "skills": len(touched_skills),
+        "resources": len(touched_resources),
+    }
+
+
+def _observed_rmse(predictions: np.ndarray, ratings: np.ndarray, counts: np.ndarray) -> float:
+    mask = counts > 0
+    return float(np.sqrt(np.mean((predictions[mask] - ratings[mask]) ** 2)))
+
+
+def update_recommender(artifacts_dir: Path, log_path: Path, verify: bool = False) -> Optional[int]:
+    """Apply new events from the log and publish a snapshot.
+
+    Returns:
+        The published version, or None if there was nothing new
+    """
+    state_path = artifacts_dir / "recommender_state.joblib"
+    if not state_path.exists():
+        raise FileNotFoundError(
+            f"{state_path} not found; run train_recommender.py first"
+        )
+    state = load(state_path)
+    events, new_offset, malformed = read_new_events(log_path, state.get("event_offset", 0))
+    if not events:
+        if malformed or new_offset != state.get("event_offset", 0):
+            print(f"No valid events ({malformed} malformed lines)")
+        return None
+
+    start = time.perf_counter()
+    svd = load(artifacts_dir / "recommender_svd.joblib")
+    predictions = load(artifacts_dir / "recommender_predictions.joblib")
+    skill_idx = load(artifacts_dir / "recommender_skill_idx.joblib")
+    stats = apply_events(svd, state, predictions, events, skill_idx)
+    update_seconds = time.perf_counter() - start
+
+    state["event_offset"] = new_offset
+    state["events_applied"] = state.get("events_applied", 0) + stats["applied"]
+    version = publish_snapshot(
+        artifacts_dir, svd, state["skill_factors"], predictions, state,
+        events_applied=state["events_applied"],
+    )
+    print(
+        f"Applied {stats['applied']} events ({stats['skipped']} skipped, {malformed} malformed) "
+        f"touching {stats['skills']} skills / {stats['resources']} resources "
+        f"in {1000 * update_seconds:.1f} ms -> version {version}"
+    )
+
+    if verify:
+        full = TruncatedSVD(n_components=svd.n_components, random_state=42)
+        full_predictions = full.fit_transform(csr_matrix(state["ratings"])) @ full.components_
+        print(
+            f"Observed-cell RMSE: incremental {_observed_rmse(predictions, state['ratings'], state['rating_counts']):.4f}"
+            f" vs full recompute {_observed_rmse(full_predictions, state['ratings'], state['rating_counts']):.4f}"
+        )
+    return version
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Incrementally update the recommender")
+    parser.add_argument("--log", type=Path, default=DEFAULT_EVENT_LOG, help="Append-only JSONL event log")
+    parser.add_argument("--follow", action="store_true", help="Keep polling the log for new events")
+    parser.add_argument("--interval", type=float, default=60.0, help="Seconds between polls with --follow")
+    parser.add_argument("--verify", action="store_true", help="Compare against a full SVD recompute")
+    args = parser.parse_args()
+
+    artifacts_dir = project_root / "ml" / "artifacts"
+    update_recommender(artifacts_dir, args.log, args.verify)
+    while args.follow:
+        time.sleep(args.interval)
+        update_recommender(artifacts_dir, args.log, args.verify)
@@ -0,0 +1,104 @@
+"""Build the precomputed answer table and measure it against a request mix.
+
+Reports the table size and build time, then replays /inference/analyze
+payloads (a JSONL capture of real traffic, or load_test.py's synthetic mix)
+through the analysis service and reports the hit ratio and the latency of
+hits with and without the table. In production the same ratio is
+answer_table_hits_total / analyze_requests_total at GET /metrics.
+
+With --check, every answered request is also computed by the pipeline
+without the table and the responses are compared.
+
+Usage:
+    python scripts/answer_table_report.py --models
+    python scripts/answer_table_report.py --models --input requests.jsonl --check
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from app.core import metrics
+from app.core.startup import load_models_on_startup
+from app.schemas.request import AnalyzeRequest
+from app.services import answer_table
+from app.services.inference_service import run_analysis
+from load_test import RequestMix
+
+
+def read_payloads(args):
+    if args.input:
+        with open(args.input, encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+    mix = RequestMix(seed=args.seed)
+    return [mix.next_payload() for _ in range(args.requests)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--models", action="store_true", help="Load the trained models (gap ranker)")
+    parser.add_argument("--input", type=Path, default=None, help="JSONL of analyze request payloads")
+    parser.add_argument("--requests", type=int, default=5000, help="Synthetic requests without --input")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--check", action="store_true", help="Compare answers with the pipeline's")
+    args = parser.parse_args()
+
+    if args.models:
+        load_models_on_startup(preload=True)
+    payloads = [AnalyzeRequest(**p) for p in read_payloads(args)]
+    # Warm the pipeline's caches before anything is timed
+    for payload in payloads[:200]:
+        run_analysis(payload)
+
+    table = answer_table.build_answer_table()
+    if table is None:
+        sys.exit("The answer table can't be used with this configuration")
+    stats = answer_table.table_stats(table)
+    print(f"Role levels:       {stats['role_levels']}")
+    print(f"Subsets:           {stats['entries']} ({stats['roadmaps']} distinct roadmaps)")
+    if stats["score_cells"]:
+        print(f"Gap scores:        {stats['score_cells']} float32 ({stats['score_bytes'] / 1024:.0f} KB; "
+              f"{stats['experience_buckets']} experience x {stats['skill_count_buckets']} skill-count buckets)")
+    else:
+        print("Gap scores:        none (no gap ranker; dependency-order ranking stored per subset)")
+    print(f"Build time:        {stats['build_seconds']:.2f}s")
+
+    hits = []
+    for payload in payloads:
+        count = metrics.snapshot()["answer_table_hits_total"]
+        run_analysis(payload)
+        if metrics.snapshot()["answer_table_hits_total"] > count:
+            hits.append(payload)
+    role_based = sum(1 for p in payloads if p.role_id and p.level)
+    print(f"Hit ratio:         {len(hits) / len(payloads):.1%} of {len(payloads)} requests "
+          f"({len(hits) / max(role_based, 1):.1%} of role-based ones)")
+    if not hits:
+        return
+
+    start = time.perf_counter()
+    answered = [run_analysis(p) for p in hits]
+    with_table = (time.perf_counter() - start) / len(hits) * 1e6
+
+    answer_table._TABLE.pop("current")
+    start = time.perf_counter()
+    computed = [run_analysis(p) for p in hits]
+    without_table = (time.perf_counter() - start) / len(hits) * 1e6
+    print(f"Hit latency:       {with_table:.0f} us with the table, {without_table:.0f} us without")
+
+    if args.check:
+        differ = sum(
+            json.dumps(a, sort_keys=True) != json.dumps(b, sort_keys=True) for a, b in zip(answered, computed)
+        )
+        print(f"Check:             {len(hits) - differ}/{len(hits)} answers match the pipeline")
+        if differ:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
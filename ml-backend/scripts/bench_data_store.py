@@ -0,0 +1,186 @@
+"""Benchmark data store startup and lookups on a large synthetic catalog.
+
+Generates a catalog (default 50k skills, 1M resources, 500 roles), writes it
+as SQLite and as JSON, then opens each in a fresh process with DATA_STORE set
+and measures startup time (store open + vocabulary build), peak memory, and
+cold/warm resource lookups. The JSON store holds everything in Python dicts,
+as the built-in literals do, so it stands in for the in-memory approach.
+
+Usage:
+    python scripts/bench_data_store.py [--skills 50000] [--resources 1000000] [--workdir /tmp/bench_store]
+"""
+
+import argparse
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import time
+import zlib
+from collections.abc import Mapping
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from data.store import DataStore, write_json_store, write_sqlite_store
+
+
+class SyntheticResources(Mapping):
+    """Deterministic skill -> resources mapping generated on access."""
+
+    def __init__(self, skills, per_skill):
+        self._skills = skills
+        self._per_skill = per_skill
+
+    def __iter__(self):
+        return iter(self._skills)
+
+    def __len__(self):
+        return len(self._skills)
+
+    def __getitem__(self, skill):
+        return [
+            {
+                "type": "course" if i % 3 else "youtube",
+                "title": f"{skill.title()} part {i + 1}",
+                "provider": "Provider %d" % (zlib.crc32(skill.encode()) % 50),
+                "url": f"https://example.com/{skill.replace(' ', '-')}/{i}",
+                "difficulty": ("beginner", "intermediate", "advanced")[i % 3],
+                "duration_hours": 1 + (i * 7) % 40,
+            }
+            for i in range(self._per_skill[skill])
+        ]
+
+
+def synthetic_store(n_skills: int, n_resources: int, n_roles: int, seed: int) -> DataStore:
+    rng = random.Random(seed)
+    skills = [f"skill {i:06d}" for i in range(n_skills)]
+
+    # Skewed resource counts summing to n_resources
+    weights = [rng.paretovariate(1.5) for _ in skills]
+    scale = n_resources / sum(weights)
+    per_skill = {s: int(w * scale) for s, w in zip(skills, weights)}
+    for s in rng.sample(skills, n_resources - sum(per_skill.values())):
+        per_skill[s] += 1
+
+    dependencies = {
+        s: rng.sample(skills[:i], rng.randint(1, 3))
+        for i, s in enumerate(skills) if i > 10 and rng.random() < 0.5
+    }
+    roles = {}
+    for r in range(n_roles):
+        levels = {}
+        for lv, exp in zip(("intern", "junior", "mid", "senior"), ((0, 1), (0, 2), (2, 5), (5, 10))):
+            picked = rng.sample(skills, 20)
+            levels[lv] = {
+                "experience_range": exp,
+                "skills": {"core": picked[:8], "secondary": picked[8:15], "bonus": picked[15:]},
+                "readiness_threshold": 0.7,
+            }
+        roles[f"role_{r:04d}"] = {"title": f"Role {r}", "domain": "Synthetic", "levels": levels}
+
+    return DataStore(
+        skills,
+        {f"alias {i}": rng.choice(skills) for i in range(n_skills // 10)},
+        dependencies,
+        {s: rng.randint(5, 60) for s in skills},
+        20,
+        roles,
+        SyntheticResources([s for s in skills if per_skill[s]], per_skill),
+        source="synthetic",
+    )
+
+
+def measure(path: str, seed: int) -> dict:
+    """Run in a child process with DATA_STORE=path."""
+    start = time.perf_counter()
+    from data.store import get_data_store
+    store = get_data_store()
+    open_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    from data.skill_vocab import get_skill_vocabulary
+    vocab = get_skill_vocabulary()
+    vocab_s = time.perf_counter() - start
+    startup_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    from data.learning_resources import get_resources_for_skill
+    from data.skill_dependencies import get_prerequisites
+    from data.role_definitions import get_role_level
+
+    rng = random.Random(seed)
+    probe = rng.sample(vocab.names, 5000)
+    timings = {}
+    for label in ("cold", "warm"):
+        start = time.perf_counter()
+        for skill in probe:
+            get_resources_for_skill(skill)
+        timings[f"resources_{label}_us"] = (time.perf_counter() - start) / len(probe) * 1e6
+
+    start = time.perf_counter()
+    for skill in probe:
+        get_prerequisites(skill)
+    timings["prerequisites_us"] = (time.perf_counter() - start) / len(probe) * 1e6
+    roles = list(store.roles)
+    start = time.perf_counter()
+    for i in range(5000):
+        get_role_level(roles[i % len(roles)], "mid")
+    timings["role_us"] = (time.perf_counter() - start) / 5000 * 1e6
+
+    return {
+        "open_s": open_s,
+        "vocab_s": vocab_s,
+        "startup_rss_mb": startup_rss,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        **timings,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--skills", type=int, default=50_000)
+    parser.add_argument("--resources", type=int, default=1_000_000)
+    parser.add_argument("--roles", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workdir", type=Path, default=Path("/tmp/bench_store"))
+    parser.add_argument("--measure", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measure(args.measure, args.seed)))
+        return
+
+    args.workdir.mkdir(parents=True, exist_ok=True)
+    paths = {"sqlite": args.workdir / "catalog.db", "json": args.workdir / "catalog.json"}
+    if not all(p.exists() for p in paths.values()):
+        print(f"Generating {args.skills} skills / {args.resources} resources / {args.roles} roles...")
+        store = synthetic_store(args.skills, args.resources, args.roles, args.seed)
+        for fmt, write in (("sqlite", write_sqlite_store), ("json", write_json_store)):
+            start = time.perf_counter()
+            write(store, paths[fmt])
+            print(f"  wrote {paths[fmt]} ({paths[fmt].stat().st_size / 2**20:.0f} MB) "
+                  f"in {time.perf_counter() - start:.1f}s")
+
+    rows = {}
+    for fmt, path in paths.items():
+        env = dict(os.environ, DATA_STORE=str(path))
+        out = subprocess.run(
+            [sys.executable, __file__, "--measure", str(path), "--seed", str(args.seed)],
+            env=env, capture_output=True, text=True, check=True,
+        ).stdout
+        rows[fmt] = json.loads(out.strip().splitlines()[-1])
+
+    print(f"\n{'store':<8}{'open s':>8}{'vocab s':>9}{'RSS MB':>8}"
+          f"{'res cold us':>13}{'res warm us':>13}{'prereq us':>11}{'role us':>9}")
+    for fmt, r in rows.items():
+        print(f"{fmt:<8}{r['open_s']:>8.2f}{r['vocab_s']:>9.2f}{r['peak_rss_mb']:>8.0f}"
+              f"{r['resources_cold_us']:>13.1f}{r['resources_warm_us']:>13.1f}"
+              f"{r['prerequisites_us']:>11.2f}{r['role_us']:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
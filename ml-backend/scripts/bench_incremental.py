@@ -0,0 +1,110 @@
+"""Benchmark incremental session toggles against re-running the full pipeline.
+
+Creates a session per trial (random role level, random starting skills) and
+applies single-skill toggles, timing AnalysisSession.apply_delta against
+run_pipeline on the resulting skill set, checking both give the same
+analysis, and counting toggles that had to call the gap ranker.
+
+Usage:
+    python scripts/bench_incremental.py [--models] [--trials 200] [--toggles 20]
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from app.core import startup
+from app.pipelines import pipeline
+from app.pipelines.pipeline import run_pipeline
+from app.services import incremental_service
+from app.services.incremental_service import create_session
+from data.role_definitions import ROLE_DEFINITIONS
+from data.skill_taxonomy import SKILL_TAXONOMY
+
+COMPARED = ("readiness_score", "skill_analysis", "recommendations", "roadmap")
+
+
+def percentile(values, q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--models", action="store_true", help="Load the trained models (gap ranker etc.)")
+    parser.add_argument("--trials", type=int, default=200, help="Sessions")
+    parser.add_argument("--toggles", type=int, default=20, help="Toggles per session")
+    parser.add_argument("--include", default="full", choices=("score", "analysis", "full"))
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    if args.models:
+        startup.load_models_on_startup(preload=True)
+    rng = random.Random(args.seed)
+    role_levels = [(role_id, level) for role_id, role in ROLE_DEFINITIONS.items() for level in role["levels"]]
+    taxonomy = sorted(SKILL_TAXONOMY)
+
+    # Counts gap-ranker calls (the model is loaded on first use)
+    scorings = [0]
+    get_model = startup.get_model
+
+    def counting_get_model(name):
+        model = get_model(name)
+        if name == "gap_ranker" and model is not None and "predict" not in vars(model):
+            predict = model.predict
+
+            def counted(features):
+                scorings[0] += 1
+                return predict(features)
+
+            model.predict = counted
+        return model
+
+    incremental_service.get_model = pipeline.get_model = counting_get_model
+
+    toggle_us, full_us, mismatches, toggles_scoring = [], [], 0, 0
+    for _ in range(args.trials):
+        role_id, level = rng.choice(role_levels)
+        skills_def = ROLE_DEFINITIONS[role_id]["levels"][level]["skills"]
+        pool = sorted({s.lower() for c in ("core", "secondary", "bonus") for s in skills_def[c]}
+                      | set(rng.sample(taxonomy, 10)))
+        skills = set(rng.sample(pool, rng.randint(0, len(pool) // 2)))
+        years = round(rng.uniform(0, 6), 1)
+        session = create_session(sorted(skills), [], years, role_id=role_id, level=level, include=args.include)
+        session.result()  # the analysis returned with the session handle
+
+        for _ in range(args.toggles):
+            skill = rng.choice(pool)
+            delta = ([], [skill]) if skill in skills else ([skill], [])
+            skills ^= {skill}
+            before = scorings[0]
+            start = time.perf_counter()
+            updated = session.apply_delta(*delta)
+            toggle_us.append((time.perf_counter() - start) * 1e6)
+            toggles_scoring += scorings[0] > before
+
+            start = time.perf_counter()
+            full = run_pipeline(sorted(skills), [], years, role_id=role_id, level=level, include=args.include)
+            full_us.append((time.perf_counter() - start) * 1e6)
+            mismatches += any(updated.get(key) != full.get(key) for key in COMPARED)
+
+    n = len(toggle_us)
+    ranker = "loaded" if startup.is_model_loaded("gap_ranker") else "not loaded"
+    print(f"{n} toggles over {args.trials} sessions, include={args.include}, gap ranker {ranker}")
+    print(f"{'path':<14} | {'mean':>8} | {'p50':>8} | {'p95':>8} | {'p99':>8}")
+    for name, values in (("apply_delta", toggle_us), ("run_pipeline", full_us)):
+        print(f"{name:<14} | {statistics.mean(values):>5.0f} us | {percentile(values, 0.5):>5.0f} us | "
+              f"{percentile(values, 0.95):>5.0f} us | {percentile(values, 0.99):>5.0f} us")
+    print(f"Toggles calling the gap ranker: {toggles_scoring}/{n} ({toggles_scoring / n:.1%})")
+    print(f"Results differing from run_pipeline: {mismatches}/{n}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Benchmark the precomputed skill neighbour graph (app/models/skill_neighbour_graph.py).
+
+Builds the graph over N synthetic clustered embeddings (or the
+skill_embeddings.joblib artifact with --artifact) and reports build time,
+peak memory of the build, graph size, and the time to match a skill against
+a candidate's skills from the graph versus computing similarities per
+request. Matches are checked against a brute-force scan for a sample of
+queries.
+
+Usage:
+    python scripts/bench_neighbour_graph.py [--skills 50000] [--artifact]
+"""
+
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from app.core.config import ARTIFACTS_DIR
+from app.models.skill_neighbour_graph import SIMILARITY_THRESHOLD, SkillNeighbourGraph
+
+
+def synthetic_embeddings(n: int, dim: int, seed: int):
+    """Skills in clusters of ~8 near-synonyms (cosine ~0.9 within a cluster)."""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(max(1, n // 8), dim)).astype(np.float32)
+    vectors = centers[rng.integers(0, len(centers), n)] + rng.normal(scale=0.25, size=(n, dim)).astype(np.float32)
+    return {f"skill_{i}": vectors[i] for i in range(n)}
+
+
+def brute_force(embeddings, skill, candidates, threshold):
+    """Previous matching: cosine similarity against every candidate."""
+    e1 = embeddings[skill]
+    best, best_score = None, threshold
+    for candidate in candidates:
+        e2 = embeddings[candidate]
+        score = np.dot(e1, e2) / (np.linalg.norm(e1) * np.linalg.norm(e2) + 1e-8)
+        if score > best_score:
+            best, best_score = candidate, score
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--skills", type=int, default=50000, help="Synthetic skills")
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--artifact", action="store_true", help="Use ml/artifacts/skill_embeddings.joblib")
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    if args.artifact:
+        from joblib import load
+        embeddings = load(ARTIFACTS_DIR / "skill_embeddings.joblib")
+    else:
+        embeddings = synthetic_embeddings(args.skills, args.dim, args.seed)
+    names = list(embeddings)
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    graph = SkillNeighbourGraph(embeddings)
+    build = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    stats = graph.stats()
+    dense_gb = len(names) ** 2 * 4 / 1e9
+    print(f"Skills:            {stats['skills']}")
+    print(f"Build:             {build:.2f}s, peak {peak / 1e6:.0f} MB (dense N x N: {dense_gb:.1f} GB)")
+    print(f"Graph:             {stats['edges']} edges, {stats['bytes'] / 1e6:.1f} MB, max degree "
+          f"{stats['max_degree']}, {stats['truncated']} lists cut at {graph.k}")
+
+    rng = random.Random(args.seed)
+    queries = []
+    for _ in range(args.queries):
+        skill = rng.choice(names)
+        # A candidate: one of the skill's neighbours (if any) among unrelated skills
+        candidates = set(rng.sample(names, 15))
+        neighbours = graph.neighbours(skill)
+        if neighbours and rng.random() < 0.5:
+            candidates.add(rng.choice(neighbours)[0])
+        candidates.discard(skill)
+        queries.append((skill, candidates))
+
+    start = time.perf_counter()
+    from_graph = [graph.best_match(s, c, SIMILARITY_THRESHOLD)[0] for s, c in queries]
+    graph_us = (time.perf_counter() - start) / len(queries) * 1e6
+    start = time.perf_counter()
+    scanned = [brute_force(embeddings, s, c, SIMILARITY_THRESHOLD) for s, c in queries]
+    scan_us = (time.perf_counter() - start) / len(queries) * 1e6
+    differ = sum(a != b for a, b in zip(from_graph, scanned))
+    matched = sum(a is not None for a in from_graph)
+    print(f"Match (16 cands):  {graph_us:.1f} us from the graph, {scan_us:.1f} us computing similarities")
+    print(f"Check:             {len(queries) - differ}/{len(queries)} agree with the scan ({matched} matched)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""Benchmark MODEL_PRECISION serving formats (app/core/quantization.py).
+
+For each precision (full, float16, int8) reports the memory of the skill
+embeddings and recommender matrices, the latency of a skill's top-k
+resources, of folding in a user profile and of semantic skill matching, and
+agreement with full precision: match decisions of
+SkillAnalyzer._find_best_match and top-k overlap of per-skill and
+personalized recommendations.
+
+Uses synthetic matrices of the given size (a low-rank predictions matrix, as
+the SVD recommender produces, and clustered embeddings), or the trained
+recommender with --models.
+
+Usage:
+    python scripts/bench_precision.py [--models] [--skills 2000] [--resources 20000]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from app.core import config, startup
+from app.core.config import ARTIFACTS_DIR
+from app.core.quantization import PRECISIONS, matrix_nbytes, quantize_embeddings, quantize_matrix
+from app.pipelines.pipeline import SkillAnalyzer
+
+
+def synthetic_recommender(skills: int, resources: int, latent: int, rng):
+    components = np.linalg.qr(rng.normal(size=(resources, latent)))[0].T  # orthonormal rows
+    user = rng.gamma(1.0, 1.0, size=(skills, latent)) * np.sqrt(resources) / latent
+    return np.clip(user @ components, 0, None), components
+
+
+def trained_recommender():
+    from joblib import load
+    predictions = load(ARTIFACTS_DIR / "recommender_predictions.joblib")
+    components = load(ARTIFACTS_DIR / "recommender_svd.joblib").components_
+    return predictions, components
+
+
+def synthetic_embeddings(n: int, dim: int, rng):
+    """Skills in clusters of ~8 near-synonyms (cosine ~0.9 within a cluster)."""
+    centers = rng.normal(size=(max(1, n // 8), dim)).astype(np.float32)
+    vectors = centers[rng.integers(0, len(centers), n)] + rng.normal(scale=0.25, size=(n, dim)).astype(np.float32)
+    return {f"skill_{i}": vectors[i] for i in range(n)}
+
+
+def top_k(row, k):
+    """Top-k resources with a positive score (the ones recommendations show)."""
+    top = np.argsort(row)[::-1][:k]
+    return set(top[row[top] > 0].tolist())
+
+
+def overlap(a, b) -> float:
+    return len(a & b) / max(len(a), len(b)) if a or b else 1.0
+
+
+def timed_us(fn, items) -> float:
+    start = time.perf_counter()
+    for item in items:
+        fn(item)
+    return (time.perf_counter() - start) / len(items) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--models", action="store_true", help="Use the trained recommender")
+    parser.add_argument("--skills", type=int, default=2000, help="Synthetic recommender skills")
+    parser.add_argument("--resources", type=int, default=20000, help="Synthetic recommender resources")
+    parser.add_argument("--latent", type=int, default=32, help="Synthetic SVD components")
+    parser.add_argument("--embedded", type=int, default=5000, help="Synthetic embedded skills")
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--k", type=int, default=5, help="Recommendations compared per skill")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    predictions, components = (
+        trained_recommender() if args.models else synthetic_recommender(args.skills, args.resources, args.latent, rng)
+    )
+    embeddings = synthetic_embeddings(args.embedded, args.dim, rng)
+    names = list(embeddings)
+    print(f"Recommender: {predictions.shape[0]} skills x {predictions.shape[1]} resources, "
+          f"{components.shape[0]} components; embeddings: {len(names)} x {args.dim}")
+
+    pick = random.Random(args.seed)
+    skill_rows = [pick.randrange(len(predictions)) for _ in range(500)]
+    held_rows = [pick.sample(range(len(predictions)), min(3, len(predictions))) for _ in range(200)]
+    queries = [(pick.choice(names), set(pick.sample(names, 15))) for _ in range(2000)]
+
+    # Projections of synthetic skill names are meaningless (and slow to fit)
+    config.OOV_SKILL_EMBEDDINGS = False
+    reference = {}
+    print(f"{'precision':<9} | {'embeddings':>10} | {'predictions':>11} | {'components':>10} | "
+          f"{'top-k':>7} | {'profile':>8} | {'match':>7} | {'match agree':>11} | "
+          f"{'top-k overlap':>13} | {'profile overlap':>15}")
+    for precision in PRECISIONS:
+        served = quantize_embeddings(embeddings, precision)
+        p = quantize_matrix(predictions, precision)
+        c = quantize_matrix(components, precision)
+
+        def recommend(i):
+            return top_k(p[i], args.k)
+
+        def profile(rows):
+            vector = c @ p[rows].mean(axis=0)
+            return top_k(vector @ c, args.k)
+
+        startup._MODELS["skill_embeddings"] = served
+        analyzer = SkillAnalyzer()
+
+        def match(query):
+            return analyzer._find_best_match(*query)
+
+        topk_us = timed_us(recommend, skill_rows)
+        profile_us = timed_us(profile, held_rows)
+        match_us = timed_us(match, queries)
+        result = {
+            "top": [recommend(i) for i in skill_rows],
+            "profile": [profile(rows) for rows in held_rows],
+            "match": [match(q) for q in queries],
+        }
+        reference.setdefault("full", result)
+        full = reference["full"]
+        agree = np.mean([a == b for a, b in zip(result["match"], full["match"])])
+        top_overlap = np.mean([overlap(a, b) for a, b in zip(result["top"], full["top"])])
+        profile_overlap = np.mean([overlap(a, b) for a, b in zip(result["profile"], full["profile"])])
+        print(f"{precision:<9} | {matrix_nbytes(served) / 1e6:>7.1f} MB | {matrix_nbytes(p) / 1e6:>8.1f} MB | "
+              f"{matrix_nbytes(c) / 1e6:>7.2f} MB | {topk_us:>4.0f} us | {profile_us:>5.0f} us | "
+              f"{match_us:>4.1f} us | {agree:>11.2%} | {top_overlap:>13.2%} | {profile_overlap:>15.2%}")
+    startup._MODELS.pop("skill_embeddings", None)
+
+
+if __name__ == "__main__":
+    main()
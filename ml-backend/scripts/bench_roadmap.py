@@ -0,0 +1,165 @@
+"""Benchmark roadmap packing: precedence-constrained scheduler vs legacy greedy.
+
+Compares plan quality (weeks used vs requested, heaviest week, imbalance,
+gap to the brute-force optimum on small inputs) and runtime on:
+- random missing-skill sets drawn from SKILL_DEPENDENCIES (4-week plans)
+- synthetic dependency graphs with hundreds of skills
+
+Usage:
+    python scripts/bench_roadmap.py [--trials 300] [--seed 7]
+"""
+
+import argparse
+import itertools
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Set
+
+# Add project root to path
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from data.skill_dependencies import (
+    SKILL_DEPENDENCIES,
+    _prerequisite_closure,
+    get_learning_hours,
+    schedule_skills,
+    topological_sort,
+)
+
+
+def legacy_greedy(order: List[str], hours: Dict[str, int], weeks: int) -> List[List[str]]:
+    """The previous roadmap builder: fill weeks in order up to 1.3x the average."""
+    total = sum(hours[s] for s in order)
+    per_week = total / weeks if weeks > 0 else total
+    plan, week, load = [], [], 0
+    for skill in order:
+        if load + hours[skill] > per_week * 1.3 and week:
+            plan.append(week)
+            week, load = [], 0
+        week.append(skill)
+        load += hours[skill]
+    if week:
+        plan.append(week)
+    return plan
+
+
+def optimal_max_load(order, hours, prereqs, weeks) -> int:
+    """Brute-force smallest heaviest week (small inputs only)."""
+    best = sum(hours.values())
+    for assignment in itertools.product(range(weeks), repeat=len(order)):
+        week_of = dict(zip(order, assignment))
+        if any(week_of[p] > week_of[s] for s in order for p in prereqs[s]):
+            continue
+        loads = [0] * weeks
+        for skill, w in week_of.items():
+            loads[w] += hours[skill]
+        best = min(best, max(loads))
+    return best
+
+
+def plan_stats(plan: List[List[str]], hours: Dict[str, int], weeks: int) -> Dict[str, float]:
+    loads = [sum(hours[s] for s in week) for week in plan]
+    mean = sum(loads) / len(loads)
+    return {
+        "weeks_used": len(plan),
+        "over_budget": int(len(plan) > weeks),
+        "max_week": max(loads),
+        "imbalance": max(loads) / mean,
+    }
+
+
+def check_precedence(plan: List[List[str]], prereqs: Dict[str, Set[str]]) -> bool:
+    """Prerequisites must be in an earlier week or earlier in the same week."""
+    seen = set()
+    for week in plan:
+        for skill in week:
+            if not prereqs[skill] <= seen:
+                return False
+            seen.add(skill)
+    return True
+
+
+def run(
+    name: str,
+    cases,
+    weeks: int,
+    planners: Dict[str, Callable],
+    with_optimum: bool = False,
+):
+    print(f"\n{name} ({len(cases)} cases, {weeks} weeks)")
+    print(f"  {'planner':<10} {'weeks':>6} {'over%':>6} {'max wk':>8} {'imbal':>6} "
+          f"{'gap%':>6} {'ms/plan':>8}")
+    optima = None
+    if with_optimum:
+        optima = [optimal_max_load(order, hours, prereqs, weeks) for order, hours, prereqs in cases]
+
+    for label, planner in planners.items():
+        stats, gaps, elapsed = [], [], 0.0
+        for i, (order, hours, prereqs) in enumerate(cases):
+            start = time.perf_counter()
+            plan = planner(order, hours, prereqs, weeks)
+            elapsed += time.perf_counter() - start
+            assert check_precedence(plan, prereqs) or label == "legacy"
+            s = plan_stats(plan, hours, weeks)
+            stats.append(s)
+            if optima is not None and s["weeks_used"] <= weeks:
+                gaps.append(s["max_week"] / optima[i] - 1)
+
+        def avg(key):
+            return statistics.mean(s[key] for s in stats)
+
+        gap = f"{100 * statistics.mean(gaps):6.1f}" if gaps else "   n/a"
+        print(f"  {label:<10} {avg('weeks_used'):6.2f} {100 * avg('over_budget'):6.1f} "
+              f"{avg('max_week'):8.1f} {avg('imbalance'):6.2f} {gap} "
+              f"{1000 * elapsed / len(cases):8.3f}")
+
+
+def real_cases(rng: random.Random, trials: int, lo: int, hi: int):
+    universe = sorted(SKILL_DEPENDENCIES)
+    cases = []
+    for _ in range(trials):
+        skills = rng.sample(universe, rng.randint(lo, hi))
+        order = topological_sort(skills)
+        hours = {s: get_learning_hours(s) for s in order}
+        cases.append((order, hours, _prerequisite_closure(order, SKILL_DEPENDENCIES)))
+    return cases
+
+
+def synthetic_cases(rng: random.Random, n_skills: int, trials: int):
+    cases = []
+    for _ in range(trials):
+        order = [f"skill_{i}" for i in range(n_skills)]
+        deps = {
+            s: rng.sample(order[:i], min(i, rng.choice([0, 0, 1, 1, 2, 3])))
+            for i, s in enumerate(order)
+        }
+        hours = {s: rng.randint(5, 60) for s in order}
+        cases.append((order, hours, _prerequisite_closure(order, deps)))
+    return cases
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--trials", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    planners = {
+        "legacy": lambda order, hours, prereqs, weeks: legacy_greedy(order, hours, weeks),
+        "scheduler": lambda order, hours, prereqs, weeks: schedule_skills(order, hours, prereqs, weeks),
+    }
+
+    run("Small skill sets vs brute-force optimum", real_cases(rng, 60, 4, 7), 3, planners,
+        with_optimum=True)
+    run("Missing-skill sets (5-15 skills)", real_cases(rng, args.trials, 5, 15), 4, planners)
+    for n in (100, 300, 1000):
+        run(f"Synthetic DAG, {n} skills", synthetic_cases(rng, n, 10), 12, planners)
+
+
+if __name__ == "__main__":
+    main()
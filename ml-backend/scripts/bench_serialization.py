@@ -0,0 +1,105 @@
+"""Benchmark response serialization for /inference/analyze.
+
+Builds a response with 15 missing skills and compares the previous path
+(recommendation blocks rebuilt per request, FastAPI's jsonable_encoder and
+stdlib JSONResponse) with the current one (cached pre-serialized blocks
+spliced by FastJSONResponse) and with response_format="compact" (resource
+IDs from /catalog/resources), reporting bytes and the serialization share of
+latency.
+
+Usage:
+    python scripts/bench_serialization.py [--models] [--repeat 2000]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.core import serialization
+from app.core.serialization import FastJSONResponse
+from app.core.startup import get_model, load_models_on_startup
+from app.pipelines.pipeline import run_pipeline
+from app.services import recommendation_service
+from data.learning_resources import LEARNING_RESOURCES
+
+
+def timed(fn, repeat: int) -> float:
+    """Mean microseconds per call."""
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--models", action="store_true", help="Load the trained models (ML recommender)")
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    if args.models:
+        load_models_on_startup(preload=True)
+    recommender = get_model("recommender")
+    pool = sorted(recommender["skill_idx"]) if recommender else sorted(LEARNING_RESOURCES)
+    role_skills = pool[:15]
+
+    def pipeline():
+        return run_pipeline([], role_skills, 2.0)
+
+    def compact_pipeline():
+        return run_pipeline([], role_skills, 2.0, response_format="compact")
+
+    result = pipeline()
+    assert len(result["missing_skills"]) == 15
+    legacy_body = JSONResponse(jsonable_encoder(result)).body
+    assert json.loads(FastJSONResponse(result).body) == json.loads(legacy_body)
+
+    cached_block = recommendation_service._static_block
+    recommendation_service._static_block = lambda skill, n, use_ml: recommendation_service._build_block(
+        skill, n, use_ml
+    )
+    try:
+        uncached_us = timed(pipeline, args.repeat)
+    finally:
+        recommendation_service._static_block = cached_block
+    cached_us = timed(pipeline, args.repeat)
+    compact = compact_pipeline()
+    compact_us = timed(compact_pipeline, args.repeat)
+
+    def recommendation_bytes(response):
+        return len(FastJSONResponse(response["recommendations"]).body)
+
+    rows = [("jsonable_encoder + json (before)", result, uncached_us, timed(
+        lambda: JSONResponse(jsonable_encoder(result)), args.repeat))]
+    encoder = serialization.orjson
+    for label in (["orjson"] if encoder is not None else []) + ["stdlib json"]:
+        serialization.orjson = encoder if label == "orjson" else None
+        try:
+            rows.append((f"FastJSONResponse, {label}", result, cached_us, timed(
+                lambda: FastJSONResponse(result), args.repeat)))
+            rows.append((f"  compact, {label}", compact, compact_us, timed(
+                lambda: FastJSONResponse(compact), args.repeat)))
+        finally:
+            serialization.orjson = encoder
+
+    print(f"15 missing skills, {'ML recommender' if recommender else 'curated resources'}")
+    print(f"{'path':<34}{'bytes':>7}{'recs bytes':>11}{'pipeline us':>12}{'encode us':>11}"
+          f"{'total us':>10}{'encode share':>14}")
+    for label, response, pipeline_us, encode_us in rows:
+        total = pipeline_us + encode_us
+        print(f"{label:<34}{len(FastJSONResponse(response).body):>7}{recommendation_bytes(response):>11}"
+              f"{pipeline_us:>12.0f}{encode_us:>11.1f}{total:>10.0f}{encode_us / total:>14.0%}")
+
+
+if __name__ == "__main__":
+    main()
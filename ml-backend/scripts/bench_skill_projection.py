@@ -0,0 +1,133 @@
+"""Benchmark embeddings of unknown skills (app/models/skill_projection_model.py).
+
+Reports the time to fit the projection, the latency per unknown skill
+(first projection and cached), and matching a role's skills against
+candidates with unknown skills, one similarity at a time (as before) and
+vectorized (SkillAnalyzer._find_best_match). Uses ml/artifacts/skill_embeddings.joblib, or random embeddings
+of the same shape with --synthetic (latency doesn't depend on the values).
+
+Usage:
+    python scripts/bench_skill_projection.py [--synthetic] [--skills 1000]
+"""
+
+import argparse
+import random
+import string
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from app.core import startup
+from app.core.config import ARTIFACTS_DIR
+from app.models.skill_projection_model import SkillProjectionModel, get_skill_projection
+from app.pipelines.pipeline import SkillAnalyzer
+from app.services.role_intelligence import get_role_intelligence
+from data.skill_vocab import get_skill_vocabulary
+from data.store import get_data_store
+
+SUFFIXES = ["", "s", " developer", " framework", " cluster", " 2", "js", " basics"]
+
+
+def load_embeddings(synthetic: bool):
+    path = ARTIFACTS_DIR / "skill_embeddings.joblib"
+    if not synthetic and path.exists():
+        from joblib import load
+        return load(path)
+    rng = np.random.default_rng(0)
+    return {name: rng.normal(size=384).astype(np.float32) for name in get_skill_vocabulary().names}
+
+
+def unknown_skills(names, n: int, rng: random.Random):
+    """Variants of known skills (suffixes, transpositions), and random words."""
+    variants = set()
+    for _ in range(n * 10):
+        name = rng.choice(names)
+        if rng.random() < 0.5 and len(name) > 4:
+            i = rng.randrange(len(name) - 1)
+            name = name[:i] + name[i + 1] + name[i] + name[i + 2:]
+        variants.add(name + rng.choice(SUFFIXES))
+        if len(variants) >= n:
+            break
+    words = ["".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 10))) for _ in range(n // 4)]
+    return [s for s in variants if s not in names], words
+
+
+def per_call_us(fn, items, repeat: int = 1) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for item in items:
+            fn(item)
+    return (time.perf_counter() - start) / (repeat * len(items)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--synthetic", action="store_true", help="Random embeddings instead of the artifact")
+    parser.add_argument("--skills", type=int, default=1000, help="Variants of known skills to embed")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    embeddings = load_embeddings(args.synthetic)
+    names = list(embeddings)
+    dim = len(next(iter(embeddings.values())))
+    start = time.perf_counter()
+    model = SkillProjectionModel(embeddings, get_data_store().aliases)
+    fit_ms = (time.perf_counter() - start) * 1000
+    print(f"Embeddings:        {len(names)} skills x {dim} dims ({'synthetic' if args.synthetic else 'artifact'})")
+    print(f"Fit:               {model.training_size} training skills in {fit_ms:.1f} ms "
+          f"({model.weights.nbytes / 1024:.0f} KB map)")
+
+    rng = random.Random(args.seed)
+    variants, words = unknown_skills(names, args.skills, rng)
+    skills = variants + words
+    first = per_call_us(model.embed, skills)
+    cached = per_call_us(model.embed, skills, repeat=5)
+    print(f"Unknown skills:    {sum(model.embed(s) is not None for s in variants)}/{len(variants)} variants "
+          f"of known skills and {sum(model.embed(s) is not None for s in words)}/{len(words)} random words embedded")
+    print(f"Per unknown skill: {first:.1f} us first time, {cached:.2f} us cached")
+    print(f"Nearest skill:     {per_call_us(model.nearest, skills):.1f} us (cached projection, {len(names)} skills)")
+
+    # Role matching: role skills against candidates holding unknown skills
+    startup._MODELS["skill_embeddings"] = embeddings
+    projection = get_skill_projection(embeddings)
+    role_intel = get_role_intelligence("backend_developer", "mid")
+    candidate_sets = [
+        set(rng.sample(skills, 8) + rng.sample(names, 4)) for _ in range(200)
+    ]
+    vocab = get_skill_vocabulary()
+    role_skills = [vocab.names[i] for ids in vocab.role_skill_ids(role_intel.role_id, role_intel.level) for i in ids]
+
+    def pairwise(analyzer, skill, candidate_set, threshold=0.85):
+        # Previous _find_best_match: one similarity per candidate
+        best_match, best_score = None, threshold
+        for candidate in candidate_set:
+            score = analyzer._compute_semantic_similarity(skill, candidate)
+            if score > best_score:
+                best_match, best_score = candidate, score
+        return best_match
+
+    def timed(match):
+        start = time.perf_counter()
+        for candidate_set in candidate_sets:
+            analyzer = SkillAnalyzer(role_intel)
+            for skill in role_skills:
+                match(analyzer, skill, candidate_set)
+        return (time.perf_counter() - start) / len(candidate_sets) * 1e6
+
+    for candidate_set in candidate_sets:  # warm the projection cache
+        for candidate in candidate_set:
+            projection.embed(candidate)
+    loop = timed(pairwise)
+    vectorized = timed(lambda analyzer, skill, candidates: analyzer._find_best_match(skill, candidates))
+    print(f"Role matching:     {len(role_skills)} role skills x 12 candidates: "
+          f"{loop:.0f} us pairwise, {vectorized:.0f} us vectorized per analysis")
+
+
+if __name__ == "__main__":
+    main()
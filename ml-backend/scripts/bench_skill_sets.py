@@ -0,0 +1,131 @@
+"""Benchmark bitset skill sets against the previous set/list matching logic.
+
+Compares per-request operations (compute_skill_match, detect_missing_skills,
+weighted role coverage) and cohort scoring of N candidates against every
+role level, checking that both give the same answers.
+
+Usage:
+    python scripts/bench_skill_sets.py [--candidates 20000] [--seed 42]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from app.pipelines.pipeline import compute_skill_match, detect_missing_skills
+from data.role_definitions import ROLE_DEFINITIONS, SKILL_WEIGHTS
+from data.skill_bitset import SkillSet, batch_role_coverage, pack_skill_sets, role_masks
+from data.skill_taxonomy import SKILL_TAXONOMY
+from data.skill_vocab import get_skill_vocabulary
+
+
+def legacy_skill_match(candidate_skills: List[str], role_skills: List[str]) -> float:
+    candidate_set = set(s.lower().strip() for s in candidate_skills)
+    role_set = set(s.lower().strip() for s in role_skills)
+    return len(candidate_set.intersection(role_set)) / max(1, len(role_set))
+
+
+def legacy_missing(candidate_skills: List[str], role_skills: List[str]) -> List[str]:
+    candidate_set = set(s.lower().strip() for s in candidate_skills)
+    return [s for s in role_skills if s.lower().strip() not in candidate_set]
+
+
+def legacy_weighted(candidate_skills: List[str], level_def: Dict) -> float:
+    """Previous SkillAnalyzer weighted score (list scans per category)."""
+    candidate_set = set(s.lower().strip() for s in candidate_skills)
+    skills = level_def["skills"]
+    core = [s.lower() for s in skills["core"]]
+    secondary = [s.lower() for s in skills["secondary"]]
+    bonus = [s.lower() for s in skills["bonus"]]
+    matched_core = [s for s in core if s in candidate_set]
+    matched_secondary = [s for s in secondary if s in candidate_set]
+    matched_bonus = [s for s in bonus if s in candidate_set]
+    total = (len(core) * SKILL_WEIGHTS["core"] + len(secondary) * SKILL_WEIGHTS["secondary"]
+             + len(bonus) * SKILL_WEIGHTS["bonus"])
+    matched = (len(matched_core) * SKILL_WEIGHTS["core"]
+               + len(matched_secondary) * SKILL_WEIGHTS["secondary"]
+               + len(matched_bonus) * SKILL_WEIGHTS["bonus"])
+    return matched / total if total > 0 else 0
+
+
+def bitset_weighted(candidates: SkillSet, masks) -> float:
+    counts = [(candidates.bits & m.bits).bit_count() for m in masks]
+    totals = [m.bits.bit_count() for m in masks]
+    weights = [SKILL_WEIGHTS["core"], SKILL_WEIGHTS["secondary"], SKILL_WEIGHTS["bonus"]]
+    total = sum(t * w for t, w in zip(totals, weights))
+    return sum(c * w for c, w in zip(counts, weights)) / total if total > 0 else 0
+
+
+def timed(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--candidates", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    universe = sorted(SKILL_TAXONOMY)
+    vocab = get_skill_vocabulary()
+    cohort = [rng.sample(universe, rng.randint(0, 20)) for _ in range(args.candidates)]
+    role_keys = [(r, lv) for r, d in ROLE_DEFINITIONS.items() for lv in d["levels"]]
+    level_defs = [ROLE_DEFINITIONS[r]["levels"][lv] for r, lv in role_keys]
+
+    candidate = cohort[0] + ["python", "docker"]
+    role = ROLE_DEFINITIONS["backend_developer"]["levels"]["mid"]["skills"]
+    role_skills = role["core"] + role["secondary"] + role["bonus"]
+
+    print(f"Per-request operations ({len(candidate)} candidate skills, {len(role_skills)} role skills)")
+    print(f"  {'operation':<28} {'sets/lists':>12} {'bitset':>10}")
+    rows = [
+        ("compute_skill_match",
+         lambda: legacy_skill_match(candidate, role_skills),
+         lambda: compute_skill_match(candidate, role_skills)),
+        ("detect_missing_skills",
+         lambda: legacy_missing(candidate, role_skills),
+         lambda: detect_missing_skills(candidate, role_skills)),
+        ("weighted role score",
+         lambda: legacy_weighted(candidate, ROLE_DEFINITIONS["backend_developer"]["levels"]["mid"]),
+         lambda: bitset_weighted(SkillSet.from_skills(candidate, vocab),
+                                 role_masks("backend_developer", "mid", vocab))),
+    ]
+    for name, legacy, bitset in rows:
+        print(f"  {name:<28} {timed(legacy, 20000):10.2f}us {timed(bitset, 20000):8.2f}us")
+
+    assert legacy_skill_match(candidate, role_skills) == compute_skill_match(candidate, role_skills)
+    assert legacy_missing(candidate, role_skills) == [m["skill"] for m in detect_missing_skills(candidate, role_skills)]
+
+    print(f"\nCohort scoring: {len(cohort)} candidates x {len(role_keys)} role levels")
+    start = time.perf_counter()
+    legacy = np.array([[legacy_weighted(c, d) for d in level_defs] for c in cohort])
+    legacy_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    packed = pack_skill_sets(cohort, vocab)
+    pack_s = time.perf_counter() - start
+    start = time.perf_counter()
+    batched = batch_role_coverage(packed, role_keys, vocab)["weighted_score"]
+    batch_s = time.perf_counter() - start
+
+    assert np.allclose(legacy, batched), "batched scores differ from per-candidate scores"
+    print(f"  sets/lists loop    {legacy_s * 1000:9.1f} ms")
+    print(f"  bitset batch       {batch_s * 1000:9.1f} ms (+ {pack_s * 1000:.1f} ms packing)")
+    print(f"  speedup            {legacy_s / batch_s:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
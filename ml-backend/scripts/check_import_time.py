@@ -0,0 +1,113 @@
+"""Import-time regression check and cold-start timing for the API.
+
+Imports app.api.main in fresh interpreters under `python -X importtime`,
+fails if the import takes longer than the budget or pulls in a heavyweight
+library (numpy, joblib, sklearn, ...), and lists the slowest modules.
+With --first-response it also times a cold worker from process start to its
+first /health and first /inference/analyze responses.
+
+Usage:
+    python scripts/check_import_time.py [--budget-ms 300] [--runs 5] [--first-response]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+# Libraries that must not be imported by `import app.api.main`
+HEAVY_MODULES = ("numpy", "joblib", "sklearn", "xgboost", "pandas", "scipy", "sentence_transformers", "torch")
+
+_HEAVY_PROBE = (
+    "import sys, json, app.api.main; "
+    f"print(json.dumps(sorted(m for m in {HEAVY_MODULES!r} if m in sys.modules)))"
+)
+
+_FIRST_RESPONSE = """
+import json, time
+from fastapi.testclient import TestClient
+from app.api.main import app
+imported = time.time()
+with TestClient(app) as client:
+    started = time.time()
+    client.get("/health")
+    health = time.time()
+    client.post("/inference/analyze", json={"skills": ["python", "sql"], "role_id": "data_scientist",
+                                            "level": "junior", "experience_years": 1.0})
+    analyze = time.time()
+print(json.dumps({"import": imported, "startup": started, "health": health, "analyze": analyze}))
+"""
+
+
+def import_times(module: str = "app.api.main"):
+    """(total us of `module`, [(self us, cumulative us, name)]) from one fresh import."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=project_root, capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(self_us), int(cumulative_us), name.rstrip()[1:]))
+    total = next(cumulative for _, cumulative, name in rows if name == module)
+    return total, rows
+
+
+def first_response(env):
+    """Seconds from process launch to import, startup, first /health and first analyze."""
+    launched = time.time()
+    out = subprocess.run(
+        [sys.executable, "-c", _FIRST_RESPONSE], cwd=project_root, env=env,
+        capture_output=True, text=True, check=True,
+    ).stdout
+    marks = json.loads(out.strip().splitlines()[-1])
+    return {k: v - launched for k, v in marks.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=300.0, help="Max import time of app.api.main")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh imports to take the best of")
+    parser.add_argument("--top", type=int, default=10, help="Slowest modules to list")
+    parser.add_argument("--first-response", action="store_true", help="Also time a cold worker")
+    args = parser.parse_args()
+
+    best, rows = min((import_times() for _ in range(args.runs)), key=lambda r: r[0])
+    print(f"import app.api.main: {best / 1000:.1f} ms (best of {args.runs}, budget {args.budget_ms:.0f} ms)")
+    print("Slowest modules (self time):")
+    for self_us, cumulative_us, name in sorted(rows, reverse=True)[:args.top]:
+        print(f"  {self_us / 1000:7.1f} ms  {name.strip()}")
+
+    heavy = json.loads(subprocess.run(
+        [sys.executable, "-c", _HEAVY_PROBE], cwd=project_root, capture_output=True, text=True, check=True,
+    ).stdout)
+
+    if args.first_response:
+        print("\nCold start (seconds from process launch):")
+        print(f"  {'PRELOAD_MODELS':<16}{'import':>8}{'startup':>9}{'/health':>9}{'analyze':>9}")
+        for preload in ("false", "true"):
+            marks = first_response(dict(os.environ, PRELOAD_MODELS=preload))
+            print(f"  {preload:<16}{marks['import']:>8.3f}{marks['startup']:>9.3f}"
+                  f"{marks['health']:>9.3f}{marks['analyze']:>9.3f}")
+
+    failures = []
+    if best / 1000 > args.budget_ms:
+        failures.append(f"import took {best / 1000:.1f} ms, over the {args.budget_ms:.0f} ms budget")
+    if heavy:
+        failures.append(f"heavy modules imported: {', '.join(heavy)}")
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
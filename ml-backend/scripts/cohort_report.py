@@ -0,0 +1,159 @@
+"""Cohort skill-gap report for many candidates against one role.
+
+Reads candidates from a JSONL file (one skill list, or an object with "skills"
+and optional "experience_years", per line) or generates a synthetic cohort,
+aggregates them with the vectorized cohort analyzer and writes the summary as
+JSON. Progress is reported on stderr from the partial aggregates.
+
+With --check, a sample of candidates is also scored one by one through
+SkillAnalyzer/compute_readiness (the work a client does per /inference/analyze
+call) to verify the aggregates and compare throughput.
+
+Usage:
+    python scripts/cohort_report.py --role backend_developer --level junior --input candidates.jsonl
+    python scripts/cohort_report.py --role backend_developer --level junior --synthetic 100000 --check 5000
+    python scripts/cohort_report.py --skills python sql docker --input candidates.jsonl --out report.json
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Iterator, List, Tuple
+
+# Add project root to path
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from app.core.startup import load_models_on_startup
+from app.pipelines.pipeline import SkillAnalyzer, compute_readiness
+from app.services.cohort_service import analyze_cohort, cohort_aggregator, iter_cohort_analysis
+from app.services.role_intelligence import get_role_intelligence
+from data.skill_taxonomy import SKILL_TAXONOMY
+
+
+def read_candidates(path: Path, default_experience: float) -> Iterator[Tuple[List[str], float]]:
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if isinstance(record, dict):
+                yield record.get("skills", []), float(record.get("experience_years", default_experience))
+            else:
+                yield record, default_experience
+
+
+def synthetic_candidates(n: int, role_skills: List[str], seed: int) -> List[Tuple[List[str], float]]:
+    """Candidates holding a random share of the role's skills plus unrelated ones."""
+    rng = random.Random(seed)
+    others = sorted(SKILL_TAXONOMY)
+    cohort = []
+    for _ in range(n):
+        share = rng.random()
+        skills = [s for s in role_skills if rng.random() < share]
+        skills += rng.sample(others, rng.randint(0, 8))
+        cohort.append((skills, round(rng.uniform(0, 8), 1)))
+    return cohort
+
+
+def role_skill_list(args) -> List[str]:
+    if args.skills:
+        return args.skills
+    role_intel = get_role_intelligence(args.role, args.level)
+    return role_intel.core_skills + role_intel.secondary_skills + role_intel.bonus_skills
+
+
+def check_sample(cohort, args) -> None:
+    """Score a sample one candidate at a time and compare with the aggregates."""
+    sample = cohort[:args.check]
+    role_intel = get_role_intelligence(args.role, args.level) if args.role else None
+
+    start = time.perf_counter()
+    scores, labels = [], {}
+    for skills, years in sample:
+        analysis = SkillAnalyzer(role_intel, user_experience=years, user_skill_count=len(skills)).analyze(
+            skills, args.skills
+        )
+        label, _, _ = compute_readiness(analysis["weighted_score"], years, analysis["core_coverage"])
+        scores.append(analysis["weighted_score"])
+        labels[label] = labels.get(label, 0) + 1
+    loop_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    summary = analyze_cohort(
+        [skills for skills, _ in sample],
+        experience_years=[years for _, years in sample],
+        role_id=args.role, level=args.level, role_skills=args.skills,
+    )
+    vectorized_s = time.perf_counter() - start
+
+    mean = sum(scores) / max(len(scores), 1)
+    agree = abs(mean - summary["weighted_score"]["mean"]) < 1e-3 and all(
+        labels.get(label, 0) == count for label, count in summary["readiness"].items()
+    )
+    print(f"Check on {len(sample)} candidates: per-candidate {loop_s:.2f}s, vectorized {vectorized_s:.3f}s "
+          f"({loop_s / max(vectorized_s, 1e-9):.0f}x), results {'match' if agree else 'DIFFER'}",
+          file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--role", default=None, help="Role ID (with --level)")
+    parser.add_argument("--level", default=None)
+    parser.add_argument("--skills", nargs="+", default=None, help="Custom role skills instead of a role")
+    parser.add_argument("--input", type=Path, default=None, help="Candidates JSONL file")
+    parser.add_argument("--synthetic", type=int, default=0, help="Generate N synthetic candidates")
+    parser.add_argument("--experience", type=float, default=0.0, help="Default experience years")
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    parser.add_argument("--top-k", type=int, default=20)
+    parser.add_argument("--check", type=int, default=0, help="Verify against N per-candidate analyses")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", type=Path, default=None, help="Write the report here (default: stdout)")
+    args = parser.parse_args()
+
+    if not args.input and not args.synthetic:
+        parser.error("provide --input or --synthetic")
+    if not args.skills and not (args.role and args.level):
+        parser.error("provide --role and --level, or --skills")
+
+    load_models_on_startup()
+    try:
+        cohort_aggregator(args.role, args.level, args.skills)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.synthetic:
+        cohort = synthetic_candidates(args.synthetic, role_skill_list(args), args.seed)
+    else:
+        cohort = list(read_candidates(args.input, args.experience))
+
+    start = time.perf_counter()
+    for summary in iter_cohort_analysis(
+        (skills for skills, _ in cohort),
+        experience_years=[years for _, years in cohort],
+        role_id=args.role,
+        level=args.level,
+        role_skills=args.skills,
+        chunk_size=args.chunk_size,
+        top_k=args.top_k,
+    ):
+        print(f"  {summary['processed']}/{len(cohort)} candidates "
+              f"({time.perf_counter() - start:.2f}s)", file=sys.stderr)
+
+    if args.check:
+        check_sample(cohort, args)
+
+    report = json.dumps(summary, indent=2)
+    if args.out:
+        args.out.write_text(report + "\n", encoding="utf-8")
+        print(f"Wrote {args.out}", file=sys.stderr)
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Export skill/role/resource definitions to a file usable as DATA_STORE.
+
+Writes the built-in definitions (or those of another store, e.g. to convert
+JSON to SQLite) in the format given by the output file's suffix.
+
+Usage:
+    python scripts/export_data_store.py data_store.db
+    python scripts/export_data_store.py catalog.db --source catalog.json.gz
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from data.store import (
+    JSON_SUFFIXES,
+    SQLITE_SUFFIXES,
+    open_data_store,
+    write_json_store,
+    write_sqlite_store,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("output", type=Path, help=f"Output file ({', '.join(SQLITE_SUFFIXES + JSON_SUFFIXES)})")
+    parser.add_argument("--source", default=None, help="Store to export (default: built-in definitions)")
+    args = parser.parse_args()
+
+    name = args.output.name.lower()
+    if name.endswith(SQLITE_SUFFIXES):
+        write = write_sqlite_store
+    elif name.endswith(JSON_SUFFIXES):
+        write = write_json_store
+    else:
+        parser.error(f"unsupported output format: {args.output}")
+
+    store = open_data_store(args.source)
+    start = time.perf_counter()
+    write(store, args.output)
+    size = args.output.stat().st_size / 1024
+    print(f"Wrote {store!r} to {args.output} ({size:.1f} KB) in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,338 @@
+"""Open-loop load generator for POST /inference/analyze.
+
+Sends a realistic request mix (resume vs skills-only, role-based vs custom,
+varying skill counts) at a fixed target rate and reports latency percentiles,
+error rate and the rate at which the service saturates.
+
+Requests are issued on a fixed schedule regardless of how fast the server
+answers (open loop), and latency is measured from the *intended* send time,
+so queueing delay is not hidden when the server falls behind.
+
+Usage:
+    # Against an already-running server
+    python scripts/load_test.py --url http://127.0.0.1:8000 --rps 50 --duration 30
+
+    # Spawn a local uvicorn instance and ramp until saturation
+    python scripts/load_test.py --spawn-server --ramp 25,50,100,200,400 --duration 15
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+# Add project root to path
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from data.skill_taxonomy import SKILL_TAXONOMY
+from data.role_definitions import ROLE_DEFINITIONS
+
+
+ANALYZE_PATH = "/inference/analyze"
+
+RESUME_TEMPLATES = [
+    "Software engineer with {years} years of experience. Skills: {skills}.",
+    "Worked on production systems using {skills}. {years}+ years in industry.",
+    "Graduate with internship experience in {skills}.",
+    "Built and shipped features with {skills}; comfortable with code reviews and agile teams.",
+]
+
+
+class RequestMix:
+    """Seeded generator of realistic /inference/analyze payloads.
+
+    Args:
+        resume_ratio: Fraction of requests carrying resume text
+        role_ratio: Fraction of requests using role_id + level (rest are custom)
+        max_skills: Upper bound on explicitly listed candidate skills
+        seed: Random seed for reproducible mixes
+        include: Optional pipeline profile sent with every request
+            ("score", "analysis" or "full")
+    """
+
+    def __init__(
+        self,
+        resume_ratio: float = 0.25,
+        role_ratio: float = 0.7,
+        max_skills: int = 15,
+        seed: int = 42,
+        include: Optional[str] = None,
+    ):
+        self.resume_ratio = resume_ratio
+        self.include = include
+        self.role_ratio = role_ratio
+        self.max_skills = max_skills
+        self._rng = random.Random(seed)
+        self._skills = sorted(SKILL_TAXONOMY)
+        self._roles = sorted(ROLE_DEFINITIONS)
+        self._levels = ["intern", "junior", "mid", "senior"]
+
+    def next_payload(self) -> Dict[str, Any]:
+        """Build the next request payload."""
+        rng = self._rng
+        payload: Dict[str, Any] = {
+            "candidate_id": f"load-{rng.randrange(10**9)}",
+            "experience_years": round(rng.uniform(0, 10), 1),
+        }
+        if self.include:
+            payload["include"] = self.include
+
+        if rng.random() < self.role_ratio:
+            role_id = rng.choice(self._roles)
+            level = rng.choice(self._levels)
+            payload["role_id"] = role_id
+            payload["level"] = level
+            # Bias skill picks towards the role so matches are realistic
+            role_skills = ROLE_DEFINITIONS[role_id]["levels"][level]["skills"]
+            pool = role_skills["core"] + role_skills["secondary"] + role_skills["bonus"]
+        else:
+            payload["target_role_skills"] = rng.sample(self._skills, rng.randint(3, 12))
+            pool = payload["target_role_skills"]
+
+        n_skills = rng.randint(0, self.max_skills)
+        n_from_pool = min(len(pool), rng.randint(0, n_skills))
+        skills = rng.sample(pool, n_from_pool)
+        skills += rng.sample(self._skills, n_skills - n_from_pool)
+        skills = list(dict.fromkeys(skills))
+
+        if rng.random() < self.resume_ratio:
+            template = rng.choice(RESUME_TEMPLATES)
+            resume_skills = skills or rng.sample(self._skills, 3)
+            payload["resume_text"] = template.format(
+                years=rng.randint(0, 10),
+                skills=", ".join(resume_skills),
+            )
+            # Resume requests usually list fewer skills explicitly
+            payload["skills"] = skills[: len(skills) // 3]
+        else:
+            payload["skills"] = skills
+
+        return payload
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already-sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100.0 * len(sorted_values) + 0.5)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class _Client:
+    """Keeps one persistent HTTP connection per worker thread."""
+
+    def __init__(self, base_url: str, timeout: float):
+        parsed = urlparse(base_url)
+        self._host = parsed.hostname or "127.0.0.1"
+        self._port = parsed.port or 80
+        self._timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self) -> http.client.HTTPConnection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = http.client.HTTPConnection(self._host, self._port, timeout=self._timeout)
+            self._local.conn = conn
+        return conn
+
+    def post(self, path: str, body: bytes) -> int:
+        conn = self._connection()
+        try:
+            conn.request("POST", path, body=body, headers={"Content-Type": "application/json"})
+            response = conn.getresponse()
+            response.read()
+            return response.status
+        except Exception:
+            conn.close()
+            self._local.conn = None
+            raise
+
+
+def run_step(
+    base_url: str,
+    rps: float,
+    duration: float,
+    mix: RequestMix,
+    workers: int = 256,
+    timeout: float = 30.0,
+) -> Dict[str, Any]:
+    """Drive the service at a fixed arrival rate and collect latency stats.
+
+    Args:
+        base_url: Server base URL
+        rps: Target requests per second
+        duration: Seconds to keep sending
+        mix: Payload generator
+        workers: Max in-flight requests on the client side
+        timeout: Per-request socket timeout in seconds
+
+    Returns:
+        Summary dict with achieved throughput, error rate and percentiles (ms)
+    """
+    client = _Client(base_url, timeout)
+    latencies: List[float] = []
+    errors = 0
+    lock = threading.Lock()
+
+    def fire(intended_start: float, body: bytes):
+        nonlocal errors
+        ok = False
+        try:
+            ok = 200 <= client.post(ANALYZE_PATH, body) < 300
+        except Exception:
+            ok = False
+        elapsed = time.perf_counter() - intended_start
+        with lock:
+            latencies.append(elapsed * 1000.0)
+            if not ok:
+                errors += 1
+
+    n_requests = int(rps * duration)
+    interval = 1.0 / rps
+    bodies = [json.dumps(mix.next_payload()).encode() for _ in range(n_requests)]
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        start = time.perf_counter()
+        for i, body in enumerate(bodies):
+            intended = start + i * interval
+            delay = intended - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(fire, intended, body)
+    wall = time.perf_counter() - start
+
+    latencies.sort()
+    completed = len(latencies)
+    return {
+        "target_rps": rps,
+        "achieved_rps": (completed - errors) / wall if wall > 0 else 0.0,
+        "requests": completed,
+        "errors": errors,
+        "error_rate": errors / completed if completed else 0.0,
+        "p50_ms": percentile(latencies, 50),
+        "p90_ms": percentile(latencies, 90),
+        "p99_ms": percentile(latencies, 99),
+        "p999_ms": percentile(latencies, 99.9),
+        "max_ms": latencies[-1] if latencies else 0.0,
+    }
+
+
+def is_saturated(step: Dict[str, Any], slo_ms: float, max_error_rate: float) -> bool:
+    """A step is saturated if throughput lags, errors climb, or p99 blows the SLO."""
+    return (
+        step["achieved_rps"] < 0.95 * step["target_rps"]
+        or step["error_rate"] > max_error_rate
+        or step["p99_ms"] > slo_ms
+    )
+
+
+def _wait_for_health(base_url: str, timeout: float = 30.0):
+    parsed = urlparse(base_url)
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection(parsed.hostname, parsed.port, timeout=1)
+            conn.request("GET", "/health")
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not become healthy in {timeout}s")
+
+
+def spawn_server(port: int) -> subprocess.Popen:
+    """Start a local uvicorn instance serving the app (no reload, one worker)."""
+    env = dict(os.environ, PYTHONPATH=str(project_root))
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.api.main:app",
+         "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=project_root,
+        env=env,
+    )
+    _wait_for_health(f"http://127.0.0.1:{port}")
+    return proc
+
+
+def _print_step(step: Dict[str, Any], saturated: bool):
+    flag = "  << SATURATED" if saturated else ""
+    print(
+        f"  {step['target_rps']:>7.1f} rps -> {step['achieved_rps']:>7.1f} ok/s | "
+        f"p50 {step['p50_ms']:7.1f}  p90 {step['p90_ms']:7.1f}  "
+        f"p99 {step['p99_ms']:7.1f}  p999 {step['p999_ms']:7.1f} ms | "
+        f"errors {step['error_rate']:.2%}{flag}"
+    )
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Open-loop load test for /inference/analyze")
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="Server base URL")
+    parser.add_argument("--spawn-server", action="store_true", help="Start a local uvicorn instance")
+    parser.add_argument("--port", type=int, default=8765, help="Port for --spawn-server")
+    parser.add_argument("--rps", type=float, default=20.0, help="Target rate for a single step")
+    parser.add_argument("--ramp", default=None, help="Comma-separated list of target rates")
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds per step")
+    parser.add_argument("--workers", type=int, default=256, help="Max in-flight requests")
+    parser.add_argument("--slo-ms", type=float, default=500.0, help="p99 latency SLO")
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    parser.add_argument("--resume-ratio", type=float, default=0.25)
+    parser.add_argument("--role-ratio", type=float, default=0.7)
+    parser.add_argument("--max-skills", type=int, default=15)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--include", choices=["score", "analysis", "full"], default=None,
+                        help="Pipeline profile to request")
+    parser.add_argument("--json", dest="json_path", default=None, help="Write results as JSON")
+    args = parser.parse_args(argv)
+
+    rates = [float(r) for r in args.ramp.split(",")] if args.ramp else [args.rps]
+    mix = RequestMix(args.resume_ratio, args.role_ratio, args.max_skills, args.seed, args.include)
+
+    server = None
+    base_url = args.url
+    if args.spawn_server:
+        base_url = f"http://127.0.0.1:{args.port}"
+        print(f"Starting uvicorn on {base_url}...")
+        server = spawn_server(args.port)
+
+    steps = []
+    saturation_rps = None
+    try:
+        print(f"Load test against {base_url}{ANALYZE_PATH} ({args.duration:.0f}s per step)")
+        for rate in rates:
+            step = run_step(base_url, rate, args.duration, mix, args.workers)
+            saturated = is_saturated(step, args.slo_ms, args.max_error_rate)
+            step["saturated"] = saturated
+            steps.append(step)
+            _print_step(step, saturated)
+            if saturated:
+                saturation_rps = rate
+                break
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=10)
+
+    if saturation_rps is None:
+        print(f"No saturation up to {rates[-1]:.1f} rps")
+    else:
+        sustained = [s["target_rps"] for s in steps if not s["saturated"]]
+        last_ok = f"{sustained[-1]:.1f} rps" if sustained else "none"
+        print(f"Saturated at {saturation_rps:.1f} rps (last sustained: {last_ok})")
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump({"steps": steps, "saturation_rps": saturation_rps}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,81 +6,242 @@ This script trains:
 3. Skill Embeddings (Sentence Transformers)
 4. Gap Ranking Model (XGBoost)
 5. Resource Recommender (SVD Matrix Factorization)
+
+Models are trained as a dependency-aware task graph in a process pool, each
+with its own log file under ml/artifacts/logs/. A model is skipped when its
+artifacts exist and the hash of its training code and inputs matches the one
+recorded in ml/artifacts/train_manifest.json when they were written.
+
+Usage:
+    python scripts/train_all.py [--jobs 4] [--force] [--only readiness,recommender]
 """
 
+import argparse
+import contextlib
+import hashlib
+import importlib
+import json
+import os
 import sys
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from pathlib import Path
+from typing import Dict, List, Optional
 
 # Add project root to path
 project_root = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(project_root))
 
+training_dir = project_root / "ml" / "training"
+artifacts_dir = project_root / "ml" / "artifacts"
+MANIFEST_PATH = artifacts_dir / "train_manifest.json"
+
+
+# name -> training entry point, artifacts it writes, files whose content
+# determines the result, and tasks that must finish first
+TASKS: Dict[str, Dict] = {
+    "readiness": {
+        "title": "Readiness Prediction Model",
+        "module": "ml.training.train_readiness",
+        "function": "train_and_save",
+        "target": "readiness_v1.joblib",
+        "artifacts": ["readiness_v1.joblib"],
+        "inputs": [training_dir / "train_readiness.py"],
+        "deps": [],
+    },
+    "skill_extractor": {
+        "title": "Skill Extraction Model",
+        "module": "ml.training.train_skill_extractor",
+        "function": "train_skill_extractor",
+        "artifacts": [
+            "skill_extractor_vectorizer.joblib",
+            "skill_extractor_classifier.joblib",
+            "skill_extractor_mlb.joblib",
+        ],
+        "inputs": [training_dir / "train_skill_extractor.py"],
+        "deps": [],
+    },
+    "skill_embeddings": {
+        "title": "Skill Embeddings",
+        "module": "ml.training.train_skill_embeddings",
+        "function": "generate_skill_embeddings",
+        "artifacts": ["skill_embeddings.joblib", "skill_list.joblib"],
+        "inputs": [training_dir / "train_skill_embeddings.py"],
+        "deps": [],
+    },
+    "gap_ranker": {
+        "title": "Gap Ranking Model",
+        "module": "ml.training.train_gap_ranker",
+        "function": "train_gap_ranker",
+        "artifacts": [
+            "gap_ranker_model.joblib",
+            "gap_ranker_features.joblib",
+            "skill_metadata.joblib",
+        ],
+        "inputs": [training_dir / "train_gap_ranker.py"],
+        "deps": [],
+    },
+    "recommender": {
+        "title": "Resource Recommender",
+        "module": "ml.training.train_recommender",
+        "function": "train_recommender",
+        "artifacts": [
+            "recommender_svd.joblib",
+            "recommender_skill_factors.joblib",
+            "recommender_resource_factors.joblib",
+            "recommender_predictions.joblib",
+            "recommender_skills.joblib",
+            "recommender_resources.joblib",
+            "recommender_skill_idx.joblib",
+            "recommender_state.joblib",
+            "recommender_version.json",
+        ],
+        "inputs": [training_dir / "train_recommender.py"],
+        "deps": [],
+    },
+}
+
+
+def task_fingerprint(name: str) -> str:
+    """Hash of a task's training code and input files."""
+    digest = hashlib.sha256(name.encode())
+    for path in sorted(TASKS[name]["inputs"]):
+        digest.update(str(Path(path).relative_to(project_root)).encode())
+        digest.update(Path(path).read_bytes())
+    return digest.hexdigest()
+
+
+def load_manifest() -> Dict[str, Dict]:
+    if MANIFEST_PATH.exists():
+        return json.loads(MANIFEST_PATH.read_text())
+    return {}
+
+
+def save_manifest(manifest: Dict[str, Dict]):
+    tmp = MANIFEST_PATH.with_suffix(".tmp")
+    tmp.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    os.replace(tmp, MANIFEST_PATH)
+
+
+def is_up_to_date(name: str, manifest: Dict[str, Dict]) -> bool:
+    entry = manifest.get(name)
+    if not entry or entry.get("fingerprint") != task_fingerprint(name):
+        return False
+    return all((artifacts_dir / a).exists() for a in TASKS[name]["artifacts"])
 
-def train_all():
-    """Train all ML models."""
-    training_dir = project_root / "ml" / "training"
-    artifacts_dir = project_root / "ml" / "artifacts"
+
+def _run_task(name: str, log_path: str) -> Dict:
+    """Worker: run one training task with stdout/stderr captured to its log."""
+    spec = TASKS[name]
+    start = time.perf_counter()
+    with open(log_path, "w", encoding="utf-8") as log, \
+            contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+        try:
+            module = importlib.import_module(spec["module"])
+            train = getattr(module, spec["function"])
+            target = artifacts_dir / spec["target"] if "target" in spec else artifacts_dir
+            train(target)
+            ok, error = True, None
+        except Exception as e:
+            traceback.print_exc()
+            ok, error = False, f"{type(e).__name__}: {e}"
+    return {"name": name, "ok": ok, "error": error, "seconds": time.perf_counter() - start}
+
+
+def train_all(jobs: Optional[int] = None, force: bool = False, only: Optional[List[str]] = None):
+    """Train all ML models, in parallel where the task graph allows."""
     artifacts_dir.mkdir(parents=True, exist_ok=True)
-    
+    log_dir = artifacts_dir / "logs"
+    log_dir.mkdir(exist_ok=True)
+
+    selected = only or list(TASKS)
+    unknown = [n for n in selected if n not in TASKS]
+    if unknown:
+        raise ValueError(f"Unknown task(s): {unknown}. Available: {list(TASKS)}")
+    jobs = jobs or min(len(selected), os.cpu_count() or 1)
+
     print("="*60)
-    print("TRAINING ALL ML MODELS")
+    print(f"TRAINING ALL ML MODELS ({jobs} parallel jobs)")
     print("="*60)
-    
-    # 1. Readiness Model
-    print("\n[1/5] Training Readiness Prediction Model...")
-    try:
-        from ml.training.train_readiness import train_and_save
-        train_and_save(artifacts_dir / "readiness_v1.joblib")
-        print("✓ Readiness model trained")
-    except Exception as e:
-        print(f"✗ Error: {e}")
-    
-    # 2. Skill Extractor
-    print("\n[2/5] Training Skill Extraction Model...")
-    try:
-        from ml.training.train_skill_extractor import train_skill_extractor
-        train_skill_extractor(artifacts_dir)
-        print("✓ Skill extractor trained")
-    except Exception as e:
-        print(f"✗ Error: {e}")
-    
-    # 3. Skill Embeddings
-    print("\n[3/5] Generating Skill Embeddings...")
-    try:
-        from ml.training.train_skill_embeddings import generate_skill_embeddings
-        generate_skill_embeddings(artifacts_dir)
-        print("✓ Skill embeddings generated")
-    except Exception as e:
-        print(f"✗ Error: {e}")
-    
-    # 4. Gap Ranker
-    print("\n[4/5] Training Gap Ranking Model...")
-    try:
-        from ml.training.train_gap_ranker import train_gap_ranker
-        train_gap_ranker(artifacts_dir)
-        print("✓ Gap ranker trained")
-    except Exception as e:
-        print(f"✗ Error: {e}")
-    
-    # 5. Recommender
-    print("\n[5/5] Training Resource Recommender...")
-    try:
-        from ml.training.train_recommender import train_recommender
-        train_recommender(artifacts_dir)
-        print("✓ Recommender trained")
-    except Exception as e:
-        print(f"✗ Error: {e}")
-    
+
+    manifest = load_manifest()
+    results: Dict[str, Dict] = {}
+    pending = []
+    for name in selected:
+        if not force and is_up_to_date(name, manifest):
+            results[name] = {"status": "skipped", "seconds": 0.0}
+            print(f"- {TASKS[name]['title']}: up to date, skipping")
+        else:
+            pending.append(name)
+
+    wall_start = time.perf_counter()
+    running = {}
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        while pending or running:
+            # Start every task whose dependencies have finished successfully
+            for name in list(pending):
+                deps = [d for d in TASKS[name]["deps"] if d in selected]
+                if any(results.get(d, {}).get("status") in ("failed", "blocked") for d in deps):
+                    pending.remove(name)
+                    results[name] = {"status": "blocked", "seconds": 0.0}
+                    print(f"✗ {TASKS[name]['title']}: blocked by failed dependency")
+                elif all(results.get(d, {}).get("status") in ("trained", "skipped") for d in deps):
+                    pending.remove(name)
+                    log_path = log_dir / f"{name}.log"
+                    running[pool.submit(_run_task, name, str(log_path))] = name
+                    print(f"▶ {TASKS[name]['title']} (log: {os.path.relpath(log_path, project_root)})")
+
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                result = future.result()
+                if result["ok"]:
+                    results[name] = {"status": "trained", "seconds": result["seconds"]}
+                    manifest[name] = {
+                        "fingerprint": task_fingerprint(name),
+                        "trained_at": time.time(),
+                        "seconds": result["seconds"],
+                    }
+                    save_manifest(manifest)
+                    print(f"✓ {TASKS[name]['title']} trained in {result['seconds']:.1f}s")
+                else:
+                    results[name] = {"status": "failed", "seconds": result["seconds"],
+                                     "error": result["error"]}
+                    print(f"✗ {TASKS[name]['title']}: {result['error']}")
+    wall = time.perf_counter() - wall_start
+
     print("\n" + "="*60)
     print("TRAINING COMPLETE")
     print("="*60)
-    
+
+    print(f"\n{'Task':<20}{'Status':<10}{'Seconds':>8}")
+    for name in selected:
+        r = results[name]
+        print(f"{name:<20}{r['status']:<10}{r['seconds']:>8.1f}")
+    total = sum(r["seconds"] for r in results.values())
+    print(f"\nWall time {wall:.1f}s (sum of task times {total:.1f}s)")
+
     # List artifacts
     print("\nModel artifacts:")
     for f in sorted(artifacts_dir.glob("*.joblib")):
         size = f.stat().st_size / 1024
         print(f"  {f.name} ({size:.1f} KB)")
 
+    return results
+
 
 if __name__ == "__main__":
-    train_all()
+    parser = argparse.ArgumentParser(description="Train all ML models")
+    parser.add_argument("--jobs", "-j", type=int, default=None,
+                        help="Parallel training processes (default: one per task, up to CPU count)")
+    parser.add_argument("--force", action="store_true", help="Retrain even if up to date")
+    parser.add_argument("--only", default=None, help="Comma-separated subset of tasks")
+    args = parser.parse_args()
+    train_all(
+        jobs=args.jobs,
+        force=args.force,
+        only=args.only.split(",") if args.only else None,
+    )
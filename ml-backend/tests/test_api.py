@@ -1,3 +1,4 @@
+import pytest
 from fastapi.testclient import TestClient
 from app.api.main import app
 
@@ -84,3 +85,876 @@ def test_readiness_thresholds():
     response = client.post("/inference/analyze", json=payload)
     data = response.json()
     assert data["readiness_label"] == "Needs Upskilling"
+
+
+def test_profiling_requires_authorization(monkeypatch, tmp_path):
+    """Profile header is rejected unless profiling is enabled or admin token matches."""
+    from app.core import config
+    monkeypatch.setattr(config, "PROFILING_ENABLED", False)
+    monkeypatch.setattr(config, "ADMIN_TOKEN", "secret")
+    monkeypatch.setattr(config, "PROFILES_DIR", tmp_path)
+    payload = {"skills": ["python"], "target_role_skills": ["python", "sql"]}
+
+    response = client.post("/inference/analyze", json=payload, headers={"X-Debug-Profile": "cprofile"})
+    assert response.status_code == 403
+
+    response = client.post(
+        "/inference/analyze",
+        json=payload,
+        headers={"X-Debug-Profile": "cprofile", "X-Admin-Token": "secret", "X-Request-ID": "prof-1"},
+    )
+    assert response.status_code == 200
+    assert response.headers["X-Profile-ID"] == "prof-1"
+    assert "readiness_score" in response.json()
+
+    profile = client.get("/debug/profiles/prof-1", headers={"X-Admin-Token": "secret"}).json()
+    assert profile["mode"] == "cprofile"
+    assert "run_pipeline" in profile["text"]
+
+
+def test_profile_files_stay_in_profiles_dir(monkeypatch, tmp_path):
+    """Client request IDs don't name pstats files; evicted profiles' files are deleted."""
+    from app.core import config
+    from app.services import profiling_service
+    profiles_dir = tmp_path / "profiles"
+    monkeypatch.setattr(config, "PROFILING_ENABLED", True)
+    monkeypatch.setattr(config, "PROFILES_DIR", profiles_dir)
+    monkeypatch.setattr(config, "MAX_STORED_PROFILES", 1)
+    monkeypatch.setattr(profiling_service, "_PROFILES", profiling_service.OrderedDict())
+    payload = {"skills": ["python"], "target_role_skills": ["python", "sql"]}
+
+    headers = {"X-Debug-Profile": "cprofile", "X-Request-ID": "../escaped"}
+    assert client.post("/inference/analyze", json=payload, headers=headers).status_code == 200
+    assert not (tmp_path / "escaped.pstats").exists()
+    first = profiling_service.get_profile("../escaped")["pstats_path"]
+    assert [p.name for p in profiles_dir.iterdir()] == [first.rsplit("/", 1)[-1]]
+
+    headers = {"X-Debug-Profile": "cprofile", "X-Request-ID": "prof-2"}
+    assert client.post("/inference/analyze", json=payload, headers=headers).status_code == 200
+    assert profiling_service.get_profile("../escaped") is None
+    assert [str(p) for p in profiles_dir.iterdir()] == [profiling_service.get_profile("prof-2")["pstats_path"]]
+    assert client.get("/debug/profiles/prof-2?format=pstats").status_code == 200
+
+
+def test_profiling_modes(monkeypatch, tmp_path):
+    """Sampling and tracemalloc modes store their own profile formats."""
+    from app.core import config
+    monkeypatch.setattr(config, "PROFILING_ENABLED", True)
+    monkeypatch.setattr(config, "PROFILES_DIR", tmp_path)
+    payload = {"skills": ["python"], "role_id": "data_scientist", "level": "junior"}
+
+    for mode in ("sample", "tracemalloc"):
+        headers = {"X-Debug-Profile": mode, "X-Request-ID": f"prof-{mode}"}
+        assert client.post("/inference/analyze", json=payload, headers=headers).status_code == 200
+
+    tm = client.get("/debug/profiles/prof-tracemalloc").json()
+    assert tm["peak_bytes"] > 0
+    assert isinstance(tm["top_allocations"], list)
+    assert client.get("/debug/profiles/prof-sample?format=collapsed").status_code == 200
+
+    bad = client.post("/inference/analyze", json=payload, headers={"X-Debug-Profile": "perf"})
+    assert bad.status_code == 400
+
+
+def test_tracemalloc_profiles_run_one_at_a_time(monkeypatch, tmp_path):
+    """Concurrent tracemalloc profiles don't overlap, and tracing stops after both."""
+    import threading
+    import time
+    import tracemalloc
+    from app.services import profiling_service
+
+    monkeypatch.setattr(profiling_service, "_PROFILES", profiling_service.OrderedDict())
+    running, overlapped = [], []
+
+    def allocate(n):
+        running.append(n)
+        overlapped.append(len(running) > 1)
+        data = [bytearray(1000) for _ in range(100)]
+        time.sleep(0.05)
+        running.remove(n)
+        return len(data)
+
+    threads = [threading.Thread(target=profiling_service.profile_call, args=("tracemalloc", f"tm-{n}", allocate, n))
+               for n in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert overlapped == [False] * 3 and not tracemalloc.is_tracing()
+    assert all(profiling_service.get_profile(f"tm-{n}")["peak_bytes"] >= 100_000 for n in range(3))
+
+
+def test_incremental_session_matches_full_analysis():
+    """Skill deltas on a session give the same result as a fresh full analysis."""
+    base = {"skills": ["python", "pandas"], "role_id": "data_scientist", "level": "junior",
+            "experience_years": 1.0}
+    session = client.post("/inference/sessions", json=base).json()
+    session_id = session["session_id"]
+
+    steps = [
+        ({"add": ["numpy", "sql"]}, ["python", "pandas", "numpy", "sql"]),
+        ({"remove": ["pandas"]}, ["python", "numpy", "sql"]),
+        ({"add": ["Docker "], "remove": ["python"]}, ["numpy", "sql", "docker"]),
+    ]
+    for delta, skills in steps:
+        updated = client.post(f"/inference/sessions/{session_id}/delta", json=delta).json()
+        full = client.post("/inference/analyze", json={**base, "skills": skills}).json()
+        assert updated["readiness_score"] == full["readiness_score"]
+        assert updated["skill_analysis"] == full["skill_analysis"]
+        assert updated["recommendations"] == full["recommendations"]
+        assert updated["roadmap"] == full["roadmap"]
+
+    missing = client.post("/inference/sessions/nope/delta", json={"add": ["git"]})
+    assert missing.status_code == 404
+
+    # Concurrent deltas to one session are applied one at a time
+    from concurrent.futures import ThreadPoolExecutor
+    from app.services.incremental_service import get_session
+    toggled = ["git", "tableau", "statistics", "machine learning", "spark", "r"]
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(lambda _: [get_session(session_id).apply_delta([s], []) for s in toggled], range(8)))
+        list(pool.map(lambda _: [get_session(session_id).apply_delta([], [s]) for s in toggled[:3]], range(8)))
+    final = get_session(session_id).result()
+    full = client.post("/inference/analyze", json={**base, "skills": ["numpy", "sql", "docker"] + toggled[3:]}).json()
+    assert final["skill_analysis"] == full["skill_analysis"]
+
+
+def test_session_gap_scores_cached_per_skill_count_range(monkeypatch):
+    """Toggles within a range of skill counts the ranker can't tell apart reuse scores."""
+    import json
+    from app.core import startup
+
+    class Booster:
+        feature_names = [f"f{i}" for i in range(7)] + ["user_skill_count", "has_prereqs"]
+
+        def get_dump(self, dump_format):
+            leaves = [{"nodeid": 1, "leaf": 0}, {"nodeid": 2, "leaf": 1}]
+            return [json.dumps({"nodeid": 0, "split": "user_skill_count", "split_condition": 3,
+                                "children": leaves})]
+
+    class Ranker:
+        calls = []
+
+        def get_booster(self):
+            return Booster()
+
+        def predict(self, features):
+            self.calls.append(len(features))
+            return features[:, 2] / 100 + (features[:, 7] >= 3)
+
+    monkeypatch.setitem(startup._MODELS, "gap_ranker", Ranker())
+    base = {"skills": ["python", "pandas", "numpy"], "role_id": "data_scientist", "level": "junior",
+            "experience_years": 1.0, "include": "analysis"}
+    session = client.post("/inference/sessions", json=base).json()
+    assert "recommendations" not in session and "roadmap" not in session
+    assert len(Ranker.calls) == 1
+    for delta, skills in (
+        ({"add": ["sql"]}, ["python", "pandas", "numpy", "sql"]),
+        ({"add": ["docker"], "remove": ["sql"]}, ["python", "pandas", "numpy", "docker"]),
+        ({"remove": ["docker"]}, ["python", "pandas", "numpy"]),
+    ):
+        updated = client.post(f"/inference/sessions/{session['session_id']}/delta", json=delta).json()
+        assert updated["skill_analysis"] == client.post("/inference/analyze", json={**base, "skills": skills}).json()[
+            "skill_analysis"]
+    # Only the full analyses called the model after the session scored its skills for both ranges
+    assert len(Ranker.calls) == 1 + 3 and Ranker.calls[0] % 2 == 0
+
+    updated = client.post(f"/inference/sessions/{session['session_id']}/delta", json={"remove": ["numpy"]}).json()
+    full = client.post("/inference/analyze", json={**base, "skills": ["python", "pandas"]}).json()
+    assert updated["skill_analysis"] == full["skill_analysis"] and len(Ranker.calls) == 5
+
+    compact = {**base, "include": "full", "response_format": "compact"}
+    session = client.post("/inference/sessions", json=compact).json()
+    full = client.post("/inference/analyze", json=compact).json()
+    assert session["recommendations"] == full["recommendations"]
+    assert session["catalog_version"] == full["catalog_version"]
+
+
+def test_personalized_recommendations(monkeypatch):
+    """Personalization re-ranks a skill's resources and skips rated ones."""
+    import numpy as np
+    from app.core import config, startup
+
+    monkeypatch.setattr(config, "RECOMMENDER_RELOAD_INTERVAL_SECONDS", float("inf"))
+    resources = [{"id": i, "skill": "docker", "title": f"Docker {i}", "type": "course"} for i in range(3)]
+    resources.append({"id": 3, "skill": "python", "title": "Python 3", "type": "course"})
+    components = np.array([[0.5, 0.5, 0.0, 0.7], [0.1, -0.3, 0.9, 0.4]])
+    monkeypatch.setitem(startup._MODELS, "recommender", {
+        "predictions": np.array([[0.9, 0.8, 0.75, 0.0], [0.0, 0.0, 0.1, 0.9]]),
+        "skills": ["docker", "python"],
+        "resources": resources,
+        "skill_idx": {"docker": 0, "python": 1},
+        "components": components,
+        "version": "test",
+    })
+    payload = {"skills": ["python"], "target_role_skills": ["python", "docker"]}
+
+    plain = client.post("/inference/analyze", json=payload).json()
+    assert [r["title"] for r in plain["recommendations"][0]["resources"]] == ["Docker 0", "Docker 1"]
+
+    personal = client.post(
+        "/inference/analyze",
+        json={**payload, "personalize": True, "resource_ratings": {"0": 0.1}},
+    ).json()
+    ranked = personal["recommendations"][0]["resources"]
+    assert [r["title"] for r in ranked] == ["Docker 2", "Docker 1"]
+    assert all("personalized_score" in r for r in ranked)
+
+
+def test_external_data_store_matches_builtin(tmp_path):
+    """SQLite and JSON exports of the built-in definitions serve identical analyses."""
+    from data.store import (
+        builtin_store,
+        load_json_store,
+        open_sqlite_store,
+        set_data_store,
+        write_json_store,
+        write_sqlite_store,
+    )
+
+    builtin = builtin_store()
+    write_sqlite_store(builtin, tmp_path / "catalog.db")
+    write_json_store(builtin, tmp_path / "catalog.json.gz")
+    payload = {"skills": ["python", "sql"], "role_id": "data_scientist", "level": "junior",
+               "experience_years": 1.0}
+    expected = client.post("/inference/analyze", json=payload).json()
+
+    for store in (open_sqlite_store(tmp_path / "catalog.db"), load_json_store(tmp_path / "catalog.json.gz")):
+        assert store.taxonomy == builtin.taxonomy
+        assert store.aliases == builtin.aliases
+        assert {k: v for k, v in store.dependencies.items() if v} == \
+            {k: v for k, v in builtin.dependencies.items() if v}
+        assert store.roles == builtin.roles
+        assert {s: store.resources[s] for s in store.resources} == dict(builtin.resources)
+        try:
+            set_data_store(store)
+            assert client.post("/inference/analyze", json=payload).json() == expected
+        finally:
+            set_data_store(None)
+
+
+def test_resource_filters(monkeypatch):
+    """Recommended resources honour type, duration and free filters on both paths."""
+    import numpy as np
+    from app.core import config, startup
+
+    payload = {"skills": [], "target_role_skills": ["python", "docker", "rust"],
+               "resource_filters": {"types": ["youtube"], "max_duration_hours": 6}}
+    curated = client.post("/inference/analyze", json=payload).json()
+    by_skill = {block["skill"]: block["resources"] for block in curated["recommendations"]}
+    assert [r["title"] for r in by_skill["python"]] == ["Python Tutorial for Beginners"]
+    assert all(r["type"] == "youtube" and r["duration_hours"] <= 6 for r in by_skill["docker"])
+    assert by_skill["rust"] == []  # the default search resource is 10 hours
+
+    monkeypatch.setattr(config, "RECOMMENDER_RELOAD_INTERVAL_SECONDS", float("inf"))
+    resources = [
+        {"id": 0, "skill": "docker", "title": "Docker Course", "type": "course"},
+        {"id": 1, "skill": "docker", "title": "Docker Video", "type": "youtube", "duration_hours": 2},
+        {"id": 2, "skill": "docker", "title": "Docker Paid Video", "type": "youtube", "free": False},
+    ]
+    monkeypatch.setitem(startup._MODELS, "recommender", {
+        "predictions": np.array([[0.9, 0.5, 0.8]]),
+        "skills": ["docker"],
+        "resources": resources,
+        "skill_idx": {"docker": 0},
+    })
+    payload = {"skills": [], "target_role_skills": ["docker"],
+               "resource_filters": {"free_only": True}}
+    ranked = client.post("/inference/analyze", json=payload).json()["recommendations"][0]["resources"]
+    assert [r["title"] for r in ranked] == ["Docker Video"]
+
+
+def test_cohort_analytics():
+    """Cohort aggregates agree with per-candidate analyses; streaming emits partials."""
+    import json
+
+    candidates = [["python", "sql"], ["python", "sql", "docker", "git"], [], ["java", "python"]]
+    experience = [1.0, 3.0, 0.0, 2.0]
+    payload = {"role_id": "backend_developer", "level": "junior",
+               "candidates": candidates, "experience_years": experience}
+    summary = client.post("/analytics/cohort", json=payload).json()
+
+    analyses = [
+        client.post("/inference/analyze", json={"skills": skills, "role_id": "backend_developer",
+                                                "level": "junior", "experience_years": years}).json()
+        for skills, years in zip(candidates, experience)
+    ]
+    assert summary["candidates"] == 4 and summary["done"] is True
+    mean = sum(a["skill_analysis"]["weighted_score"] for a in analyses) / 4
+    assert abs(summary["weighted_score"]["mean"] - mean) < 1e-3
+    assert sum(summary["weighted_score"]["histogram"]["counts"]) == 4
+    labels = [a["readiness_label"] for a in analyses]
+    assert summary["readiness"] == {label: labels.count(label) for label in summary["readiness"]}
+    missing = {}
+    for a in analyses:
+        for gap in a["missing_skills"]:
+            missing[gap["skill"]] = missing.get(gap["skill"], 0) + 1
+    for gap in summary["skill_gaps"]:
+        assert gap["missing_count"] == missing.get(gap["skill"], 0)
+
+    response = client.post("/analytics/cohort", json={**payload, "stream": True, "chunk_size": 3})
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [(line["processed"], line["done"]) for line in lines] == [(3, False), (4, True)]
+    assert lines[-1] == summary
+
+    assert client.post("/analytics/cohort", json={**payload, "role_id": "astronaut"}).status_code == 400
+    assert client.post("/analytics/cohort", json={**payload, "experience_years": [1.0]}).status_code == 400
+
+
+def test_models_and_heavy_libraries_load_on_first_use(tmp_path, monkeypatch):
+    """Importing the API skips numpy/joblib; models are unpickled when first requested."""
+    import subprocess
+    import sys
+    from pathlib import Path
+    from joblib import dump
+    from app.core import startup
+
+    probe = ("import sys, app.api.main; "
+             "print(sorted(m for m in ('numpy', 'joblib', 'sklearn', 'xgboost', 'pandas') if m in sys.modules))")
+    out = subprocess.run([sys.executable, "-c", probe], cwd=Path(__file__).resolve().parents[1],
+                         capture_output=True, text=True, check=True).stdout
+    assert out.strip() == "[]"
+
+    dump({"kind": "readiness"}, tmp_path / "readiness_v1.joblib")
+    monkeypatch.setattr(startup, "ARTIFACTS_DIR", tmp_path)
+    monkeypatch.setattr(startup, "_MODELS", {})
+    monkeypatch.setattr(startup, "_PENDING", {})
+    startup.load_models_on_startup(preload=False)
+    assert startup.is_model_loaded("readiness") and "readiness" not in startup._MODELS
+    assert not startup.is_model_loaded("gap_ranker")
+    assert startup.get_model("readiness") == {"kind": "readiness"}
+    assert startup._PENDING == {}
+
+
+def test_concurrent_first_use_waits_for_the_loader(monkeypatch):
+    """Callers arriving while a model loads get the model; a failed load is retried."""
+    import threading
+    import time
+    import pytest
+    from app.core import startup
+
+    monkeypatch.setattr(startup, "_MODELS", {})
+    monkeypatch.setattr(startup, "_PENDING", {})
+    started = threading.Event()
+    attempts = []
+
+    def slow_loader():
+        attempts.append(1)
+        started.set()
+        time.sleep(0.1)
+        if len(attempts) == 1:
+            raise OSError("artifact unreadable")
+        startup._MODELS["readiness"] = "model"
+
+    startup._PENDING["readiness"] = slow_loader
+    with pytest.raises(OSError):
+        startup.get_model("readiness")
+    assert startup.is_model_loaded("readiness") and "readiness" in startup._PENDING
+
+    started.clear()
+    results = []
+    first = threading.Thread(target=lambda: results.append(startup.get_model("readiness")))
+    first.start()
+    started.wait()
+    second = threading.Thread(target=lambda: results.append(startup.get_model("readiness")))
+    second.start()
+    first.join()
+    second.join()
+    assert results == ["model", "model"] and len(attempts) == 2
+    assert startup._PENDING == {}
+
+
+def test_include_profiles_skip_stages(monkeypatch):
+    """include=score/analysis return the full result's fields without running later stages."""
+    from app.pipelines import pipeline
+
+    payload = {"skills": ["python", "sql"], "role_id": "data_scientist", "level": "junior",
+               "experience_years": 1.0}
+    full = client.post("/inference/analyze", json=payload).json()
+
+    def not_called(*args, **kwargs):
+        raise AssertionError("skipped stage was run")
+
+    monkeypatch.setattr(pipeline, "get_skill_recommendations", not_called)
+    monkeypatch.setattr(pipeline, "get_learning_roadmap", not_called)
+    analysis = client.post("/inference/analyze", json={**payload, "include": "analysis"}).json()
+    assert analysis == {k: v for k, v in full.items() if k not in ("recommendations", "roadmap")}
+
+    monkeypatch.setattr(pipeline, "topological_sort", not_called)
+    score = client.post("/inference/analyze", json={**payload, "include": "score"}).json()
+    assert score["readiness_score"] == full["readiness_score"]
+    assert score["skill_analysis"] == {k: v for k, v in full["skill_analysis"].items() if k != "missing_skills"}
+    assert "missing_skills" not in score and "recommendations" not in score
+
+    assert client.post("/inference/analyze", json={**payload, "include": "everything"}).status_code == 422
+
+
+def test_preserialized_recommendation_blocks(monkeypatch):
+    """Static recommendation blocks are shared and spliced into responses unchanged."""
+    import json
+    from fastapi.encoders import jsonable_encoder
+    from app.core import serialization
+    from app.core.serialization import PreSerialized, dumps
+    from app.pipelines.pipeline import run_pipeline
+
+    role_skills = ["python", "docker", "kubernetes", "sql", "rust"]
+    result = run_pipeline([], role_skills, 1.0)
+    blocks = result["recommendations"]
+    assert all(isinstance(block, PreSerialized) for block in blocks)
+    assert run_pipeline(["python"], role_skills, 1.0)["recommendations"][-1] is blocks[-1]
+
+    expected = jsonable_encoder(result)
+    assert json.loads(dumps(result)) == expected
+    monkeypatch.setattr(serialization, "orjson", None)
+    assert json.loads(dumps(result)) == expected
+
+    response = client.post("/inference/analyze", json={"skills": [], "target_role_skills": role_skills,
+                                                        "experience_years": 1.0})
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == expected
+
+
+@pytest.mark.parametrize("encoder", ["orjson", "json"])
+def test_fragment_splicing_with_each_encoder(encoder, monkeypatch):
+    """Both encoders splice fragments the same way and agree with jsonable_encoder."""
+    import json
+    import numpy as np
+    from fastapi.encoders import jsonable_encoder
+    from app.core import serialization
+    from app.core.serialization import FastJSONResponse, PreSerialized, dumps
+
+    if encoder == "json":
+        monkeypatch.setattr(serialization, "orjson", None)
+    else:
+        assert serialization.orjson is not None, "orjson is a pinned requirement"
+    block = PreSerialized({"skill": "c++", "resources": [{"title": "Tour de C++ — 3e", "ml_score": 0.5}]})
+    other = PreSerialized({"skill": "rust", "resources": []})
+    content = {
+        "recommendations": [block, other, block],
+        "top": other,
+        "nested": {"deeper": [block]},
+        "scores": np.array([0.25, 0.5]),
+        "count": np.int64(3),
+        "label": f"__fragment_{'0' * 16}_0",
+    }
+    expected = jsonable_encoder({**content, "scores": [0.25, 0.5], "count": 3})
+
+    body = dumps(content)
+    assert json.loads(body) == expected
+    assert body.count(block.json) == 3 and body.count(other.json) == 2
+    assert json.loads(FastJSONResponse(content).body) == expected
+    assert dumps(block) is block.json and json.loads(dumps([block, 1.5])) == [jsonable_encoder(block), 1.5]
+    with pytest.raises((TypeError, ValueError)):
+        dumps({"value": object()})
+
+
+def test_compact_response_and_resource_catalog():
+    """Compact responses resolve through /catalog/resources to the full recommendations."""
+    payload = {"skills": [], "target_role_skills": ["python", "docker", "sql", "rust"], "experience_years": 1.0}
+    full = client.post("/inference/analyze", json=payload).json()
+    compact = client.post("/inference/analyze", json={**payload, "response_format": "compact"}).json()
+
+    response = client.get("/catalog/resources")
+    catalog = response.json()
+    assert response.headers["etag"] == f'"{catalog["version"]}"' and catalog["count"] == len(catalog["resources"])
+    assert compact["catalog_version"] == catalog["version"]
+    assert {k: v for k, v in compact.items() if k not in ("recommendations", "catalog_version")} == \
+        {k: v for k, v in full.items() if k != "recommendations"}
+    for block, expected in zip(compact["recommendations"], full["recommendations"]):
+        resolved = [catalog["resources"][r] if isinstance(r, str) else r for r in block["resources"]]
+        assert (block["skill"], resolved) == (expected["skill"], expected["resources"])
+    assert any(isinstance(r, str) for block in compact["recommendations"] for r in block["resources"])
+
+    etag = response.headers["etag"]
+    assert client.get("/catalog/resources", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/catalog/resources", headers={"If-None-Match": '"stale"'}).status_code == 200
+    pinned = client.get("/catalog/resources", params={"version": catalog["version"]})
+    assert "immutable" in pinned.headers["cache-control"]
+
+
+def test_compact_response_reads_only_recommended_skills(tmp_path, monkeypatch):
+    """With the SQLite store, compact responses read only the skills they recommend for."""
+    from data.store import SqliteResourceMap, builtin_store, open_sqlite_store, set_data_store, write_sqlite_store
+
+    path = tmp_path / "catalog.db"
+    write_sqlite_store(builtin_store(), path)
+    read = set()
+    page, getitem = SqliteResourceMap.page, SqliteResourceMap.__getitem__
+
+    def counted_page(self, skill, *args, **kwargs):
+        read.add(skill)
+        return page(self, skill, *args, **kwargs)
+
+    def counted_getitem(self, skill):
+        read.add(skill)
+        return getitem(self, skill)
+
+    monkeypatch.setattr(SqliteResourceMap, "page", counted_page)
+    monkeypatch.setattr(SqliteResourceMap, "__getitem__", counted_getitem)
+    payload = {"skills": [], "target_role_skills": ["python", "docker", "rust"], "experience_years": 1.0,
+               "response_format": "compact"}
+    try:
+        set_data_store(open_sqlite_store(path))
+        compact = client.post("/inference/analyze", json=payload).json()
+        assert read <= {"python", "docker", "rust"}
+        assert any(isinstance(r, str) for block in compact["recommendations"] for r in block["resources"])
+
+        catalog = client.get("/catalog/resources").json()
+        assert len(read) > 3 and compact["catalog_version"] == catalog["version"]
+        for block in compact["recommendations"]:
+            assert all(r in catalog["resources"] for r in block["resources"] if isinstance(r, str))
+    finally:
+        set_data_store(None)
+
+
+def test_single_flight_coalesces_identical_requests():
+    """Concurrent identical calls share one run, its result and its errors."""
+    import asyncio
+    import threading
+    import time
+    from app.core.coalescing import SingleFlight, request_key
+
+    assert request_key("a", {"x": 1, "y": [2]}) == request_key("a", {"y": [2], "x": 1})
+    assert request_key("a", {"x": 1}) != request_key("a", {"x": 2})
+
+    calls = []
+    lock = threading.Lock()
+
+    def compute(value):
+        with lock:
+            calls.append(value)
+        time.sleep(0.05)
+        if value == "bad":
+            raise ValueError("boom")
+        return {"value": value}
+
+    async def scenario():
+        flights = SingleFlight()
+        results = await asyncio.gather(*(flights.run("k", compute, "ok") for _ in range(8)))
+        assert len(calls) == 1 and len(flights) == 0
+        assert all(result is results[0][0] for result, _ in results)
+        assert sum(shared for _, shared in results) == 7
+
+        errors = await asyncio.gather(*(flights.run("e", compute, "bad") for _ in range(3)),
+                                      return_exceptions=True)
+        assert all(isinstance(e, ValueError) for e in errors) and calls.count("bad") == 1
+
+        # A cancelled leader doesn't cancel the run its followers wait on
+        leader = asyncio.ensure_future(flights.run("c", compute, "late"))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flights.run("c", compute, "late"))
+        await asyncio.sleep(0)
+        leader.cancel()
+        assert await follower == ({"value": "late"}, True)
+        assert calls.count("late") == 1
+
+    asyncio.run(scenario())
+
+    before = client.get("/metrics").text
+    assert "analyze_requests_total" in before and "analyze_coalesced_total" in before
+    payload = {"skills": ["python"], "target_role_skills": ["python", "sql"], "experience_years": 1.0}
+    assert client.post("/inference/analyze", json=payload).status_code == 200
+    counts = dict(line.split() for line in client.get("/metrics").text.splitlines() if not line.startswith("#"))
+    previous = dict(line.split() for line in before.splitlines() if not line.startswith("#"))
+    assert float(counts["analyze_requests_total"]) == float(previous["analyze_requests_total"]) + 1
+
+
+def test_analysis_etag_and_conditional_requests(monkeypatch):
+    """Analyses carry a strong ETag; matching If-None-Match returns 304 without running the pipeline."""
+    payload = {"skills": ["python", "git"], "role_id": "backend_developer", "level": "junior",
+               "experience_years": 1.0}
+    response = client.post("/inference/analyze", json=payload)
+    etag = response.headers["etag"]
+    location = response.headers["content-location"]
+    assert etag.startswith('"') and location == f"/inference/analysis/{etag.strip(chr(34))}"
+    # Defaults and candidate_id don't change the key
+    same = client.post("/inference/analyze", json={**payload, "candidate_id": "c1", "include": "full"})
+    assert same.headers["etag"] == etag
+    assert client.post("/inference/analyze", json={**payload, "include": "score"}).headers["etag"] != etag
+
+    fetched = client.get(location)
+    assert fetched.status_code == 200 and fetched.json() == response.json()
+    assert fetched.headers["etag"] == etag and "immutable" in fetched.headers["cache-control"]
+
+    def not_called(*args, **kwargs):
+        raise AssertionError("pipeline should not run")
+
+    monkeypatch.setattr("app.services.inference_service.run_pipeline", not_called)
+    for conditional in (client.post("/inference/analyze", json=payload, headers={"If-None-Match": etag}),
+                        client.get(location, headers={"If-None-Match": f'W/"other", {etag}'})):
+        assert conditional.status_code == 304 and conditional.headers["etag"] == etag
+        assert conditional.content == b""
+    monkeypatch.undo()
+    assert client.get("/inference/analysis/unknown").status_code == 404
+
+    # Settings that change results change the key
+    from app.core import config
+    for name, value in (("FUZZY_SKILL_MATCHING", False), ("FUZZY_SKILL_MIN_CONFIDENCE", 0.9),
+                        ("OOV_SKILL_EMBEDDINGS", False), ("PERSONALIZATION_WEIGHT", 0.5)):
+        with monkeypatch.context() as patched:
+            patched.setattr(config, name, value)
+            assert client.post("/inference/analyze", json=payload).headers["etag"] != etag
+    assert client.post("/inference/analyze", json=payload).headers["etag"] == etag
+
+
+def test_analysis_etag_tracks_store_contents(tmp_path):
+    """Editing an external store's file changes the analysis key."""
+    import os
+    from data.store import builtin_store, open_sqlite_store, set_data_store, write_sqlite_store
+
+    path = tmp_path / "catalog.db"
+    write_sqlite_store(builtin_store(), path)
+    payload = {"skills": ["python"], "role_id": "data_scientist", "level": "junior"}
+    try:
+        set_data_store(open_sqlite_store(path))
+        etag = client.post("/inference/analyze", json=payload).headers["etag"]
+        assert client.post("/inference/analyze", json=payload).headers["etag"] == etag
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert client.post("/inference/analyze", json=payload).headers["etag"] != etag
+    finally:
+        set_data_store(None)
+
+
+def test_analysis_etag_stable_across_lazy_recommender_load(tmp_path, monkeypatch):
+    """The first ETag after a cold start stays valid once the recommender loads; publishing changes it."""
+    import json
+    import numpy as np
+    from joblib import dump
+    from app.core import config, startup
+
+    resources = [{"id": 0, "skill": "docker", "title": "Docker 0", "type": "course"}]
+    dump(np.array([[0.9]]), tmp_path / "recommender_predictions.joblib")
+    dump(["docker"], tmp_path / "recommender_skills.joblib")
+    dump(resources, tmp_path / "recommender_resources.joblib")
+    dump({"docker": 0}, tmp_path / "recommender_skill_idx.joblib")
+    (tmp_path / "recommender_version.json").write_text(json.dumps({"version": "v1"}))
+    monkeypatch.setattr(startup, "ARTIFACTS_DIR", tmp_path)
+    monkeypatch.setattr(config, "RECOMMENDER_RELOAD_INTERVAL_SECONDS", 0.0)
+    for name in ("_MODELS", "_PENDING", "_ARTIFACT_VERSION"):
+        monkeypatch.setattr(startup, name, {})
+    monkeypatch.setattr(startup, "_PUBLISHED_VERSION", {"version": None, "checked_at": float("-inf")})
+    monkeypatch.setattr(startup, "_RECOMMENDER_VERSION", {"version": None, "checked_at": 0.0})
+    startup.load_models_on_startup(preload=False)
+    assert "recommender" in startup._PENDING
+
+    payload = {"skills": ["python"], "target_role_skills": ["python", "docker"]}
+    first = client.post("/inference/analyze", json=payload)
+    assert "recommender" in startup._MODELS
+    etag, location = first.headers["etag"], first.headers["content-location"]
+    assert client.post("/inference/analyze", json=payload).headers["etag"] == etag
+    assert client.get(location).status_code == 200
+    assert client.post("/inference/analyze", json=payload, headers={"If-None-Match": etag}).status_code == 304
+
+    # Publishing a new snapshot changes the key; old keys can no longer be fetched
+    (tmp_path / "recommender_version.json").write_text(json.dumps({"version": "v2"}))
+    assert client.post("/inference/analyze", json=payload).headers["etag"] != etag
+    assert client.get(location).status_code == 404
+
+
+def test_answer_table_matches_pipeline():
+    """Role-based, skills-only requests answered from the table equal the pipeline's answers."""
+    import random
+    from app.core import metrics
+    from app.pipelines.pipeline import run_pipeline
+    from app.services import answer_table
+    from data.role_definitions import ROLE_DEFINITIONS
+
+    role_levels = [("backend_developer", "junior"), ("frontend_developer", "mid")]
+    rng = random.Random(0)
+    requests = []
+    for _ in range(200):
+        role_id, level = rng.choice(role_levels)
+        listed = ROLE_DEFINITIONS[role_id]["levels"][level]["skills"]
+        pool = listed["core"] + listed["secondary"] + listed["bonus"]
+        skills = rng.sample(pool, rng.randint(0, len(pool))) + rng.sample(["rust", "excel", "figma"], 1)
+        requests.append(dict(
+            candidate_skills=[s.upper() if rng.random() < 0.3 else s for s in skills], role_skills=[],
+            experience_years=rng.uniform(0, 8), role_id=role_id, level=level,
+            include=rng.choice(["score", "analysis", "full"]),
+        ))
+    expected = [run_pipeline(**r) for r in requests]
+
+    table = answer_table.build_answer_table(role_levels)
+    try:
+        assert answer_table.table_stats(table)["entries"] == sum(
+            2 ** len(table["roles"][key]["distinct"]) for key in role_levels
+        )
+        before = metrics.snapshot()
+        assert [run_pipeline(**r) for r in requests] == expected
+        run_pipeline(["python"], [], 1.0, role_id="data_scientist", level="junior")
+        run_pipeline(["python"], [], 1.0, role_id="backend_developer", level="junior", resume_text="Go developer")
+        after = metrics.snapshot()
+        assert after["answer_table_hits_total"] - before["answer_table_hits_total"] == len(requests)
+        assert after["answer_table_misses_total"] - before["answer_table_misses_total"] == 2
+    finally:
+        answer_table._TABLE.clear()
+
+
+def test_fuzzy_skill_normalization(monkeypatch):
+    """Misspelled skills resolve to taxonomy skills with a confidence."""
+    from app.core import config
+    from data.skill_taxonomy import correct_skills, resolve_skill, resolve_skills
+
+    assert resolve_skills(["Python", "js", "Node JS", "pyhton", "kubernets", "go", "gol", "excel"]) == [
+        ("python", 1.0), ("javascript", 1.0), ("node.js", 0.95), ("python", 0.833),
+        ("kubernetes", 0.9), ("go", 1.0), (None, 0.0), (None, 0.0),
+    ]
+    assert resolve_skill("sckit-learn")[0] == "scikit-learn"
+    # Longer inputs within the edits allowed for the query but not for the skill,
+    # and real short skills a substitution away from another one, stay as given
+    for skill in ("React Native", "Docker Compose", "NestJS", "MSSQL", "REST", "htmx"):
+        assert resolve_skill(skill) == (None, 0.0)
+    assert correct_skills(["React Native", "Docker Compose"], config.FUZZY_SKILL_MIN_CONFIDENCE)[1] == []
+
+    payload = {"skills": ["pyhton", "Dockr", "git"], "target_role_skills": ["python", "docker", "kubernets"],
+               "experience_years": 1.0}
+    data = client.post("/inference/analyze", json=payload).json()
+    assert sorted(data["skill_analysis"]["matched_skills"]) == ["docker", "python"]
+    assert [m["skill"] for m in data["missing_skills"]] == ["kubernetes"]
+    assert {c["input"]: (c["skill"], c["confidence"]) for c in data["skill_corrections"]} == {
+        "pyhton": ("python", 0.833), "Dockr": ("docker", 0.833), "kubernets": ("kubernetes", 0.9),
+    }
+
+    session = client.post("/inference/sessions", json=payload).json()
+    assert session["skill_corrections"] == data["skill_corrections"]
+    updated = client.post(f"/inference/sessions/{session['session_id']}/delta", json={"add": ["kubernetse"]}).json()
+    assert updated["missing_skills"] == []
+
+    # Cohort scores apply the same corrections
+    role = {"role_id": "backend_developer", "level": "junior", "experience_years": 1.0}
+    for skills in (["pyhton", "JS"], ["Dockr", "git"]):
+        single = client.post("/inference/analyze", json={**role, "skills": skills}).json()
+        cohort = client.post("/analytics/cohort", json={**role, "candidates": [skills]}).json()
+        assert cohort["weighted_score"]["mean"] == round(single["skill_analysis"]["weighted_score"], 4) > 0
+    custom = {"target_role_skills": ["python", "kubernets"], "candidates": [["pyhton", "kubernetes"]]}
+    assert client.post("/analytics/cohort", json=custom).json()["weighted_score"]["mean"] == 1.0
+
+    monkeypatch.setattr(config, "FUZZY_SKILL_MATCHING", False)
+    data = client.post("/inference/analyze", json=payload).json()
+    assert data["skill_analysis"]["matched_skills"] == [] and "skill_corrections" not in data
+
+
+def test_unknown_skills_get_projected_embeddings(monkeypatch):
+    """Skills without embeddings match semantically through the n-gram projection."""
+    import numpy as np
+    from app.core import config, startup
+    from app.pipelines.pipeline import SkillAnalyzer
+    from app.services.role_intelligence import get_role_intelligence
+    from data.skill_vocab import get_skill_vocabulary
+
+    rng = np.random.default_rng(0)
+    embeddings = {name: rng.normal(size=32).astype(np.float32) for name in get_skill_vocabulary().names}
+    monkeypatch.setitem(startup._MODELS, "skill_embeddings", embeddings)
+
+    analyzer = SkillAnalyzer(get_role_intelligence("devops_engineer", "junior"))
+    projection = analyzer._projection
+    assert projection.nearest("kubernetes cluster")[0] == "kubernetes"
+    assert projection.nearest("nodejs")[0] == "node.js"
+    assert projection.embed("figma") is None
+    assert analyzer._find_best_match("kubernetes", {"kubernetes cluster", "figma"}) == "kubernetes cluster"
+    assert analyzer._find_best_match("python", {"kubernetes cluster", "figma"}) is None
+
+    analysis = analyzer.analyze(["Kubernetes cluster", "docker compose"], rank_missing=False)
+    assert {"kubernetes", "docker"} <= set(analysis["matched_skills"])
+
+    monkeypatch.setattr(config, "MAX_PROJECTED_SKILLS", 2)
+    for skill in ("pythons", "dockers", "reacts"):
+        projection.embed(skill)
+    assert list(projection._cache) == ["dockers", "reacts"]
+
+    monkeypatch.setattr(config, "OOV_SKILL_EMBEDDINGS", False)
+    assert SkillAnalyzer()._find_best_match("kubernetes", {"kubernetes cluster"}) is None
+
+
+def test_skill_neighbour_graph_matches_similarity_scan(monkeypatch):
+    """Matching from precomputed neighbours equals computing similarities per request."""
+    import random
+    import numpy as np
+    from app.core import startup
+    from app.models.skill_neighbour_graph import SkillNeighbourGraph
+    from app.pipelines.pipeline import SkillAnalyzer
+    from data.skill_vocab import get_skill_vocabulary
+
+    names = get_skill_vocabulary().names
+    rng = np.random.default_rng(0)
+    centers = rng.normal(size=(8, 16))
+    embeddings = {
+        name: (2 * centers[i % 8] + rng.normal(scale=0.6, size=16)).astype(np.float32)
+        for i, name in enumerate(names)
+    }
+    monkeypatch.setitem(startup._MODELS, "skill_embeddings", embeddings)
+
+    graph = SkillNeighbourGraph(embeddings, block_rows=3)
+    unblocked = SkillNeighbourGraph(embeddings, block_rows=len(names))
+    assert graph.stats()["edges"] > 0 and graph.stats() == unblocked.stats()
+    for name in names:
+        assert [n for n, _ in graph.neighbours(name)] == [n for n, _ in unblocked.neighbours(name)]
+        assert np.allclose([s for _, s in graph.neighbours(name)], [s for _, s in unblocked.neighbours(name)])
+    truncated = SkillNeighbourGraph(embeddings, k=2)
+    assert truncated.stats()["max_degree"] == 2 and truncated.stats()["truncated"] > 0
+
+    analyzer = SkillAnalyzer()
+    assert analyzer._neighbours.stats() == graph.stats()
+    scan = SkillAnalyzer()
+    monkeypatch.setattr(scan, "_neighbours", set())  # no skill has precomputed neighbours
+    rnd = random.Random(0)
+    for _ in range(300):
+        candidates = set(rnd.sample(names, 6)) | {"kubernetes cluster"}
+        for skill in rnd.sample(names, 4):
+            assert analyzer._find_best_match(skill, candidates) == scan._find_best_match(skill, candidates)
+
+    # Lists cut at k neighbours fall back to the scan when none of theirs is held
+    cut = SkillAnalyzer()
+    monkeypatch.setattr(cut, "_neighbours", truncated)
+    for _ in range(300):
+        candidates = set(rnd.sample(names, 12))
+        for skill in rnd.sample(names, 4):
+            assert cut._find_best_match(skill, candidates) == scan._find_best_match(skill, candidates)
+
+
+def test_quantized_model_precision(monkeypatch):
+    """float16/int8 serving formats round-trip closely and keep recommendation rankings."""
+    import numpy as np
+    import pytest
+    from app.core import config, startup
+    from app.core.quantization import QuantizedMatrix, matrix_nbytes, quantize_embeddings, quantize_matrix
+
+    rng = np.random.default_rng(0)
+    matrix = rng.normal(size=(20, 50)) * rng.uniform(0.01, 10, size=(20, 1))
+    quantized = QuantizedMatrix(matrix)
+    assert quantized.data.dtype == np.int8 and quantized.shape == matrix.shape
+    assert np.all(np.abs(quantized.dequantize() - matrix) <= quantized.scale[:, None] / 2 + 1e-6)
+    assert np.allclose(quantized[3], quantized.dequantize()[3])
+    assert np.allclose(quantized[[1, 4]], quantized.dequantize()[[1, 4]])
+    x, v = rng.normal(size=50), rng.normal(size=20)
+    assert np.allclose(quantized @ x, quantized.dequantize() @ x, atol=1e-3)
+    assert np.allclose(v @ quantized, v @ quantized.dequantize(), atol=1e-3)
+    assert matrix_nbytes(quantized) * 7 < matrix_nbytes(matrix)
+
+    embeddings = {f"skill {i}": rng.normal(size=8).astype(np.float32) for i in range(5)}
+    half = quantize_embeddings(embeddings, "float16")
+    assert half["skill 2"].dtype == np.float16 and np.allclose(half["skill 2"], embeddings["skill 2"], atol=1e-2)
+    assert matrix_nbytes(half) * 2 == matrix_nbytes(embeddings)
+    with pytest.raises(ValueError):
+        quantize_matrix(matrix, "int4")
+
+    monkeypatch.setattr(config, "RECOMMENDER_RELOAD_INTERVAL_SECONDS", float("inf"))
+    resources = [{"id": i, "skill": "docker", "title": f"Docker {i}", "type": "course"} for i in range(4)]
+    predictions = np.array([[0.9, 0.8, 0.75, 0.0], [0.0, 0.0, 0.1, 0.9]])
+    components = np.array([[0.5, 0.5, 0.0, 0.7], [0.1, -0.3, 0.9, 0.4]])
+    payload = {"skills": ["python"], "target_role_skills": ["python", "docker"], "personalize": True,
+               "resource_ratings": {"0": 0.1}}
+    titles = {}
+    for precision in ("full", "float16", "int8"):
+        monkeypatch.setitem(startup._MODELS, "recommender", {
+            "predictions": quantize_matrix(predictions, precision),
+            "skills": ["docker", "python"],
+            "resources": resources,
+            "skill_idx": {"docker": 0, "python": 1},
+            "components": quantize_matrix(components, precision),
+            "version": precision,
+        })
+        data = client.post("/inference/analyze", json=payload).json()
+        titles[precision] = [r["title"] for r in data["recommendations"][0]["resources"]]
+    assert titles["full"] == titles["float16"] == titles["int8"] == ["Docker 2", "Docker 1"]
@@ -0,0 +1,113 @@
+import random
+import threading
+
+from data.skill_dependencies import (
+    SKILL_DEPENDENCIES,
+    _prerequisite_closure,
+    generate_learning_roadmap,
+    get_learning_hours,
+    schedule_skills,
+    topological_sort,
+)
+
+
+def random_dag(rng, n):
+    """Synthetic skills with prerequisites among earlier skills, and their hours."""
+    skills = [f"s{i}" for i in range(n)]
+    dependencies = {s: rng.sample(skills[:i], min(i, rng.randint(0, 3))) for i, s in enumerate(skills)}
+    hours = {s: rng.choice((5, 10, 20, 30, 40, 60)) for s in skills}
+    return skills, dependencies, hours
+
+
+def week_of(plan):
+    """Skill -> (week, position in the week)."""
+    return {skill: (w, i) for w, week in enumerate(plan) for i, skill in enumerate(week)}
+
+
+def assert_valid(plan, order, prereqs):
+    placed = week_of(plan)
+    assert sorted(placed) == sorted(order) and sum(map(len, plan)) == len(order)
+    for skill in order:
+        for prereq in prereqs[skill]:
+            assert placed[prereq] < placed[skill], (prereq, skill)
+
+
+def test_prerequisites_come_first():
+    """Prerequisites land in an earlier week, or earlier in the same week."""
+    rng = random.Random(7)
+    known = sorted(set(SKILL_DEPENDENCIES) | {p for ps in SKILL_DEPENDENCIES.values() for p in ps})
+    for _ in range(200):
+        skills = rng.sample(known, rng.randint(1, 15))
+        roadmap = generate_learning_roadmap(skills, weeks=rng.randint(1, 6))
+        plan = [week["skills"] for week in roadmap]
+        order = topological_sort(skills)
+        assert_valid(plan, order, _prerequisite_closure(order, SKILL_DEPENDENCIES))
+        assert all(week["estimated_hours"] == sum(map(get_learning_hours, week["skills"])) for week in roadmap)
+
+    for _ in range(50):
+        skills, dependencies, hours = random_dag(rng, rng.randint(1, 60))
+        prereqs = _prerequisite_closure(skills, dependencies)
+        assert_valid(schedule_skills(skills, hours, prereqs, weeks=rng.randint(1, 8)), skills, prereqs)
+
+
+def test_weekly_cap_is_respected():
+    """No week exceeds max_hours_per_week unless it holds a single larger skill."""
+    rng = random.Random(11)
+    for _ in range(100):
+        skills, dependencies, hours = random_dag(rng, rng.randint(1, 40))
+        prereqs = _prerequisite_closure(skills, dependencies)
+        cap = rng.choice((20, 40, 60, 100))
+        plan = schedule_skills(skills, hours, prereqs, weeks=rng.randint(1, 6), max_hours_per_week=cap)
+        assert_valid(plan, skills, prereqs)
+        for week in plan:
+            assert sum(hours[s] for s in week) <= cap or len(week) == 1
+
+
+def test_weeks_target_is_honoured_when_feasible():
+    """Without a cap, or with one the target allows, the plan fits in the requested weeks."""
+    rng = random.Random(3)
+    for _ in range(100):
+        skills, dependencies, hours = random_dag(rng, rng.randint(1, 40))
+        prereqs = _prerequisite_closure(skills, dependencies)
+        weeks = rng.randint(1, 8)
+        plan = schedule_skills(skills, hours, prereqs, weeks=weeks)
+        assert 1 <= len(plan) <= weeks
+        # A cap at the uncapped plan's heaviest week is feasible for the target
+        heaviest = max(sum(hours[s] for s in week) for week in plan)
+        assert len(schedule_skills(skills, hours, prereqs, weeks=weeks, max_hours_per_week=heaviest)) <= weeks
+        # The heaviest week is never below the average load or the largest skill
+        assert heaviest >= max(max(hours.values()), sum(hours.values()) / weeks)
+
+    skills = ["python", "sql", "git", "docker", "linux"]
+    assert len(generate_learning_roadmap(skills, weeks=3)) <= 3
+    assert len(generate_learning_roadmap(skills, weeks=1)) == 1
+
+
+def test_cycles_and_unknown_skills():
+    """Dependency cycles and skills outside the taxonomy are scheduled without hanging."""
+    results = []
+
+    def run():
+        cyclic = {"a": ["b"], "b": ["c"], "c": ["a"], "d": ["a"]}
+        for order in (["a", "b", "c", "d"], ["d", "c", "b", "a"]):
+            prereqs = _prerequisite_closure(order, cyclic)
+            results.append((order, schedule_skills(order, dict.fromkeys(order, 10), prereqs, weeks=2)))
+        # Mutually dependent skills (as given, not from the closure)
+        mutual = {"a": {"b"}, "b": {"a"}, "c": set()}
+        results.append((["a", "b", "c"], schedule_skills(["a", "b", "c"], dict.fromkeys("abc", 10), mutual, 2)))
+        results.append((None, generate_learning_roadmap(["python", "not-a-skill", "Django", ""], weeks=2)))
+        results.append((None, generate_learning_roadmap([], weeks=2)))
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    thread.join(timeout=10)
+    assert not thread.is_alive(), "scheduling did not finish"
+    assert len(results) == 5
+
+    for order, plan in results[:3]:
+        assert sorted(s for week in plan for s in week) == sorted(order)
+    roadmap = results[3][1]
+    scheduled = [s for week in roadmap for s in week["skills"]]
+    assert sorted(scheduled) == sorted(["python", "not-a-skill", "django", ""])
+    assert scheduled.index("python") < scheduled.index("django")
+    assert results[4][1] == []
@@ -0,0 +1,170 @@
+import numpy as np
+import pytest
+
+from app.core import config, startup
+
+
+@pytest.fixture
+def artifacts(tmp_path, monkeypatch):
+    """An empty artifacts directory that app.core.startup loads models from."""
+    monkeypatch.setattr(startup, "ARTIFACTS_DIR", tmp_path)
+    monkeypatch.setattr(config, "RECOMMENDER_RELOAD_INTERVAL_SECONDS", 0.0)
+    for name in ("_MODELS", "_PENDING", "_ARTIFACT_VERSION"):
+        monkeypatch.setattr(startup, name, {})
+    monkeypatch.setattr(startup, "_PUBLISHED_VERSION", {"version": None, "checked_at": float("-inf")})
+    monkeypatch.setattr(startup, "_RECOMMENDER_VERSION", {"version": None, "checked_at": 0.0})
+    return tmp_path
+
+
+def load_model(name):
+    """Register whatever the artifacts directory holds and load one model."""
+    startup.load_models_on_startup(preload=False)
+    assert startup.is_model_loaded(name), f"{name} artifacts not found"
+    return startup.get_model(name)
+
+
+def extract_skills(text):
+    """Skills the API extracts from text with the loaded skill extractor."""
+    from app.services.resume_parser import extract_skills_from_text
+    assert load_model("skill_extractor") is not None
+    return set(extract_skills_from_text(text))
+
+
+def test_training_scripts_write_loadable_artifacts(artifacts):
+    """Each training script's artifacts load through startup and serve predictions."""
+    from ml.training import train_gap_ranker, train_readiness, train_recommender, train_skill_extractor
+
+    train_readiness.train_and_save(artifacts / "readiness_v1.joblib")
+    train_gap_ranker.train_gap_ranker(artifacts)
+    train_skill_extractor.train_skill_extractor(artifacts)
+    train_recommender.train_recommender(artifacts)
+
+    readiness = load_model("readiness")
+    assert readiness.predict_proba([[1.0, 8.0]])[0, 1] > readiness.predict_proba([[0.0, 0.0]])[0, 1]
+
+    ranker = load_model("gap_ranker")
+    features = np.array([[2, 5, 40, 0, 1, 0, 3.0, 5, 1], [4, 2, 50, 4, 0, 0, 3.0, 5, 0]], dtype=float)
+    core, bonus = ranker.predict(features)
+    assert core > bonus
+    assert set(load_model("skill_metadata")) == set(train_gap_ranker.SKILL_METADATA)
+
+    assert {"python", "docker"} <= extract_skills("Python developer who ships Docker images")
+
+    recommender = load_model("recommender")
+    skills, resources = train_recommender.SKILLS, train_recommender.RESOURCES
+    assert recommender["predictions"].shape == (len(skills), len(resources))
+    assert recommender["components"].shape[1] == len(resources) and recommender["version"] == 1
+    python = recommender["predictions"][recommender["skill_idx"]["python"]]
+    assert resources[int(np.argmax(python))]["skill"] == "python"
+
+
+def test_synthetic_data_is_seeded():
+    """The vectorized generators are reproducible per seed and respect their ranges."""
+    from ml.training import train_gap_ranker, train_readiness, train_recommender, train_skill_extractor
+
+    for generate in (
+        train_readiness.create_synthetic_dataset,
+        train_gap_ranker.generate_synthetic_ranking_data,
+        train_skill_extractor.generate_synthetic_dataset,
+        train_recommender.generate_synthetic_interactions,
+    ):
+        first = generate(50, seed=1)
+        assert first.equals(generate(50, seed=1)) and not first.equals(generate(50, seed=2))
+
+    ranking = train_gap_ranker.generate_synthetic_ranking_data(500)
+    assert ranking["priority_score"].between(0, 10).all()
+    assert not (ranking["is_core"] & ranking["is_secondary"]).any()
+    resumes = train_skill_extractor.generate_synthetic_dataset(200)
+    assert resumes["skills"].map(len).between(1, 8).all()
+    assert all(len(set(skills)) == len(skills) for skills in resumes["skills"])
+    interactions = train_recommender.generate_synthetic_interactions(200, chunk_size=64)
+    assert interactions.groupby("user_id").size().between(3, 15).all()
+    assert interactions["rating"].between(0.1, 1.0).all()
+
+
+def test_train_all_runs_the_task_graph(artifacts, monkeypatch):
+    """train_all trains in parallel, skips up-to-date tasks and blocks dependents of failures."""
+    from scripts import train_all
+
+    monkeypatch.setattr(train_all, "artifacts_dir", artifacts)
+    monkeypatch.setattr(train_all, "MANIFEST_PATH", artifacts / "train_manifest.json")
+    only = ["readiness", "gap_ranker", "recommender"]
+
+    results = train_all.train_all(jobs=2, only=only)
+    assert {name: r["status"] for name, r in results.items()} == dict.fromkeys(only, "trained")
+    assert set(train_all.load_manifest()) == set(only)
+    assert all((artifacts / "logs" / f"{name}.log").exists() for name in only)
+    assert load_model("readiness") is not None and load_model("gap_ranker") is not None
+    assert load_model("recommender")["version"] == 1
+
+    assert {r["status"] for r in train_all.train_all(jobs=2, only=only).values()} == {"skipped"}
+    assert train_all.train_all(jobs=1, only=["readiness"], force=True)["readiness"]["status"] == "trained"
+
+    # Tasks are picked up by the (forked) workers from TASKS
+    monkeypatch.setitem(train_all.TASKS, "broken", {**train_all.TASKS["readiness"], "function": "missing"})
+    monkeypatch.setitem(train_all.TASKS, "dependent", {**train_all.TASKS["readiness"], "deps": ["broken"]})
+    results = train_all.train_all(jobs=2, only=["broken", "dependent"])
+    assert results["broken"]["status"] == "failed" and "missing" in results["broken"]["error"]
+    assert results["dependent"]["status"] == "blocked"
+    with pytest.raises(ValueError):
+        train_all.train_all(only=["nonexistent"])
+
+
+def test_streaming_skill_extractor_artifacts_load(artifacts, tmp_path_factory):
+    """Out-of-core training from plain and gzipped shards writes artifacts the API loads."""
+    import gzip
+    from ml.training import train_skill_extractor
+
+    shards = tmp_path_factory.mktemp("shards")
+    paths = train_skill_extractor.write_synthetic_shards(shards, n_shards=3, samples_per_shard=400)
+    with open(paths[-1], "rb") as f, gzip.open(paths[-1].with_name(paths[-1].name + ".gz"), "wb") as gz:
+        gz.write(f.read())
+    paths[-1].unlink()
+
+    batches = list(train_skill_extractor.iter_shard_batches(shards, batch_size=300))
+    assert [len(texts) for texts, _ in batches] == [300, 300, 300, 300]
+
+    train_skill_extractor.train_skill_extractor_streaming(shards, artifacts, batch_size=300, n_features=2 ** 14,
+                                                          epochs=2)
+    assert {"python", "docker"} <= extract_skills("Python developer who ships Docker images")
+    assert type(startup.get_model("skill_extractor")["vectorizer"]).__name__ == "HashingVectorizer"
+
+    with pytest.raises(ValueError):
+        train_skill_extractor.train_skill_extractor_streaming(tmp_path_factory.mktemp("empty"), artifacts)
+
+
+def test_recommender_update_publishes_a_loadable_snapshot(artifacts):
+    """update_recommender folds logged events in, and the API reloads the new snapshot."""
+    from joblib import load
+    from ml.training import train_recommender, update_recommender
+
+    train_recommender.train_recommender(artifacts)
+    before = load_model("recommender")
+    assert before["version"] == 1
+
+    log = artifacts / "events.jsonl"
+    python = before["skill_idx"]["python"]
+    for _ in range(20):
+        update_recommender.append_event(log, "Python", 1, 0.1)
+    update_recommender.append_event(log, "cobol", 1, 0.5)  # unknown skill, skipped
+    with open(log, "a", encoding="utf-8") as f:
+        f.write("not json\n")
+        f.write('{"skill": "python", "resource_id": 2')  # still being written
+
+    assert update_recommender.update_recommender(artifacts, log) == 2
+    state = load(artifacts / "recommender_state.joblib")
+    assert state["events_applied"] == 20 and state["event_offset"] < log.stat().st_size
+
+    startup.refresh_recommender()
+    after = startup.get_model("recommender")
+    assert after is not before and after["version"] == 2
+    assert after["predictions"][python, 1] < before["predictions"][python, 1]
+    untouched = [i for i in range(len(after["skills"])) if i != python]
+    assert np.allclose(after["predictions"][untouched][:, [0, 2]], before["predictions"][untouched][:, [0, 2]])
+
+    # Nothing new until the partial line is finished
+    assert update_recommender.update_recommender(artifacts, log) is None
+    with open(log, "a", encoding="utf-8") as f:
+        f.write(', "rating": 1.0}\n')
+    assert update_recommender.update_recommender(artifacts, log) == 3
+    assert load(artifacts / "recommender_state.joblib")["event_offset"] == log.stat().st_size